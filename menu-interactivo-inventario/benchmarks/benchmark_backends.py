@@ -0,0 +1,142 @@
+"""
+Benchmark comparativo de los backends de almacenamiento.
+
+Mide operaciones por segundo de agregar, actualizar, listar y eliminar en:
+- Diccionario (memoria)
+- SQLite (archivo temporal, modo WAL)
+- MySQL (BD de pruebas; se omite si no hay conexión disponible)
+
+Para ejecutar:
+    python benchmarks/benchmark_backends.py            # 2000 productos
+    python benchmarks/benchmark_backends.py 20000      # cantidad personalizada
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+from string import ascii_lowercase
+
+# Agregar el directorio padre al path para poder importar los módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def generar_nombres(cantidad):
+    """Genera nombres válidos (solo letras) y distintos"""
+    nombres = []
+    for i in range(cantidad):
+        letras = []
+        while True:
+            i, resto = divmod(i, 26)
+            letras.append(ascii_lowercase[resto])
+            if i == 0:
+                break
+        nombres.append("producto " + "".join(letras))
+    return nombres
+
+
+def medir(descripcion, cantidad, funcion):
+    """Ejecuta `funcion` silenciando la salida e imprime operaciones por segundo"""
+    with redirect_stdout(StringIO()):
+        inicio = time.perf_counter()
+        funcion()
+        duracion = time.perf_counter() - inicio
+    print(f"   {descripcion:<12} {cantidad / duracion:>12,.0f} ops/s  ({duracion:.3f} s)")
+
+
+def benchmark_diccionario(nombres):
+    """Funciones core del backend diccionario"""
+    from productos.operaciones_diccionario import (
+        productos, agregar_producto, actualizar_producto, eliminar_producto, mostrar_productos
+    )
+
+    productos.clear()
+
+    def agregar():
+        for nombre in nombres:
+            agregar_producto(nombre, "fruta", 1.0, 10)
+
+    def actualizar():
+        for nombre in nombres:
+            actualizar_producto(nombre, "stock", 20)
+
+    def eliminar():
+        for nombre in nombres:
+            eliminar_producto(nombre)
+
+    print("\n💾 Diccionario (memoria)")
+    medir("agregar", len(nombres), agregar)
+    medir("actualizar", len(nombres), actualizar)
+    medir("listar", len(nombres), mostrar_productos)
+    medir("eliminar", len(nombres), eliminar)
+
+
+def benchmark_con_conexion(titulo, bd_conexion, agregar_fn, actualizar_fn, eliminar_fn, mostrar_fn, nombres):
+    """Operaciones de los backends que reciben una conexión (MySQL y SQLite)"""
+    print(f"\n{titulo}")
+    medir("agregar", len(nombres),
+          lambda: [agregar_fn(nombre, "fruta", 1.0, 10, bd_conexion) for nombre in nombres])
+    medir("actualizar", len(nombres),
+          lambda: [actualizar_fn(nombre, "stock", 20, bd_conexion) for nombre in nombres])
+    medir("listar", len(nombres), lambda: mostrar_fn(bd_conexion))
+    medir("eliminar", len(nombres),
+          lambda: [eliminar_fn(nombre, bd_conexion) for nombre in nombres])
+
+
+def benchmark_sqlite(nombres):
+    """Backend SQLite sobre un archivo temporal"""
+    from productos.database_sqlite import obtener_conexion_sqlite
+    from productos.operaciones_sqlite import (
+        agregar_producto_sqlite, actualizar_producto_sqlite, eliminar_producto_sqlite, mostrar_productos
+    )
+
+    directorio = tempfile.mkdtemp()
+    try:
+        bd_conexion = obtener_conexion_sqlite(modo_prueba=True, ruta=os.path.join(directorio, "bench.sqlite3"))
+        benchmark_con_conexion("🪶 SQLite (WAL)", bd_conexion, agregar_producto_sqlite,
+                               actualizar_producto_sqlite, eliminar_producto_sqlite, mostrar_productos, nombres)
+        bd_conexion.desconectar()
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+def benchmark_mysql(nombres):
+    """Backend MySQL sobre la BD de pruebas (si está disponible)"""
+    try:
+        from productos.database import obtener_conexion_base_datos
+        from productos.operaciones_bd import (
+            agregar_producto_bd, actualizar_producto_bd, eliminar_producto_bd, mostrar_productos
+        )
+    except ImportError as e:
+        print(f"\n🗄️ MySQL omitido: {e}")
+        return
+
+    with redirect_stdout(StringIO()):
+        bd_conexion = obtener_conexion_base_datos(modo_prueba=True)
+    if bd_conexion is None:
+        print("\n🗄️ MySQL omitido: no se pudo conectar a la BD de pruebas")
+        return
+
+    with redirect_stdout(StringIO()):
+        bd_conexion.limpiar_todos_los_datos()
+    benchmark_con_conexion("🗄️ MySQL", bd_conexion, agregar_producto_bd,
+                           actualizar_producto_bd, eliminar_producto_bd, mostrar_productos, nombres)
+    bd_conexion.desconectar()
+
+
+def main():
+    """Ejecuta el benchmark para todos los backends"""
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    nombres = generar_nombres(cantidad)
+    print(f"⏱️  Benchmark de backends con {cantidad} productos")
+
+    benchmark_diccionario(nombres)
+    benchmark_sqlite(nombres)
+    benchmark_mysql(nombres)
+
+
+if __name__ == "__main__":
+    main()
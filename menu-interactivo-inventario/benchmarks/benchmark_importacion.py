@@ -0,0 +1,102 @@
+"""
+Benchmark de la importación en paralelo.
+
+Genera un CSV con productos válidos y algunas filas inválidas o repetidas y
+lo importa en SQLite (archivo temporal) con importar_archivo() y con
+importar_archivo_paralelo() usando 1, 2, 4 y 8 procesos. Para cada caso
+imprime filas por segundo:
+- validación: solo parseo y validación en los procesos (lo que escala con los núcleos)
+- importación: la cadena completa, incluida la escritura en un único proceso
+
+Con más procesos que núcleos no hay mejora: el resultado depende de os.cpu_count().
+
+Para ejecutar:
+    python benchmarks/benchmark_importacion.py            # 200000 filas
+    python benchmarks/benchmark_importacion.py 2000000    # cantidad personalizada
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import time
+from collections import deque
+from contextlib import redirect_stdout
+from io import StringIO
+
+# Agregar el directorio padre al path para poder importar los módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.benchmark_backends import generar_nombres
+
+PROCESOS = (1, 2, 4, 8)
+
+
+def generar_csv(ruta, cantidad):
+    """Escribe un CSV de `cantidad` filas: 1 de cada 50 inválida y 1 de cada 100 repetida"""
+    nombres = generar_nombres(cantidad)
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        archivo.write("nombre,tipo,precio,stock\n")
+        for i, nombre in enumerate(nombres):
+            if i % 50 == 0:
+                archivo.write(f"{nombre},carne,{i % 100 + 0.5},{i % 40}\n")
+            elif i % 100 == 1:
+                archivo.write(f"{nombres[i - 1].upper()},fruta,1,1\n")
+            else:
+                archivo.write(f"{nombre},{'fruta' if i % 2 else 'verdura'},{i % 100 + 0.5},{i % 40}\n")
+
+
+def medir_validacion(ruta, procesos):
+    """Segundos para parsear y validar el archivo, sin escribir"""
+    from productos.importacion_paralela import filas_en_orden
+
+    inicio = time.perf_counter()
+    deque(filas_en_orden(ruta, 'csv', procesos), maxlen=0)
+    return time.perf_counter() - inicio
+
+
+def medir_importacion(ruta, directorio, importar, **opciones):
+    """Segundos para importar el archivo en una base SQLite nueva"""
+    from productos.backends import obtener_backend
+
+    ruta_bd = os.path.join(directorio, "bench.sqlite3")
+    backend = obtener_backend('sqlite', modo_prueba=True, ruta=ruta_bd)
+    with redirect_stdout(StringIO()):
+        backend.abrir()
+        inicio = time.perf_counter()
+        importar(ruta, backend, **opciones)
+        duracion = time.perf_counter() - inicio
+        backend.cerrar()
+    for sufijo in ('', '-wal', '-shm'):
+        if os.path.exists(ruta_bd + sufijo):
+            os.remove(ruta_bd + sufijo)
+    return duracion
+
+
+def main():
+    """Compara la importación secuencial con la paralela para 1, 2, 4 y 8 procesos"""
+    from productos.importacion import importar_archivo
+    from productos.importacion_paralela import importar_archivo_paralelo
+
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    directorio = tempfile.mkdtemp()
+    try:
+        ruta = os.path.join(directorio, "productos.csv")
+        generar_csv(ruta, cantidad)
+        print(f"⏱️  Importación de {cantidad} filas ({os.path.getsize(ruta) / 1e6:.1f} MB) "
+              f"en SQLite, {os.cpu_count()} núcleos")
+
+        secuencial = medir_importacion(ruta, directorio, importar_archivo)
+        print(f"   {'procesos':<12} {'validación':>14} {'importación':>14} {'aceleración':>12}")
+        print(f"   {'secuencial':<12} {'':>14} {cantidad / secuencial:>10,.0f} f/s {1:>11.2f}x")
+        for procesos in PROCESOS:
+            validacion = medir_validacion(ruta, procesos)
+            importacion = medir_importacion(ruta, directorio, importar_archivo_paralelo, procesos=procesos)
+            print(f"   {procesos:<12} {cantidad / validacion:>10,.0f} f/s {cantidad / importacion:>10,.0f} f/s "
+                  f"{secuencial / importacion:>11.2f}x")
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
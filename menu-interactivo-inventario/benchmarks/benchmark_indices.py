@@ -0,0 +1,80 @@
+"""
+Benchmark de los índices del inventario en memoria.
+
+Carga N productos en InventarioMemoria y mide la latencia de las consultas
+que usan índices:
+- Búsqueda por prefijo (árbol de prefijos, la que usa el autocompletado)
+- Búsqueda sin distinguir tildes ni mayúsculas (índice normalizado)
+- Búsqueda aproximada de nombres mal escritos (índice de trigramas)
+
+Para ejecutar:
+    python benchmarks/benchmark_indices.py             # 1000000 productos
+    python benchmarks/benchmark_indices.py 100000      # cantidad personalizada
+"""
+
+import os
+import random
+import sys
+import time
+
+# Agregar el directorio padre al path para poder importar los módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.benchmark_backends import generar_nombres
+from productos.autocompletado import LIMITE_SUGERENCIAS
+from productos.inventario_memoria import InventarioMemoria, Producto
+
+CONSULTAS = 10000  # Consultas medidas por tipo de búsqueda
+
+
+def con_error_de_tipeo(nombre, azar):
+    """Devuelve el nombre con una letra del sufijo cambiada (simula un error de tipeo)"""
+    posicion = azar.randrange(len("producto "), len(nombre))
+    return nombre[:posicion] + azar.choice("abcdefghijklmnopqrstuvwxyz") + nombre[posicion + 1:]
+
+
+def medir_latencia(descripcion, consultas, funcion):
+    """Ejecuta `funcion` para cada consulta e imprime la latencia media y la peor"""
+    peor = 0.0
+    inicio_total = time.perf_counter()
+    for consulta in consultas:
+        inicio = time.perf_counter()
+        funcion(consulta)
+        peor = max(peor, time.perf_counter() - inicio)
+    media = (time.perf_counter() - inicio_total) / len(consultas)
+    print(f"   {descripcion:<28} media {media * 1e6:>8.1f} µs   peor {peor * 1e6:>8.1f} µs")
+
+
+def main():
+    """Ejecuta el benchmark de índices"""
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    nombres = generar_nombres(cantidad)
+    print(f"🗂️  Benchmark de índices con {cantidad} productos")
+
+    inventario = InventarioMemoria()
+    inicio = time.perf_counter()
+    for i, nombre in enumerate(nombres):
+        inventario[nombre] = Producto("fruta" if i % 2 else "verdura", float(i % 1000 + 1), 10)
+    print(f"   Carga: {time.perf_counter() - inicio:.1f} s")
+    # El índice de trigramas se arma con la primera búsqueda aproximada: se mide aparte
+    inicio = time.perf_counter()
+    inventario.buscar_similares(nombres[0])
+    print(f"   Armado de trigramas: {time.perf_counter() - inicio:.1f} s")
+
+    azar = random.Random(42)
+    muestra = azar.sample(nombres, min(CONSULTAS, cantidad))
+    # Prefijos de largo variable: "producto " + 1 a 3 letras del sufijo
+    prefijos = [nombre[:azar.randint(10, 12)] for nombre in muestra]
+
+    medir_latencia("prefijo (50 resultados)", prefijos,
+                   lambda prefijo: inventario.buscar_por_prefijo(prefijo, LIMITE_SUGERENCIAS))
+    medir_latencia("nombre exacto (prefijo)", muestra,
+                   lambda nombre: inventario.buscar_por_prefijo(nombre, 1))
+    mayusculas = [nombre.upper() for nombre in muestra]
+    medir_latencia("nombre sin tildes/mayúsculas", mayusculas, inventario.resolver_nombre)
+    mal_escritos = [con_error_de_tipeo(nombre, azar) for nombre in muestra[:CONSULTAS // 10]]
+    medir_latencia("similares (trigramas)", mal_escritos, inventario.buscar_similares)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark de memoria del inventario en memoria.
+
+Compara los bytes por producto de:
+- Diccionarios anidados {nombre: {"tipo", "precio", "stock"}} (estructura anterior)
+- Registros Producto (__slots__ y tipo internado) en un diccionario simple
+- InventarioMemoria: registros Producto más los índices que se mantienen siempre
+- InventarioMemoria tras una búsqueda aproximada (con el índice de trigramas armado)
+
+Para ejecutar:
+    python benchmarks/benchmark_memoria.py             # 100000 productos
+    python benchmarks/benchmark_memoria.py 1000000     # cantidad personalizada
+"""
+
+import os
+import sys
+import tracemalloc
+
+# Agregar el directorio padre al path para poder importar los módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.benchmark_backends import generar_nombres
+from productos.inventario_memoria import InventarioMemoria, Producto
+
+
+def bytes_por_producto(nombres, construir):
+    """
+    Mide con tracemalloc la memoria que ocupa la estructura devuelta por `construir`
+
+    Returns:
+        tuple: (estructura, bytes totales)
+    """
+    tracemalloc.start()
+    inicio = tracemalloc.take_snapshot()
+    estructura = construir(nombres)
+    fin = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    return estructura, sum(estadistica.size_diff for estadistica in fin.compare_to(inicio, 'filename'))
+
+
+def medir_memoria(descripcion, nombres, construir):
+    """Imprime los bytes por producto de la estructura devuelta por `construir`"""
+    estructura, total = bytes_por_producto(nombres, construir)
+    print(f"   {descripcion:<32} {total / len(nombres):>8.1f} bytes/producto  ({total / 1024 ** 2:.1f} MiB)")
+    return estructura
+
+
+def construir_diccionarios(nombres):
+    # El tipo se arma en tiempo de ejecución, como cuando llega de input()
+    return {nombre: {"tipo": "".join(["fru", "ta"]), "precio": 1.5, "stock": 10} for nombre in nombres}
+
+
+def construir_registros(nombres):
+    return {nombre: Producto("".join(["fru", "ta"]), 1.5, 10) for nombre in nombres}
+
+
+def construir_inventario(nombres):
+    inventario = InventarioMemoria()
+    for nombre in nombres:
+        inventario[nombre] = Producto("".join(["fru", "ta"]), 1.5, 10)
+    return inventario
+
+
+def construir_inventario_con_trigramas(nombres):
+    inventario = construir_inventario(nombres)
+    inventario.buscar_similares(nombres[0])
+    return inventario
+
+
+def main():
+    """Ejecuta el benchmark de memoria"""
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    # Los nombres se crean antes de medir: son iguales en ambas estructuras
+    nombres = generar_nombres(cantidad)
+    print(f"🧠 Memoria del inventario con {cantidad} productos")
+
+    medir_memoria("Diccionarios anidados", nombres, construir_diccionarios)
+    medir_memoria("Registros Producto", nombres, construir_registros)
+    medir_memoria("InventarioMemoria + índices", nombres, construir_inventario)
+    medir_memoria("  + trigramas (buscar_similares)", nombres, construir_inventario_con_trigramas)
+
+
+if __name__ == "__main__":
+    main()
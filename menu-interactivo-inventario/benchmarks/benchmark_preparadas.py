@@ -0,0 +1,96 @@
+"""
+Benchmark de las sentencias preparadas de MySQL.
+
+Ejecuta las operaciones frecuentes (alta, actualización de precio y stock,
+lectura por nombre, página del listado y baja) con la caché de sentencias
+preparadas desactivada (el texto SQL se analiza en cada llamada) y activada,
+e imprime la latencia media por operación y lo que se ahorra.
+La caché de lecturas se desactiva para medir siempre la consulta al servidor.
+
+Para ejecutar:
+    python benchmarks/benchmark_preparadas.py          # 2000 productos
+    python benchmarks/benchmark_preparadas.py 20000    # cantidad personalizada
+"""
+
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+
+# Agregar el directorio padre al path para poder importar los módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.benchmark_backends import generar_nombres
+
+
+def medir_operaciones(bd_conexion, nombres):
+    """
+    Ejecuta cada operación para todos los nombres
+
+    Returns:
+        dict: {operación: segundos por llamada}
+    """
+    from productos.operaciones_bd import (
+        agregar_producto_bd, actualizar_producto_bd, eliminar_producto_bd,
+        obtener_producto_bd, obtener_pagina_productos
+    )
+
+    operaciones = {
+        "agregar": lambda nombre: agregar_producto_bd(nombre, "fruta", 1.0, 10, bd_conexion),
+        "precio": lambda nombre: actualizar_producto_bd(nombre, "precio", 2.0, bd_conexion),
+        "stock": lambda nombre: actualizar_producto_bd(nombre, "stock", 20, bd_conexion),
+        "leer": lambda nombre: obtener_producto_bd(bd_conexion, nombre),
+        "página": lambda nombre: obtener_pagina_productos(bd_conexion, nombre, 20),
+        "eliminar": lambda nombre: eliminar_producto_bd(nombre, bd_conexion),
+    }
+    tiempos = {}
+    with redirect_stdout(StringIO()):
+        bd_conexion.limpiar_todos_los_datos()
+        for descripcion, operacion in operaciones.items():
+            inicio = time.perf_counter()
+            for nombre in nombres:
+                operacion(nombre)
+            tiempos[descripcion] = (time.perf_counter() - inicio) / len(nombres)
+    return tiempos
+
+
+def main():
+    """Compara la latencia por operación con y sin sentencias preparadas"""
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    nombres = generar_nombres(cantidad)
+
+    try:
+        from productos.database import obtener_conexion_base_datos
+    except ImportError as e:
+        print(f"🗄️ MySQL omitido: {e}")
+        return
+
+    with redirect_stdout(StringIO()):
+        bd_conexion = obtener_conexion_base_datos(modo_prueba=True)
+    if bd_conexion is None:
+        print("🗄️ MySQL omitido: no se pudo conectar a la BD de pruebas")
+        return
+
+    print(f"⏱️  Sentencias preparadas con {cantidad} productos (latencia media por operación)")
+    bd_conexion.cache = None
+    max_preparadas = bd_conexion.max_preparadas
+
+    bd_conexion.max_preparadas = 0
+    texto = medir_operaciones(bd_conexion, nombres)
+    bd_conexion.max_preparadas = max_preparadas
+    preparadas = medir_operaciones(bd_conexion, nombres)
+
+    print(f"   {'operación':<10} {'texto':>10} {'preparada':>10} {'ahorro':>10}")
+    for descripcion in texto:
+        ahorro = texto[descripcion] - preparadas[descripcion]
+        print(f"   {descripcion:<10} {texto[descripcion] * 1e6:>7.0f} µs {preparadas[descripcion] * 1e6:>7.0f} µs "
+              f"{ahorro * 1e6:>7.0f} µs ({ahorro / texto[descripcion]:+.0%})")
+
+    with redirect_stdout(StringIO()):
+        bd_conexion.limpiar_todos_los_datos()
+    bd_conexion.desconectar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+"""
+CLI no interactiva del inventario, para scripts y cargas masivas.
+
+A diferencia del menú, no pide datos con input(): cada subcomando recibe
+muchos productos por argumento (o por la entrada estándar con "-") y usa las
+funciones core del backend configurado en INVENTARIO_MODO (o --modo).
+
+Uso:
+    python cli_inventario.py agregar "manzana,fruta,100,5" "pera,fruta,80,3"
+    python cli_inventario.py actualizar precio manzana=120 pera=90
+    python cli_inventario.py eliminar manzana pera
+    python cli_inventario.py listar --formato csv > inventario.csv
+    python cli_inventario.py importar productos.csv --rechazos rechazados.csv
+    python cli_inventario.py importar productos.jsonl
+    python cli_inventario.py importar proveedor.csv --procesos 8
+    python cli_inventario.py exportar respaldo.jsonl.gz
+    cat nombres.txt | python cli_inventario.py eliminar -
+
+Los mensajes de las operaciones van a stderr (o se descartan con --silencioso);
+stdout queda para el listado y el resumen final.
+
+Códigos de salida:
+    0  Todos los productos se procesaron
+    1  Algún producto fue rechazado, estaba duplicado o no existía
+    2  Argumentos inválidos
+    3  No se pudo abrir el backend o falló la escritura
+"""
+
+import argparse
+import os
+import sys
+from contextlib import redirect_stdout
+from itertools import islice
+
+from dotenv import load_dotenv
+
+from productos.backends import TAMANO_LOTE, backends_disponibles, obtener_backend
+from productos.exportacion import COMPRESIONES, escribir_productos, exportar_catalogo
+from productos.importacion import importar_archivo, validar_producto
+from productos.importacion_paralela import importar_archivo_paralelo
+from productos.validaciones import validar_nombre, validar_precio, validar_stock
+
+SALIDA_OK = 0
+SALIDA_PARCIAL = 1
+SALIDA_USO = 2
+SALIDA_ERROR = 3
+
+
+def leer_elementos(valores):
+    """
+    Recorre los valores recibidos por argumento; "-" se reemplaza por las
+    líneas no vacías de la entrada estándar (se leen de a una)
+
+    Args:
+        valores (list): Valores de la línea de comandos
+
+    Yields:
+        str: Cada elemento
+    """
+    for valor in valores:
+        if valor == '-':
+            for linea in sys.stdin:
+                linea = linea.strip()
+                if linea:
+                    yield linea
+        else:
+            yield valor
+
+
+def _rechazar(resumen, elemento, motivo):
+    """Cuenta un elemento rechazado e informa el motivo por stderr"""
+    resumen['rechazados'] += 1
+    print(f"❌ Rechazado {elemento!r}: {motivo}", file=sys.stderr)
+
+
+def _productos_desde_argumentos(elementos, resumen):
+    """Convierte elementos 'nombre,tipo,precio,stock' en productos validados"""
+    for elemento in elementos:
+        campos = elemento.split(',')
+        if len(campos) != 4:
+            _rechazar(resumen, elemento, "se esperaba 'nombre,tipo,precio,stock'")
+            continue
+        producto, motivo = validar_producto(*campos)
+        if producto is None:
+            _rechazar(resumen, elemento, motivo)
+        else:
+            yield producto
+
+
+def _aplicar_en_lotes(backend, elementos, operacion, resumen, tamano_lote):
+    """
+    Aplica una operación a cada elemento, con un commit cada tamano_lote
+
+    Args:
+        backend (BackendInventario): Backend abierto
+        elementos (iterable): Argumentos de la operación (tuplas)
+        operacion (callable): Devuelve True si tuvo efecto
+        resumen (dict): Contadores a actualizar ('procesados', 'no_encontrados')
+        tamano_lote (int): Elementos por transacción
+    """
+    elementos = iter(elementos)
+    while lote := list(islice(elementos, tamano_lote)):
+        with backend.transaccion():
+            for argumentos in lote:
+                if operacion(*argumentos):
+                    resumen['procesados'] += 1
+                else:
+                    resumen['no_encontrados'] += 1
+
+
+def comando_agregar(backend, argumentos, resumen):
+    """Agrega los productos 'nombre,tipo,precio,stock' recibidos"""
+    productos = _productos_desde_argumentos(leer_elementos(argumentos.productos), resumen)
+    insertados, duplicados = backend.agregar_lote(productos, argumentos.tamano_lote)
+    resumen['procesados'] += insertados
+    resumen['duplicados'] += len(duplicados)
+
+
+def comando_importar(backend, argumentos, resumen):
+    """Importa un archivo CSV o JSONL fila por fila (o de stdin con "-"), validando en paralelo con --procesos"""
+    if argumentos.procesos > 1:
+        resultado = importar_archivo_paralelo(argumentos.archivo, backend, argumentos.formato, argumentos.procesos,
+                                              argumentos.tamano_lote, argumentos.rechazos)
+    else:
+        resultado = importar_archivo(argumentos.archivo, backend, argumentos.formato,
+                                     argumentos.tamano_lote, argumentos.rechazos)
+    resumen['procesados'] += resultado['importadas']
+    resumen['rechazados'] += resultado['rechazadas']
+    resumen['duplicados'] += resultado['existentes']
+    print(f"📥 {resultado['leidas']} filas en {resultado['segundos']:.2f} s "
+          f"({resultado['filas_por_segundo']:.0f} filas/s)", file=sys.stderr)
+
+
+def comando_actualizar(backend, argumentos, resumen):
+    """Actualiza el precio o el stock de los pares nombre=valor recibidos"""
+    validar_valor = validar_precio if argumentos.campo == 'precio' else validar_stock
+
+    def cambios():
+        for elemento in leer_elementos(argumentos.cambios):
+            nombre, separador, valor = elemento.rpartition('=')
+            nombre_valido = validar_nombre(nombre, permitir_cancelar=False)
+            valor_valido = validar_valor(valor)
+            if not separador:
+                _rechazar(resumen, elemento, "se esperaba 'nombre=valor'")
+            elif nombre_valido in ('vacio', 'invalido'):
+                _rechazar(resumen, elemento, f"nombre {nombre_valido}")
+            elif valor_valido in ('cancelado', 'invalido'):
+                _rechazar(resumen, elemento, f"{argumentos.campo} inválido")
+            else:
+                yield (nombre_valido, argumentos.campo, valor_valido)
+
+    _aplicar_en_lotes(backend, cambios(), backend.actualizar, resumen, argumentos.tamano_lote)
+
+
+def comando_eliminar(backend, argumentos, resumen):
+    """Elimina los productos recibidos por nombre"""
+    def nombres():
+        for elemento in leer_elementos(argumentos.nombres):
+            nombre = validar_nombre(elemento, permitir_cancelar=False)
+            if nombre in ('vacio', 'invalido'):
+                _rechazar(resumen, elemento, f"nombre {nombre}")
+            else:
+                yield (nombre,)
+
+    _aplicar_en_lotes(backend, nombres(), backend.eliminar, resumen, argumentos.tamano_lote)
+
+
+def comando_listar(backend, argumentos, resumen, salida):
+    """Escribe el catálogo en salida, producto por producto"""
+    productos = backend.iterar_productos()
+    if argumentos.formato != 'tabla':
+        resumen['procesados'] += escribir_productos(productos, salida, argumentos.formato)
+        return
+    for producto in productos:
+        salida.write(f"{producto['nombre']:<25} {producto['tipo']:<8} "
+                     f"${producto['precio']:>10.2f} {producto['stock']:>8}\n")
+        resumen['procesados'] += 1
+
+
+def comando_exportar(backend, argumentos, resumen, salida):
+    """Exporta el catálogo completo a un archivo CSV o JSONL (o a salida con "-"), comprimido si se pide"""
+    resultado = exportar_catalogo(backend, argumentos.archivo, argumentos.formato, argumentos.compresion, salida)
+    resumen['procesados'] += resultado['filas']
+    print(f"📤 {resultado['filas']} productos exportados en {resultado['segundos']:.2f} s "
+          f"({resultado['filas_por_segundo']:.0f} filas/s)", file=sys.stderr)
+
+
+def crear_parser():
+    """Arma el parser de argumentos con un subcomando por operación"""
+    parser = argparse.ArgumentParser(
+        prog='cli_inventario.py',
+        description="Operaciones no interactivas sobre el inventario.",
+        epilog="Códigos de salida: 0 = todo procesado, 1 = algún producto rechazado/duplicado/inexistente, "
+               "2 = argumentos inválidos, 3 = error del backend.",
+    )
+    parser.add_argument('--modo', choices=backends_disponibles(),
+                        default=os.getenv('INVENTARIO_MODO', 'diccionario').lower(),
+                        help="Backend a usar (por defecto INVENTARIO_MODO)")
+    parser.add_argument('--prueba', action='store_true', help="Usar el almacenamiento de pruebas")
+    parser.add_argument('-q', '--silencioso', action='store_true',
+                        help="Descartar los mensajes de cada operación (los rechazos se informan igual)")
+    parser.add_argument('--tamano-lote', type=int, default=TAMANO_LOTE,
+                        help=f"Productos por transacción (por defecto {TAMANO_LOTE})")
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    agregar = subparsers.add_parser('agregar', help="Agregar productos 'nombre,tipo,precio,stock'")
+    agregar.add_argument('productos', nargs='+', help="Productos a agregar ('-' = leer de stdin, uno por línea)")
+    agregar.set_defaults(funcion=comando_agregar)
+
+    actualizar = subparsers.add_parser('actualizar', help="Actualizar precio o stock con pares nombre=valor")
+    actualizar.add_argument('campo', choices=['precio', 'stock'])
+    actualizar.add_argument('cambios', nargs='+', help="Pares nombre=valor ('-' = leer de stdin)")
+    actualizar.set_defaults(funcion=comando_actualizar)
+
+    eliminar = subparsers.add_parser('eliminar', help="Eliminar productos por nombre")
+    eliminar.add_argument('nombres', nargs='+', help="Nombres a eliminar ('-' = leer de stdin)")
+    eliminar.set_defaults(funcion=comando_eliminar)
+
+    listar = subparsers.add_parser('listar', help="Listar el catálogo")
+    listar.add_argument('--formato', choices=['tabla', 'csv', 'jsonl'], default='tabla')
+    listar.set_defaults(funcion=comando_listar)
+
+    exportar = subparsers.add_parser('exportar', help="Exportar el catálogo a CSV o JSONL (gzip/lzma opcional)")
+    exportar.add_argument('archivo', help="Archivo de salida ('-' = stdout); .gz/.xz comprimen")
+    exportar.add_argument('--formato', choices=['csv', 'jsonl'],
+                          help="Formato del archivo (por defecto, según la extensión)")
+    exportar.add_argument('--compresion', choices=sorted(COMPRESIONES),
+                          help="Compresión (por defecto, según la extensión)")
+    exportar.set_defaults(funcion=comando_exportar)
+
+    importar = subparsers.add_parser('importar', help="Agregar los productos de un CSV o JSONL "
+                                                      "con nombre, tipo, precio y stock")
+    importar.add_argument('archivo', help="Ruta del archivo ('-' = leer de stdin)")
+    importar.add_argument('--formato', choices=['csv', 'jsonl'],
+                          help="Formato del archivo (por defecto, según la extensión)")
+    importar.add_argument('--rechazos', default='-',
+                          help="Archivo donde guardar las filas rechazadas con su motivo (por defecto stderr)")
+    importar.add_argument('--procesos', type=int, default=1,
+                          help="Procesos que validan en paralelo (por defecto 1; más de 1 necesita un archivo)")
+    importar.set_defaults(funcion=comando_importar)
+
+    return parser
+
+
+def main(argv=None):
+    """
+    Ejecuta un subcomando
+
+    Args:
+        argv (list): Argumentos (por defecto, los de la línea de comandos)
+
+    Returns:
+        int: Código de salida
+    """
+    load_dotenv()
+    parser = crear_parser()
+    argumentos = parser.parse_args(argv)
+    if argumentos.tamano_lote < 1:
+        parser.error("--tamano-lote debe ser mayor que 0")
+    if argumentos.comando == 'importar' and argumentos.procesos > 1 and argumentos.archivo == '-':
+        parser.error("--procesos necesita un archivo: la entrada estándar no se puede dividir")
+    if argumentos.comando == 'importar' and argumentos.procesos < 1:
+        parser.error("--procesos debe ser mayor que 0")
+
+    salida = sys.stdout
+    mensajes = open(os.devnull, 'w') if argumentos.silencioso else sys.stderr
+    resumen = {'procesados': 0, 'rechazados': 0, 'duplicados': 0, 'no_encontrados': 0}
+    try:
+        with redirect_stdout(mensajes):
+            backend = obtener_backend(argumentos.modo, modo_prueba=argumentos.prueba)
+            if not backend.abrir():
+                print("❌ No se pudo abrir el backend.", file=sys.stderr)
+                return SALIDA_ERROR
+            try:
+                if argumentos.comando in ('listar', 'exportar'):
+                    argumentos.funcion(backend, argumentos, resumen, salida)
+                else:
+                    argumentos.funcion(backend, argumentos, resumen)
+            except Exception as e:
+                # Archivo ilegible, encabezado incorrecto o fallo del backend al confirmar
+                print(f"❌ Error: {e}", file=sys.stderr)
+                return SALIDA_ERROR
+            finally:
+                backend.cerrar()
+    finally:
+        if mensajes is not sys.stderr:
+            mensajes.close()
+
+    if argumentos.comando in ('listar', 'exportar'):
+        return SALIDA_OK  # stdout puede tener los datos: sin resumen
+    print(f"✅ {resumen['procesados']} procesados, {resumen['rechazados']} rechazados, "
+          f"{resumen['duplicados']} duplicados, {resumen['no_encontrados']} no encontrados.")
+    if argumentos.modo == 'diccionario' and not os.getenv('DICCIONARIO_DIR_PERSISTENCIA'):
+        print("⚠️ Modo diccionario sin DICCIONARIO_DIR_PERSISTENCIA: los cambios no se guardaron.",
+              file=sys.stderr)
+    if resumen['rechazados'] or resumen['duplicados'] or resumen['no_encontrados']:
+        return SALIDA_PARCIAL
+    return SALIDA_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,12 @@
 #Implementación de un menú para gestionar un inventario de productos.
-#Permite alternar entre almacenamiento en diccionario (memoria) o base de datos MySQL
-#usando la variable de entorno INVENTARIO_MODO.
+#Permite alternar entre almacenamiento en diccionario (memoria), base de datos MySQL
+#o SQLite (archivo local) usando la variable de entorno INVENTARIO_MODO.
 #El programa presentará un menú que le permitirá al usuario elegir qué acción desea realizar.
 
 import os
 from dotenv import load_dotenv
-from productos.database import obtener_conexion_base_datos
+from productos.backends import obtener_backend
+from productos.metricas import activar_metricas
 
 # Cargar variables de entorno
 load_dotenv()
@@ -13,32 +14,23 @@ load_dotenv()
 # Determinar modo de almacenamiento desde variable de entorno
 MODO_ALMACENAMIENTO = os.getenv('INVENTARIO_MODO', 'diccionario').lower()
 
-# Imports dinámicos según el modo configurado
-if MODO_ALMACENAMIENTO == 'bd':
-    from productos.operaciones_bd import (
-        intentar_agregar_producto,
-        mostrar_productos,
-        intentar_actualizar_producto,
-        intentar_eliminar_producto
-    )
-    MODO_TEXTO = "Base de datos MySQL"
-else:
-    from productos.operaciones_diccionario import (
-        intentar_agregar_producto, 
-        mostrar_productos, 
-        intentar_actualizar_producto, 
-        intentar_eliminar_producto
-    )
-    MODO_TEXTO = "Diccionario (en memoria)"
+# El backend se importa de forma diferida: solo se carga el módulo del modo elegido
+backend = obtener_backend(MODO_ALMACENAMIENTO)
+if backend is None:
+    print(f"⚠️ Modo '{MODO_ALMACENAMIENTO}' desconocido. Se usará el diccionario en memoria.")
+    backend = obtener_backend('diccionario')
+MODO_TEXTO = backend.descripcion
 
-#Creacion de la instancia de la base de datos si es necesario
-if MODO_ALMACENAMIENTO == 'bd':
-    bd_conexion = obtener_conexion_base_datos(modo_prueba=False)
-    if bd_conexion:
-        print("✅ Conexión a la base de datos establecida correctamente.")
-    else:
-        print("❌ No se pudo establecer la conexión a la base de datos. Saliendo del programa.")
-        exit(1)
+# Métricas en formato Prometheus (desactivadas si METRICAS_PUERTO está vacío).
+# Se activan antes de abrir el backend para que el medidor del catálogo arranque con su tamaño real.
+METRICAS_PUERTO = os.getenv('METRICAS_PUERTO', '')
+if METRICAS_PUERTO:
+    activar_metricas(int(METRICAS_PUERTO))
+    print(f"📈 Métricas disponibles en http://127.0.0.1:{METRICAS_PUERTO}/metrics")
+
+if not backend.abrir():
+    print("❌ No se pudo establecer la conexión a la base de datos. Saliendo del programa.")
+    exit(1)
 
 def mostrar_menu():
     """Menú principal - modo determinado por variable de entorno"""
@@ -60,42 +52,29 @@ def mostrar_menu():
         match opcion:
             case "1":
                 while True:
-                    if MODO_ALMACENAMIENTO == 'bd':
-                        estado, _ = intentar_agregar_producto(bd_conexion)
-                    else:
-                        estado, _ = intentar_agregar_producto()
+                    estado, _ = backend.intentar_agregar_producto()
                     if estado in ["ok", "cancelado"]:
                         break
-            
+
             case "2":
-                if MODO_ALMACENAMIENTO == 'bd':
-                    mostrar_productos(bd_conexion)
-                else:
-                    mostrar_productos()
+                backend.mostrar_productos()
 
             case "3":
                 while True:
-                    if MODO_ALMACENAMIENTO == 'bd':
-                        estado, _ = intentar_actualizar_producto(bd_conexion)
-                    else:
-                        estado, _ = intentar_actualizar_producto()
+                    estado, _ = backend.intentar_actualizar_producto()
                     if estado in ["ok", "cancelado", "no_encontrado"]:
                         break
-            
+
             case "4":
                 while True:
-                    if MODO_ALMACENAMIENTO == 'bd':
-                        estado, _ = intentar_eliminar_producto(bd_conexion)
-                    else:
-                        estado, _ = intentar_eliminar_producto()
+                    estado, _ = backend.intentar_eliminar_producto()
                     if estado in ["ok", "cancelado", "no_encontrado"]:
                         break
-            
+
             case "5":
                 print("Saliendo del programa...\n")
-                if MODO_ALMACENAMIENTO == 'bd' and bd_conexion:
-                    bd_conexion.desconectar()
-                    print("🔒 Conexión a la base de datos cerrada.")
+                # En MySQL, cerrar() escribe antes los cambios pendientes del buffer de escritura
+                backend.cerrar()
                 break
 
 def main():
@@ -3,9 +3,23 @@
 Paquete que contiene los módulos para la gestión de inventario:
 
 - validaciones.py: Funciones puras para validar entradas de usuario
+- inventario_memoria.py: Registros compactos (__slots__) del inventario en memoria
+- indices.py: Índices secundarios del inventario en memoria (tipo, precio, prefijos)
+- autocompletado.py: Autocompletado de nombres con Tab en los prompts (readline opcional)
 - operaciones_diccionario.py: Operaciones CRUD usando diccionario en memoria
+- persistencia_diccionario.py: Log de operaciones y snapshots para el diccionario (opcional)
 - operaciones_bd.py: Operaciones CRUD usando base de datos MySQL
+- operaciones_sqlite.py: Operaciones CRUD usando base de datos SQLite
 - database.py: Gestión de conexiones a la base de datos
+- cache_consultas.py: Caché LRU/TTL de lecturas de MySQL con invalidación por nombre
+- buffer_escritura.py: Escritura diferida (write-behind) de precio/stock en MySQL (opcional)
+- estadisticas_consultas.py: Histogramas de latencia por sentencia y log de consultas lentas
+- metricas.py: Métricas de las operaciones en formato Prometheus y endpoint /metrics (opcional)
+- importacion.py: Importación de CSV/JSONL en streaming (parseo, validación, deduplicación y escritura por lotes)
+- importacion_paralela.py: Importación que valida rangos del archivo en varios procesos (ProcessPoolExecutor)
+- exportacion.py: Exportación del catálogo a CSV/JSONL en streaming, con compresión gzip/lzma opcional
+- database_sqlite.py: Gestión de la conexión SQLite (modo WAL)
+- backends.py: Registro de backends con importación diferida (usado por el menú)
 
 Para usar las funciones, importa directamente desde cada módulo:
     from productos.validaciones import validar_nombre
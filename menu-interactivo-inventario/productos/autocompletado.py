@@ -0,0 +1,61 @@
+"""
+Módulo de autocompletado de nombres de producto en los prompts interactivos.
+
+Usa readline (opcional): en plataformas sin readline, como Windows, el
+autocompletado no se activa e input() funciona igual que siempre.
+Presionando Tab se completan los nombres que empiezan con lo escrito.
+"""
+
+from contextlib import contextmanager
+
+try:
+    import readline
+except ImportError:  # readline no está disponible en todas las plataformas
+    readline = None
+
+LIMITE_SUGERENCIAS = 50  # Nombres máximos ofrecidos por cada Tab
+
+
+def _crear_completador(buscar_por_prefijo):
+    """
+    Crea la función que readline llama con (texto, estado) para cada candidato
+
+    Args:
+        buscar_por_prefijo (callable): (prefijo, limite) -> lista de nombres
+    """
+    candidatos = []
+
+    def completar(texto, estado):
+        # readline pide los candidatos de a uno: se buscan una sola vez, con estado 0
+        if estado == 0:
+            candidatos[:] = buscar_por_prefijo(texto.lstrip().lower(), LIMITE_SUGERENCIAS)
+        return candidatos[estado] if estado < len(candidatos) else None
+
+    return completar
+
+
+@contextmanager
+def autocompletar_nombres(buscar_por_prefijo):
+    """
+    Activa el autocompletado con Tab mientras dura el bloque with
+
+    Args:
+        buscar_por_prefijo (callable): (prefijo, limite) -> lista de nombres
+    """
+    if readline is None:
+        yield
+        return
+
+    completador_anterior = readline.get_completer()
+    delimitadores_anteriores = readline.get_completer_delims()
+    if 'libedit' in (readline.__doc__ or ''):
+        readline.parse_and_bind('bind ^I rl_complete')  # readline de macOS (libedit)
+    else:
+        readline.parse_and_bind('tab: complete')
+    readline.set_completer(_crear_completador(buscar_por_prefijo))
+    readline.set_completer_delims('')  # Los nombres llevan espacios: se completa la línea entera
+    try:
+        yield
+    finally:
+        readline.set_completer(completador_anterior)
+        readline.set_completer_delims(delimitadores_anteriores)
@@ -0,0 +1,534 @@
+"""
+Módulo con los backends de almacenamiento del inventario.
+
+Todos los backends exponen el mismo conjunto de métodos y manejan su propio
+estado de conexión, así el menú no necesita saber cuál está usando.
+Los módulos de cada backend se importan recién en abrir(): el arranque solo
+paga por el backend elegido (el modo diccionario no importa mysql.connector).
+
+Para agregar un backend nuevo basta con registrarlo:
+    registrar_backend('mi_backend', 'mi_paquete.mi_modulo:MiBackend')
+"""
+
+import importlib
+import os
+from abc import ABC, abstractmethod
+from contextlib import nullcontext
+from functools import wraps
+from itertools import islice
+
+from productos.metricas import metricas
+
+TAMANO_LOTE = 1000  # Productos por transacción en agregar_lote()
+CONSULTA_CATALOGO = "SELECT nombre, tipo, precio, stock FROM productos ORDER BY nombre"
+
+
+# Resultado que cuenta una operación de la CLI cuando devuelve False, con las
+# mismas etiquetas que el menú: agregar falla por duplicado, las demás porque
+# el producto no existe
+ESTADO_FALLIDO = {'agregar': 'duplicado', 'actualizar': 'no_encontrado', 'eliminar': 'no_encontrado'}
+
+
+def _contar_operacion(operacion, metodo):
+    """
+    Envuelve una operación sin input() (agregar, actualizar, eliminar) para que
+    cuente su resultado en las métricas: 'ok' si devolvió True y si no
+    'duplicado' o 'no_encontrado' (ver ESTADO_FALLIDO)
+    """
+    @wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        hecho = metodo(self, *args, **kwargs)
+        if metricas.activo:
+            self._contar(operacion, 'ok' if hecho else ESTADO_FALLIDO[operacion])
+        return hecho
+    envoltura.contada = True
+    return envoltura
+
+
+def _contar_lote(metodo):
+    """Envuelve un agregar_lote propio del backend para que cuente insertados y duplicados"""
+    @wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        insertados, duplicados = metodo(self, *args, **kwargs)
+        if metricas.activo:
+            self._contar('agregar', 'ok', insertados)
+            self._contar('agregar', 'duplicado', len(duplicados))
+        return (insertados, duplicados)
+    envoltura.contada = True
+    return envoltura
+
+
+def _producto_exportable(fila):
+    """Convierte una fila de cualquier backend en {"nombre", "tipo", "precio", "stock"}"""
+    return {"nombre": fila['nombre'], "tipo": fila['tipo'], "precio": float(fila['precio']), "stock": fila['stock']}
+
+
+class BackendInventario(ABC):
+    """
+    Interfaz común de los backends de almacenamiento.
+    Las operaciones del menú, las de la CLI e iterar_productos son obligatorias:
+    un backend al que le falte alguna no se puede crear (TypeError).
+    """
+
+    descripcion = "Backend de inventario"
+    nombre = "inventario"  # Etiqueta 'backend' de las métricas
+
+    def __init__(self, modo_prueba=False):
+        """
+        Args:
+            modo_prueba (bool): Si True, usa el almacenamiento de pruebas
+        """
+        self.modo_prueba = modo_prueba
+
+    def __init_subclass__(cls, **kwargs):
+        # Las operaciones que usan la CLI y la importación cuentan en las métricas
+        # igual que el menú, también en los backends registrados desde afuera
+        super().__init_subclass__(**kwargs)
+        for operacion in ('agregar', 'actualizar', 'eliminar'):
+            metodo = cls.__dict__.get(operacion)
+            if metodo is not None and not getattr(metodo, 'contada', False):
+                setattr(cls, operacion, _contar_operacion(operacion, metodo))
+        # El agregar_lote de la base llama a agregar(), que ya cuenta; solo se
+        # envuelven los que escriben por su cuenta (ej. INSERT multi-fila)
+        metodo = cls.__dict__.get('agregar_lote')
+        if metodo is not None and not getattr(metodo, 'contada', False):
+            cls.agregar_lote = _contar_lote(metodo)
+
+    def contar_productos(self):
+        """
+        Devuelve la cantidad de productos del catálogo. Por defecto recorre
+        iterar_productos(); los backends con un conteo directo lo reemplazan
+
+        Returns:
+            int: Cantidad de productos
+        """
+        return sum(1 for _ in self.iterar_productos())
+
+    def _actualizar_tamano(self):
+        """Fija el medidor inventario_productos con el tamaño actual del catálogo"""
+        if metricas.activo:
+            metricas.fijar('inventario_productos', (('backend', self.nombre),), self.contar_productos())
+
+    def _contar(self, operacion, estado, cantidad=1):
+        """
+        Cuenta operaciones en las métricas y mueve el tamaño del catálogo
+
+        Args:
+            operacion (str): 'agregar', 'actualizar' o 'eliminar'
+            estado (str): Resultado ('ok', 'duplicado', 'no_encontrado', ...)
+            cantidad (int): Cuántas operaciones con ese resultado
+        """
+        if not cantidad:
+            return
+        metricas.incrementar('inventario_operaciones_total',
+                             (('backend', self.nombre), ('operacion', operacion), ('resultado', estado)), cantidad)
+        if estado == 'ok' and operacion != 'actualizar':
+            # Altas y bajas mueven el catálogo (sin volver a contarlo)
+            metricas.incrementar('inventario_productos', (('backend', self.nombre),),
+                                 cantidad if operacion == 'agregar' else -cantidad)
+
+    def _registrar(self, operacion, resultado):
+        """
+        Cuenta el resultado de una operación del menú en las métricas
+
+        Args:
+            operacion (str): 'agregar', 'actualizar' o 'eliminar'
+            resultado (tuple): (estado, nombre) devuelto por la operación
+
+        Returns:
+            tuple: El mismo resultado
+        """
+        if metricas.activo:
+            self._contar(operacion, resultado[0])
+        return resultado
+
+    def abrir(self):
+        """
+        Prepara el backend (importa sus módulos y abre conexiones)
+
+        Returns:
+            bool: True si el backend quedó listo para usarse
+        """
+        return True
+
+    def cerrar(self):
+        """Libera los recursos del backend"""
+
+    @abstractmethod
+    def intentar_agregar_producto(self):
+        """
+        Pide los datos con input() y agrega el producto
+
+        Returns:
+            tuple: (estado, nombre) con 'ok', 'cancelado', 'no_encontrado', ...
+        """
+
+    @abstractmethod
+    def mostrar_productos(self):
+        """Muestra el catálogo en pantalla"""
+
+    @abstractmethod
+    def intentar_actualizar_producto(self):
+        """
+        Pide el nombre con input() y cambia su precio o stock
+
+        Returns:
+            tuple: (estado, nombre) con 'ok', 'cancelado', 'no_encontrado', ...
+        """
+
+    @abstractmethod
+    def intentar_eliminar_producto(self):
+        """
+        Pide el nombre con input() y lo elimina (con confirmación)
+
+        Returns:
+            tuple: (estado, nombre) con 'ok', 'cancelado', 'no_encontrado', ...
+        """
+
+    # Operaciones sin input(), para la CLI y los scripts: reciben datos ya validados
+
+    @abstractmethod
+    def agregar(self, nombre, tipo, precio, stock):
+        """
+        Returns:
+            bool: True si se agregó, False si ya existía o falló
+        """
+
+    @abstractmethod
+    def actualizar(self, nombre, campo, valor):
+        """
+        Returns:
+            bool: True si se actualizó, False si el producto no existe o falló
+        """
+
+    @abstractmethod
+    def eliminar(self, nombre):
+        """
+        Returns:
+            bool: True si se eliminó, False si el producto no existe o falló
+        """
+
+    @abstractmethod
+    def iterar_productos(self):
+        """
+        Recorre el catálogo sin cargarlo entero en memoria
+
+        Yields:
+            dict: {"nombre", "tipo", "precio", "stock"} de cada producto
+        """
+
+    def transaccion(self):
+        """Agrupa varias operaciones en un único commit (sin efecto si el backend no tiene transacciones)"""
+        return nullcontext()
+
+    def agregar_lote(self, productos, tamano_lote=TAMANO_LOTE):
+        """
+        Agrega muchos productos, con un commit cada tamano_lote
+
+        Args:
+            productos (iterable): Tuplas (nombre, tipo, precio, stock) ya validadas
+            tamano_lote (int): Productos por transacción
+
+        Returns:
+            tuple: (insertados, duplicados) con la cantidad agregada y la lista
+                   de nombres que no se pudieron agregar
+        """
+        insertados = 0
+        duplicados = []
+        productos = iter(productos)
+        while lote := list(islice(productos, tamano_lote)):
+            with self.transaccion():
+                for nombre, tipo, precio, stock in lote:
+                    if self.agregar(nombre, tipo, precio, stock):
+                        insertados += 1
+                    else:
+                        duplicados.append(nombre)
+        return (insertados, duplicados)
+
+
+class BackendDiccionario(BackendInventario):
+    """Backend en memoria sobre operaciones_diccionario"""
+
+    descripcion = "Diccionario (en memoria)"
+    nombre = "diccionario"
+
+    def __init__(self, modo_prueba=False, directorio_persistencia=None):
+        """
+        Args:
+            modo_prueba (bool): Sin efecto (el diccionario no tiene almacenamiento de pruebas)
+            directorio_persistencia (str): Carpeta del log de operaciones. Si no se
+                indica se usa DICCIONARIO_DIR_PERSISTENCIA; vacío = sin persistencia
+        """
+        super().__init__(modo_prueba)
+        if directorio_persistencia is None:
+            directorio_persistencia = os.getenv('DICCIONARIO_DIR_PERSISTENCIA', '')
+        self.directorio_persistencia = directorio_persistencia
+
+    def abrir(self):
+        self.operaciones = importlib.import_module('productos.operaciones_diccionario')
+        if self.directorio_persistencia:
+            recuperados = self.operaciones.activar_persistencia(self.directorio_persistencia)
+            print(f"💾 Persistencia activada en {self.directorio_persistencia}: {recuperados} productos recuperados.")
+        self._actualizar_tamano()
+        return True
+
+    def contar_productos(self):
+        return len(self.operaciones.productos)
+
+    def cerrar(self):
+        if self.directorio_persistencia:
+            self.operaciones.desactivar_persistencia()
+            print("💾 Inventario guardado en disco.")
+
+    def intentar_agregar_producto(self):
+        return self._registrar('agregar', self.operaciones.intentar_agregar_producto())
+
+    def mostrar_productos(self):
+        return self.operaciones.mostrar_productos()
+
+    def intentar_actualizar_producto(self):
+        return self._registrar('actualizar', self.operaciones.intentar_actualizar_producto())
+
+    def intentar_eliminar_producto(self):
+        return self._registrar('eliminar', self.operaciones.intentar_eliminar_producto())
+
+    def agregar(self, nombre, tipo, precio, stock):
+        return self.operaciones.agregar_producto(nombre, tipo, precio, stock)
+
+    def actualizar(self, nombre, campo, valor):
+        return self.operaciones.actualizar_producto(nombre, campo, valor)
+
+    def eliminar(self, nombre):
+        return self.operaciones.eliminar_producto(nombre)
+
+    def iterar_productos(self):
+        for nombre, producto in self.operaciones.productos.items():
+            yield {"nombre": nombre, **producto.a_diccionario()}
+
+
+class BackendConConexion(BackendInventario):
+    """Base para los backends que pasan una conexión a cada operación"""
+
+    modulo_operaciones = None  # Ruta del módulo con las funciones intentar_*/mostrar_productos
+
+    def __init__(self, modo_prueba=False):
+        super().__init__(modo_prueba)
+        self.bd_conexion = None
+        self.operaciones = None
+
+    @abstractmethod
+    def conectar(self):
+        """
+        Abre la conexión propia del backend
+
+        Returns:
+            Conexión configurada, o None si no se pudo conectar
+        """
+
+    def abrir(self):
+        self.operaciones = importlib.import_module(self.modulo_operaciones)
+        self.bd_conexion = self.conectar()
+        if self.bd_conexion is None:
+            return False
+        self._actualizar_tamano()
+        return True
+
+    def contar_productos(self):
+        resultado = self.bd_conexion.ejecutar_consulta("SELECT COUNT(*) AS total FROM productos",
+                                                       obtener_resultados=True)
+        return resultado[0]['total'] if resultado else 0
+
+    def cerrar(self):
+        if self.bd_conexion:
+            self.bd_conexion.desconectar()
+            self.bd_conexion = None
+            print("🔒 Conexión a la base de datos cerrada.")
+
+    def intentar_agregar_producto(self):
+        return self._registrar('agregar', self.operaciones.intentar_agregar_producto(self.bd_conexion))
+
+    def mostrar_productos(self):
+        return self.operaciones.mostrar_productos(self.bd_conexion)
+
+    def intentar_actualizar_producto(self):
+        return self._registrar('actualizar', self.operaciones.intentar_actualizar_producto(self.bd_conexion))
+
+    def intentar_eliminar_producto(self):
+        return self._registrar('eliminar', self.operaciones.intentar_eliminar_producto(self.bd_conexion))
+
+    def iterar_productos(self):
+        # Un único cursor sin buffer en lugar de una consulta por página
+        for fila in self.bd_conexion.iterar_consulta(CONSULTA_CATALOGO):
+            yield _producto_exportable(fila)
+
+    def transaccion(self):
+        return self.bd_conexion.transaccion()
+
+
+class BackendMySQL(BackendConConexion):
+    """Backend persistente sobre MySQL (operaciones_bd)"""
+
+    descripcion = "Base de datos MySQL"
+    nombre = "bd"
+    modulo_operaciones = 'productos.operaciones_bd'
+
+    def __init__(self, modo_prueba=False, intervalo_buffer=None):
+        """
+        Args:
+            modo_prueba (bool): Si True, usa la BD de pruebas
+            intervalo_buffer (float): Segundos del buffer de escritura diferida para
+                las actualizaciones. Si no se indica se usa DB_BUFFER_INTERVALO;
+                0 o vacío = cada actualización se escribe al instante
+        """
+        super().__init__(modo_prueba)
+        if intervalo_buffer is None:
+            intervalo_buffer = float(os.getenv('DB_BUFFER_INTERVALO') or 0)
+        self.intervalo_buffer = intervalo_buffer
+        self.buffer = None
+
+    def conectar(self):
+        from productos.database import obtener_conexion_base_datos
+
+        bd_conexion = obtener_conexion_base_datos(modo_prueba=self.modo_prueba)
+        if bd_conexion:
+            print("✅ Conexión a la base de datos establecida correctamente.")
+        return bd_conexion
+
+    def abrir(self):
+        if not super().abrir():
+            return False
+        if self.intervalo_buffer > 0:
+            from productos.buffer_escritura import BufferEscritura
+            from productos.database import obtener_conexion_base_datos
+
+            # El buffer escribe desde otro hilo: necesita su propia conexión
+            conexion_buffer = obtener_conexion_base_datos(modo_prueba=self.modo_prueba)
+            if conexion_buffer is None:
+                return False
+            self.buffer = BufferEscritura(
+                conexion_buffer,
+                intervalo=self.intervalo_buffer,
+                max_pendientes=int(os.getenv('DB_BUFFER_MAX_PENDIENTES', 1000)),
+                al_vaciar=self._invalidar_lecturas,
+            )
+            self.buffer.iniciar()
+            print(f"🕒 Buffer de escritura activado (cada {self.intervalo_buffer} s).")
+        return True
+
+    def _invalidar_lecturas(self, nombres):
+        """Descarta de la caché de la conexión principal los productos que escribió el buffer"""
+        from productos.validaciones import normalizar_clave
+
+        cache = self.bd_conexion.cache if self.bd_conexion else None
+        if cache is None:
+            return
+        for nombre in nombres:
+            cache.invalidar_nombre(normalizar_clave(nombre))
+
+    def cerrar(self):
+        # Los cambios encolados se escriben antes de cerrar las conexiones
+        if self.buffer:
+            escritos = self.buffer.cerrar()
+            if escritos:
+                print(f"💾 {escritos} cambios pendientes guardados en la base de datos.")
+            if len(self.buffer):
+                print(f"⚠️ No se pudieron guardar {len(self.buffer)} cambios pendientes.")
+            self.buffer.bd_conexion.desconectar()
+            self.buffer = None
+        super().cerrar()
+
+    def intentar_actualizar_producto(self):
+        return self._registrar('actualizar',
+                               self.operaciones.intentar_actualizar_producto(self.bd_conexion, self.buffer))
+
+    def agregar(self, nombre, tipo, precio, stock):
+        return self.operaciones.agregar_producto_bd(nombre, tipo, precio, stock, self.bd_conexion)
+
+    def actualizar(self, nombre, campo, valor):
+        return self.operaciones.actualizar_producto_bd(nombre, campo, valor, self.bd_conexion)
+
+    def eliminar(self, nombre):
+        return self.operaciones.eliminar_producto_bd(nombre, self.bd_conexion)
+
+    def agregar_lote(self, productos, tamano_lote=TAMANO_LOTE):
+        # INSERT multi-fila por lote en lugar de una sentencia por producto
+        return self.operaciones.agregar_productos_bd_lote(productos, self.bd_conexion, tamano_lote)
+
+
+class BackendSQLite(BackendConConexion):
+    """Backend persistente sin servidor sobre SQLite (operaciones_sqlite)"""
+
+    descripcion = "Base de datos SQLite"
+    nombre = "sqlite"
+    modulo_operaciones = 'productos.operaciones_sqlite'
+
+    def __init__(self, modo_prueba=False, ruta=None):
+        """
+        Args:
+            modo_prueba (bool): Si True, usa el archivo de pruebas
+            ruta (str): Ruta del archivo SQLite (opcional)
+        """
+        super().__init__(modo_prueba)
+        self.ruta = ruta
+
+    def conectar(self):
+        from productos.database_sqlite import obtener_conexion_sqlite
+
+        bd_conexion = obtener_conexion_sqlite(modo_prueba=self.modo_prueba, ruta=self.ruta)
+        if bd_conexion:
+            print(f"✅ Base de datos SQLite abierta en {bd_conexion.ruta}.")
+        return bd_conexion
+
+    def agregar(self, nombre, tipo, precio, stock):
+        return self.operaciones.agregar_producto_sqlite(nombre, tipo, precio, stock, self.bd_conexion)
+
+    def actualizar(self, nombre, campo, valor):
+        return self.operaciones.actualizar_producto_sqlite(nombre, campo, valor, self.bd_conexion)
+
+    def eliminar(self, nombre):
+        return self.operaciones.eliminar_producto_sqlite(nombre, self.bd_conexion)
+
+
+# Registro de backends por nombre (valor de INVENTARIO_MODO).
+# Cada entrada es una clase o una ruta 'modulo:Clase' que se importa al pedirla.
+_BACKENDS = {
+    'diccionario': BackendDiccionario,
+    'bd': BackendMySQL,
+    'sqlite': BackendSQLite,
+}
+
+
+def registrar_backend(nombre, backend):
+    """
+    Registra un backend para poder elegirlo por nombre
+
+    Args:
+        nombre (str): Nombre del modo (por ejemplo, valor de INVENTARIO_MODO)
+        backend (type|str): Subclase de BackendInventario o ruta 'modulo:Clase'
+    """
+    _BACKENDS[nombre.lower()] = backend
+
+
+def backends_disponibles():
+    """Devuelve los nombres de los backends registrados"""
+    return sorted(_BACKENDS)
+
+
+def obtener_backend(nombre, **opciones):
+    """
+    Crea (sin abrir) el backend registrado con ese nombre
+
+    Args:
+        nombre (str): Nombre del backend ('diccionario', 'bd', 'sqlite', ...)
+        **opciones: Argumentos para el constructor del backend (ej. modo_prueba)
+
+    Returns:
+        BackendInventario: Instancia del backend, o None si el nombre no está registrado
+    """
+    backend = _BACKENDS.get(nombre.lower())
+    if backend is None:
+        return None
+    if isinstance(backend, str):
+        ruta_modulo, nombre_clase = backend.split(':')
+        backend = getattr(importlib.import_module(ruta_modulo), nombre_clase)
+    return backend(**opciones)
@@ -0,0 +1,252 @@
+"""
+Módulo con el buffer de escritura diferida (write-behind) para MySQL.
+
+Los cambios de precio y stock no van a la base de datos uno por uno: se
+acumulan en memoria y se combinan por producto (el último precio o stock
+absoluto gana y los ajustes relativos se suman). Un hilo de fondo los
+escribe juntos, en una transacción con un UPDATE ... JOIN por lote, cada
+`intervalo` segundos o en cuanto hay `max_pendientes` productos con cambios.
+Así cientos de ventas por segundo de un producto popular se convierten en
+una sola escritura de su fila.
+
+El buffer usa su propia conexión (DatabaseConnection no es thread-safe):
+no compartirla con el resto del programa.
+
+Contrato de durabilidad:
+- Un cambio aceptado por el buffer todavía NO está en la base de datos.
+  Se confirma como mucho `intervalo` segundos después (o antes, si se llena).
+- Si el proceso muere antes (kill, corte de luz), los cambios pendientes se pierden.
+- Si una escritura falla por un error transitorio (se cae la conexión, espera
+  de bloqueo, deadlock), los cambios se vuelven a encolar y se reintentan en
+  el próximo vaciado.
+- Si falla por cualquier otro error (por ejemplo, un precio que no entra en la
+  columna), el lote se divide en mitades hasta aislar los cambios que fallan:
+  solo esos se descartan (ver `descartados`) y el resto se escribe.
+- El hilo de fondo nunca termina por un error.
+- cerrar() escribe todo lo pendiente; el menú lo llama al elegir "Salir".
+- Hasta que se vacía, las lecturas (listados, búsquedas) no ven los cambios.
+- Un ajuste que dejaría el stock negativo se valida recién al vaciar, sobre
+  la suma de los ajustes pendientes, y se descarta entero (ver `descartados`).
+"""
+
+import threading
+
+from productos.database import es_error_transitorio
+from productos.operaciones_bd import aplicar_cambios_bd_lote
+from productos.validaciones import normalizar_clave
+
+
+class _Cambio:
+    """Cambios pendientes de un producto (None = sin cambio en ese campo)"""
+
+    __slots__ = ('nombre', 'precio', 'stock', 'delta')
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+        self.precio = None
+        self.stock = None
+        self.delta = 0
+
+
+class BufferEscritura:
+    """Acumula cambios de precio/stock por producto y los escribe en lote desde un hilo de fondo"""
+
+    def __init__(self, bd_conexion, intervalo=0.5, max_pendientes=1000, al_vaciar=None):
+        """
+        Args:
+            bd_conexion (DatabaseConnection): Conexión exclusiva del buffer
+            intervalo (float): Segundos máximos que un cambio espera en memoria
+            max_pendientes (int): Productos con cambios que disparan un vaciado inmediato
+            al_vaciar (callable): Se llama con la lista de nombres escritos tras cada
+                                  vaciado (por ejemplo, para invalidar otra caché)
+        """
+        self.bd_conexion = bd_conexion
+        self.intervalo = intervalo
+        self.max_pendientes = max_pendientes
+        self.al_vaciar = al_vaciar
+
+        self._pendientes = {}  # clave normalizada -> _Cambio
+        self._candado = threading.Lock()          # Protege _pendientes
+        self._candado_vaciado = threading.Lock()  # Un solo vaciado a la vez sobre la conexión
+        self._despertar = threading.Event()
+        self._detener = threading.Event()
+        self._hilo = None
+
+        self.escritos = 0     # Productos con cambios enviados a la base de datos
+        self.descartados = 0  # Cambios sin efecto (producto inexistente o stock insuficiente)
+
+    def __len__(self):
+        """Cantidad de productos con cambios pendientes"""
+        with self._candado:
+            return len(self._pendientes)
+
+    def iniciar(self):
+        """Arranca el hilo que vacía el buffer periódicamente"""
+        self._hilo = threading.Thread(target=self._vaciar_periodicamente, daemon=True)
+        self._hilo.start()
+
+    def _cambio(self, nombre):
+        """Devuelve (creándolo si hace falta) el cambio pendiente de un producto (requiere el candado)"""
+        clave = normalizar_clave(nombre)
+        cambio = self._pendientes.get(clave)
+        if cambio is None:
+            cambio = self._pendientes[clave] = _Cambio(nombre)
+        return cambio
+
+    def _encolado(self):
+        """Pide un vaciado inmediato si se alcanzó max_pendientes (requiere el candado)"""
+        if len(self._pendientes) >= self.max_pendientes:
+            self._despertar.set()
+
+    def actualizar(self, nombre, campo, valor):
+        """
+        Encola un nuevo precio o stock absoluto
+
+        Args:
+            nombre (str): Nombre del producto
+            campo (str): 'precio' o 'stock'
+            valor (float|int): Nuevo valor
+
+        Returns:
+            bool: True si se encoló, False si el campo no es válido
+        """
+        if campo not in ('precio', 'stock'):
+            return False
+        with self._candado:
+            cambio = self._cambio(nombre)
+            if campo == 'precio':
+                cambio.precio = valor
+            else:
+                # Un stock absoluto reemplaza a los ajustes encolados antes
+                cambio.stock = valor
+                cambio.delta = 0
+            self._encolado()
+        return True
+
+    def ajustar_stock(self, nombre, delta):
+        """
+        Encola un ajuste relativo de stock (se suma a los ajustes pendientes del producto)
+
+        Args:
+            nombre (str): Nombre del producto
+            delta (int): Unidades a sumar; negativo para descontar
+
+        Returns:
+            bool: True (el stock suficiente se valida al vaciar)
+        """
+        with self._candado:
+            self._cambio(nombre).delta += delta
+            self._encolado()
+        return True
+
+    def _reencolar(self, lote):
+        """
+        Vuelve a encolar un lote que no se pudo escribir. Los cambios encolados
+        mientras tanto son más nuevos y tienen prioridad sobre los del lote.
+        """
+        with self._candado:
+            for clave, anterior in lote.items():
+                nuevo = self._pendientes.get(clave)
+                if nuevo is None:
+                    self._pendientes[clave] = anterior
+                    continue
+                if nuevo.precio is None:
+                    nuevo.precio = anterior.precio
+                if nuevo.stock is None:
+                    # stock final = anterior.stock (si había) + ajustes viejos + ajustes nuevos
+                    nuevo.stock = anterior.stock
+                    nuevo.delta += anterior.delta
+
+    def _aplicar(self, cambios):
+        """
+        Escribe una parte del lote en una transacción
+
+        Args:
+            cambios (list): Objetos _Cambio
+
+        Returns:
+            int: Ajustes relativos rechazados (producto inexistente o stock insuficiente)
+
+        Raises:
+            Exception: El error de la escritura (la transacción ya se deshizo)
+        """
+        valores = [(c.nombre, c.precio, c.stock) for c in cambios
+                   if c.precio is not None or c.stock is not None]
+        ajustes = [(c.nombre, c.delta) for c in cambios if c.delta]
+        modificados, ajustados = aplicar_cambios_bd_lote(valores, ajustes, self.bd_conexion)
+        # Solo se cuentan los ajustes rechazados: MySQL no informa como
+        # modificada una fila que ya tenía el valor absoluto enviado
+        return len(ajustes) - ajustados
+
+    def vaciar(self):
+        """
+        Escribe en la base de datos todos los cambios pendientes
+
+        Returns:
+            int: Productos escritos (0 si no había cambios o si la escritura falló)
+        """
+        with self._candado_vaciado:
+            with self._candado:
+                lote, self._pendientes = self._pendientes, {}
+            if not lote:
+                return 0
+
+            # Partes del lote por escribir; un error que no es transitorio parte
+            # en dos la que falló, hasta aislar los cambios que no se pueden guardar
+            partes = [list(lote.items())]
+            escritos = []
+            while partes:
+                parte = partes.pop()
+                try:
+                    self.descartados += self._aplicar([cambio for _, cambio in parte])
+                except Exception as e:
+                    if es_error_transitorio(e):
+                        restantes = dict(parte)
+                        for otra in partes:
+                            restantes.update(otra)
+                        print(f"❌ Error escribiendo {len(restantes)} cambios pendientes (se reintentará): {e}")
+                        self._reencolar(restantes)
+                        break
+                    if len(parte) == 1:
+                        print(f"❌ Se descarta el cambio pendiente de '{parte[0][1].nombre}': {e}")
+                        self.descartados += 1
+                        continue
+                    mitad = len(parte) // 2
+                    partes.extend((parte[mitad:], parte[:mitad]))
+                    continue
+                escritos.extend(cambio.nombre for _, cambio in parte)
+
+            self.escritos += len(escritos)
+            if escritos and self.al_vaciar:
+                try:
+                    self.al_vaciar(escritos)
+                except Exception as e:
+                    # Los cambios ya se escribieron: no se reencolan
+                    print(f"⚠️ Error en al_vaciar tras escribir {len(escritos)} cambios: {e}")
+            return len(escritos)
+
+    def _vaciar_periodicamente(self):
+        """Hilo de fondo: vacía cada `intervalo` segundos o al llenarse el buffer"""
+        while not self._detener.is_set():
+            self._despertar.wait(self.intervalo)
+            self._despertar.clear()
+            try:
+                self.vaciar()
+            except Exception as e:
+                # vaciar() ya reencola los lotes fallidos; esto solo evita que un
+                # error inesperado deje al buffer sin hilo (y sin más escrituras)
+                print(f"❌ Error en el vaciado periódico del buffer: {e}")
+
+    def cerrar(self):
+        """
+        Detiene el hilo y escribe los cambios pendientes
+
+        Returns:
+            int: Productos escritos en el vaciado final
+        """
+        self._detener.set()
+        self._despertar.set()
+        if self._hilo:
+            self._hilo.join()
+            self._hilo = None
+        return self.vaciar()
@@ -0,0 +1,123 @@
+"""
+Módulo con la caché de lecturas que se ubica entre operaciones_bd y DatabaseConnection.
+
+Guarda páginas del listado y productos individuales con desalojo LRU y
+vencimiento por tiempo (TTL). Cada entrada declara el rango de nombres que
+cubre, así las escrituras invalidan solo las entradas que contienen al
+producto modificado:
+- Un producto individual cubre su propio nombre.
+- Una página por clave (WHERE nombre > despues_de ... LIMIT n) cubre los nombres
+  entre despues_de y su último nombre; si vino incompleta, hasta el final.
+
+Contrato: la caché es por conexión. Las escrituras hechas por esta conexión
+la invalidan al instante; las hechas por otros procesos o conexiones se ven
+recién cuando vence el TTL.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class CacheConsultas:
+    """Caché LRU con TTL, invalidación por rango de nombres y contadores (thread-safe)"""
+
+    def __init__(self, capacidad=256, ttl=30.0):
+        """
+        Args:
+            capacidad (int): Cantidad máxima de entradas (las menos usadas se desalojan)
+            ttl (float): Segundos de vida de cada entrada
+        """
+        self.capacidad = capacidad
+        self.ttl = ttl
+        self._entradas = OrderedDict()  # clave -> (valor, vence, rango)
+        self._candado = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self.vencidas = 0
+        self.invalidaciones = 0
+
+    def obtener(self, clave):
+        """
+        Devuelve el valor guardado, o None si no está o venció
+
+        Args:
+            clave (hashable): Identificador de la consulta
+        """
+        with self._candado:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                self.fallos += 1
+                return None
+            valor, vence, _ = entrada
+            if time.monotonic() >= vence:
+                del self._entradas[clave]
+                self.vencidas += 1
+                self.fallos += 1
+                return None
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            return valor
+
+    def guardar(self, clave, valor, rango=None):
+        """
+        Guarda el resultado de una consulta
+
+        Args:
+            clave (hashable): Identificador de la consulta
+            valor: Resultado a guardar (no debe modificarse después)
+            rango (tuple): (desde, hasta) claves normalizadas de los nombres que cubre,
+                           incluidos; None en un extremo = sin límite.
+                           Sin rango, la entrada solo se invalida con limpiar()
+        """
+        with self._candado:
+            self._entradas[clave] = (valor, time.monotonic() + self.ttl, rango)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.capacidad:
+                self._entradas.popitem(last=False)
+                self.desalojos += 1
+
+    def invalidar_nombre(self, clave_nombre):
+        """
+        Descarta las entradas cuyo rango contiene un nombre
+
+        Args:
+            clave_nombre (str): Clave normalizada del nombre modificado
+        """
+        with self._candado:
+            afectadas = [
+                clave for clave, (_, _, rango) in self._entradas.items()
+                if rango is not None
+                and (rango[0] is None or rango[0] <= clave_nombre)
+                and (rango[1] is None or clave_nombre <= rango[1])
+            ]
+            for clave in afectadas:
+                del self._entradas[clave]
+            self.invalidaciones += len(afectadas)
+
+    def limpiar(self):
+        """Descarta todas las entradas (por ejemplo, tras una carga masiva)"""
+        with self._candado:
+            self.invalidaciones += len(self._entradas)
+            self._entradas.clear()
+
+    def estadisticas(self):
+        """
+        Devuelve los contadores de la caché para dimensionarla
+
+        Returns:
+            dict: aciertos, fallos, tasa_aciertos, desalojos, vencidas, invalidaciones, entradas, capacidad
+        """
+        with self._candado:
+            consultas = self.aciertos + self.fallos
+            return {
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'tasa_aciertos': self.aciertos / consultas if consultas else 0.0,
+                'desalojos': self.desalojos,
+                'vencidas': self.vencidas,
+                'invalidaciones': self.invalidaciones,
+                'entradas': len(self._entradas),
+                'capacidad': self.capacidad,
+            }
@@ -4,13 +4,78 @@ Contiene la configuración de conexión, creación de tablas y operaciones bási
 """
 
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, errorcode
+from mysql.connector.errors import PoolError
 import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from dotenv import load_dotenv
+from productos.indices import trigramas
+from productos.cache_consultas import CacheConsultas
+from productos.estadisticas_consultas import EstadisticasConsultas
+from productos.metricas import metricas
 
 # Cargar variables de entorno
 load_dotenv()
 
+# Índices agregados después de la primera versión de la tabla: {nombre: columnas}.
+# crear_tablas() los crea en tablas ya existentes que todavía no los tienen.
+INDICES_PRODUCTOS = {
+    'idx_precio': '(precio, nombre)',
+}
+
+# Alta de trigramas en la tabla lateral productos_trigramas (idempotente)
+CONSULTA_INSERTAR_TRIGRAMAS = "INSERT IGNORE INTO productos_trigramas (trigrama, producto_id) VALUES (%s, %s)"
+
+# Errores del cliente que indican que el socket se cortó (wait_timeout, reinicio del servidor, red)
+_ERRORES_CONEXION = {
+    errorcode.CR_SERVER_GONE_ERROR,
+    errorcode.CR_SERVER_LOST,
+    errorcode.CR_CONNECTION_ERROR,
+    errorcode.CR_CONN_HOST_ERROR,
+}
+# Errores del servidor que se resuelven reintentando la misma transacción más tarde
+_ERRORES_BLOQUEO = {
+    errorcode.ER_LOCK_WAIT_TIMEOUT,  # 1205
+    errorcode.ER_LOCK_DEADLOCK,      # 1213
+}
+ESPERA_RECONEXION_INICIAL = 0.5  # Segundos antes del segundo intento; se duplica en cada intento
+ESPERA_RECONEXION_MAXIMA = 8.0
+
+
+def _es_lectura(consulta):
+    """Indica si una consulta solo lee (se puede repetir sin efectos tras un corte)"""
+    return consulta.lstrip()[:6].upper() == 'SELECT'
+
+
+def es_error_transitorio(error):
+    """
+    Indica si vale la pena reintentar más tarde lo que falló con este error:
+    cortes de conexión, esperas de bloqueo y deadlocks. Los demás errores del
+    servidor (valor fuera de rango, dato inválido, ...) se repetirían igual.
+
+    Args:
+        error (Exception): Error capturado
+
+    Returns:
+        bool: True si el error es de conexión o de bloqueo
+    """
+    if not isinstance(error, Error):
+        return False
+    if error.errno in _ERRORES_CONEXION or error.errno in _ERRORES_BLOQUEO:
+        return True
+    # Errores del cliente (2xxx) o sin código: el problema es la conexión, no los datos
+    return not error.errno or error.errno >= 2000
+
+
+def _admite_explain(consulta):
+    """Indica si MySQL puede mostrar el plan (EXPLAIN) de una consulta"""
+    return consulta.lstrip()[:7].upper().startswith(('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE'))
+
+
 class DatabaseConnection:
     """Maneja la conexión y operaciones básicas con MySQL"""
     
@@ -24,6 +89,37 @@ class DatabaseConnection:
         self.modo_prueba = modo_prueba
         self.conexion = None
         self.cursor = None
+        self._nivel_transaccion = 0  # > 0 mientras hay un bloque transaccion() activo
+        
+        # Reconexión: tras DB_PING_INACTIVIDAD segundos sin uso se verifica la conexión
+        # con un ping antes de la próxima consulta, y si se cortó se reconecta
+        self.segundos_ping = float(os.getenv('DB_PING_INACTIVIDAD', 60))
+        self.reintentos_reconexion = int(os.getenv('DB_RECONEXION_REINTENTOS', 5))
+        self._ultimo_uso = time.monotonic()
+        self._conexion_perdida = False
+        
+        # Sentencias preparadas en el servidor {sql: (sql, cursor)} con desalojo LRU;
+        # DB_MAX_PREPARADAS=0 las desactiva (todas las consultas van como texto)
+        self.max_preparadas = int(os.getenv('DB_MAX_PREPARADAS', 32))
+        self._preparadas = OrderedDict()
+        
+        # Resultado de la última escritura de ejecutar_consulta (sea cual sea el cursor que la ejecutó)
+        self.filas_afectadas = 0
+        self.ultimo_id = None
+        
+        # Tiempos por sentencia y log de consultas lentas (DB_CONSULTA_LENTA_MS vacío = sin log)
+        umbral_ms = os.getenv('DB_CONSULTA_LENTA_MS', '100')
+        self.estadisticas = EstadisticasConsultas(
+            umbral_lenta=float(umbral_ms) / 1000 if umbral_ms else None,
+            ruta_log=os.getenv('DB_LOG_CONSULTAS_LENTAS') or None,
+            capturar_explain=os.getenv('DB_EXPLAIN_LENTAS', '0') == '1',
+        )
+        
+        # Caché de lecturas (páginas y productos) por conexión, desactivada por defecto:
+        # no ve las escrituras de otras conexiones hasta que vence el TTL, así que solo
+        # conviene activarla (DB_CACHE_TAMANO > 0) si esa demora es aceptable
+        tamano_cache = int(os.getenv('DB_CACHE_TAMANO') or 0)
+        self.cache = CacheConsultas(tamano_cache, float(os.getenv('DB_CACHE_TTL', 30))) if tamano_cache > 0 else None
         
         # Configuración de la base de datos
         self.configuracion = {
@@ -49,11 +145,109 @@ class DatabaseConnection:
     
     def desconectar(self):
         """Cierra la conexión con la base de datos"""
+        self._cerrar_preparadas()
         if self.cursor:
             self.cursor.close()
         if self.conexion and self.conexion.is_connected():
             self.conexion.close()
     
+    def _cerrar_preparadas(self):
+        """Libera las sentencias preparadas (si la conexión se cortó, ya no existen en el servidor)"""
+        preparadas, self._preparadas = self._preparadas, OrderedDict()
+        for _, cursor in preparadas.values():
+            try:
+                cursor.close()
+            except Error:
+                pass
+    
+    def _cursor_preparado(self, consulta):
+        """
+        Devuelve el cursor preparado para una consulta, preparándola la primera vez.
+        El conector solo reutiliza la sentencia si recibe el mismo objeto str, por
+        eso también se devuelve el texto guardado.
+        
+        Returns:
+            tuple: (sql, cursor) para llamar a cursor.execute(sql, parametros)
+        """
+        entrada = self._preparadas.get(consulta)
+        if entrada is not None:
+            self._preparadas.move_to_end(consulta)
+            return entrada
+        entrada = self._preparadas[consulta] = (consulta, self.conexion.cursor(prepared=True, dictionary=True))
+        if len(self._preparadas) > self.max_preparadas:
+            # Cerrar el cursor desaloja la sentencia del servidor (COM_STMT_CLOSE)
+            _, (_, cursor) = self._preparadas.popitem(last=False)
+            try:
+                cursor.close()
+            except Error:
+                pass
+        return entrada
+    
+    def _conexion_viva(self):
+        """Hace un ping al servidor (sin reconectar) e indica si la conexión responde"""
+        try:
+            self.conexion.ping(reconnect=False)
+            return True
+        except (Error, AttributeError):
+            return False
+    
+    def reconectar(self):
+        """
+        Vuelve a abrir la conexión, esperando cada vez el doble entre intentos
+        (ESPERA_RECONEXION_INICIAL, hasta ESPERA_RECONEXION_MAXIMA segundos)
+        
+        Returns:
+            bool: True si se pudo reconectar
+        """
+        espera = ESPERA_RECONEXION_INICIAL
+        for intento in range(1, self.reintentos_reconexion + 1):
+            try:
+                self.desconectar()
+            except Error:
+                pass  # El socket ya estaba cerrado
+            print(f"🔄 Reconectando a MySQL (intento {intento} de {self.reintentos_reconexion})...")
+            # Las sentencias preparadas viven en la sesión: se vuelven a preparar al usarlas
+            self._preparadas = OrderedDict()
+            if self.conectar():
+                self._conexion_perdida = False
+                self._ultimo_uso = time.monotonic()
+                return True
+            if intento < self.reintentos_reconexion:
+                time.sleep(espera)
+                espera = min(espera * 2, ESPERA_RECONEXION_MAXIMA)
+        return False
+    
+    def _asegurar_conexion(self):
+        """
+        Antes de usar la conexión: si estuvo inactiva más de segundos_ping o se
+        detectó un corte, la verifica con un ping y reconecta si hace falta.
+        Dentro de una transacción no se reconecta (se perdería lo hecho en ella).
+        """
+        if self._nivel_transaccion:
+            return
+        ahora = time.monotonic()
+        if self._conexion_perdida or ahora - self._ultimo_uso >= self.segundos_ping:
+            if self._conexion_viva():
+                self._conexion_perdida = False
+            else:
+                self.reconectar()
+        self._ultimo_uso = ahora
+    
+    def _es_conexion_perdida(self, error):
+        """Indica si un error se debe a que la conexión se cortó"""
+        if error.errno in _ERRORES_CONEXION:
+            return True
+        if error.errno and error.errno < 2000:
+            return False  # Error del servidor (1xxx): respondió, la conexión está viva
+        return not self._conexion_viva()
+    
+    def _deshacer(self):
+        """rollback() que no falla si el socket se cortó (el servidor ya deshizo la transacción)"""
+        try:
+            self.conexion.rollback()
+        except Error:
+            self._conexion_perdida = True
+    
 
     
     def crear_tablas(self):
@@ -70,11 +264,27 @@ class DatabaseConnection:
                 fecha_creacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 fecha_actualizacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
                 INDEX idx_nombre (nombre),
-                INDEX idx_tipo (tipo)
+                INDEX idx_tipo (tipo),
+                INDEX idx_precio (precio, nombre)
             ) ENGINE=InnoDB CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci
             """
             
+            # Índice invertido de trigramas de la clave normalizada del nombre (búsqueda aproximada).
+            # Las bajas se propagan solas con ON DELETE CASCADE
+            crear_tabla_trigramas = """
+            CREATE TABLE IF NOT EXISTS productos_trigramas (
+                trigrama CHAR(3) NOT NULL,
+                producto_id INT NOT NULL,
+                PRIMARY KEY (trigrama, producto_id),
+                INDEX idx_producto (producto_id),
+                FOREIGN KEY (producto_id) REFERENCES productos (id) ON DELETE CASCADE
+            ) ENGINE=InnoDB CHARACTER SET utf8mb4 COLLATE utf8mb4_bin
+            """
+            
             self.cursor.execute(crear_tabla_productos)
+            self._crear_indices_faltantes()
+            self.cursor.execute(crear_tabla_trigramas)
+            self._indexar_trigramas_existentes()
             self.conexion.commit()
             return True
             
@@ -82,6 +292,27 @@ class DatabaseConnection:
             print(f"❌ Error creando tablas: {e}")
             return False
     
+    def _crear_indices_faltantes(self):
+        """Agrega a una tabla productos ya existente los índices de INDICES_PRODUCTOS que le falten"""
+        self.cursor.execute("""
+            SELECT DISTINCT index_name AS nombre FROM information_schema.statistics
+            WHERE table_schema = DATABASE() AND table_name = 'productos'
+        """)
+        existentes = {fila['nombre'] for fila in self.cursor.fetchall()}
+        for nombre, columnas in INDICES_PRODUCTOS.items():
+            if nombre not in existentes:
+                self.cursor.execute(f"ALTER TABLE productos ADD INDEX {nombre} {columnas}")
+    
+    def _indexar_trigramas_existentes(self):
+        """Llena productos_trigramas con los productos cargados antes de que existiera la tabla"""
+        self.cursor.execute("SELECT 1 AS hay FROM productos_trigramas LIMIT 1")
+        if self.cursor.fetchall():
+            return
+        self.cursor.execute("SELECT id, nombre FROM productos")
+        filas = [(trigrama, fila['id']) for fila in self.cursor.fetchall() for trigrama in trigramas(fila['nombre'])]
+        for inicio in range(0, len(filas), 10000):
+            self.cursor.executemany(CONSULTA_INSERTAR_TRIGRAMAS, filas[inicio:inicio + 10000])
+    
     def configurar_base_datos(self):
         """Configura completamente la base de datos (conectar y crear tablas)"""
         # Las bases de datos ya existen (creadas por scripts SQL con root)
@@ -94,38 +325,254 @@ class DatabaseConnection:
             
         return True
     
-    def ejecutar_consulta(self, consulta, parametros=None, obtener_resultados=False):
+    def obtener_cache(self):
         """
-        Ejecuta una consulta SQL
+        Devuelve la caché de lecturas para usar en una consulta
+        
+        Returns:
+            CacheConsultas|None: None si está desactivada o si hay una transacción
+                                 abierta (sus lecturas pueden no llegar a confirmarse)
+        """
+        return None if self._nivel_transaccion else self.cache
+    
+    def _explicar(self, consulta, parametros):
+        """
+        Devuelve el plan de ejecución (EXPLAIN) de una consulta para el log de consultas lentas
+        
+        Returns:
+            list|str|None: Filas del EXPLAIN, el error si no se pudo obtener, o None si no aplica
+        """
+        if not _admite_explain(consulta):
+            return None
+        if isinstance(parametros, list):
+            parametros = parametros[0] if parametros else ()  # Lote: alcanza con la primera fila
+        try:
+            self.cursor.execute("EXPLAIN " + consulta, parametros or ())
+            return self.cursor.fetchall()
+        except Error as e:
+            return str(e)
+    
+    def _medir(self, consulta, parametros, inicio):
+        """Registra en las estadísticas la duración de una consulta que empezó en `inicio`"""
+        self.estadisticas.registrar(
+            consulta, parametros, time.perf_counter() - inicio,
+            explicar=lambda: self._explicar(consulta, parametros)
+        )
+    
+    def _ejecutar(self, consulta, parametros, obtener_resultados, preparada):
+        """Ejecuta una consulta sin manejar errores (ver ejecutar_consulta)"""
+        cursor = self.cursor
+        sql = consulta
+        if preparada and self.max_preparadas > 0:
+            sql, cursor = self._cursor_preparado(consulta)
+        inicio = time.perf_counter()
+        try:
+            cursor.execute(sql, parametros or ())
+            self.filas_afectadas = cursor.rowcount
+            self.ultimo_id = cursor.lastrowid
+            if obtener_resultados:
+                return cursor.fetchall()
+            if not self._nivel_transaccion:
+                self.conexion.commit()
+            return True
+        finally:
+            self._medir(consulta, parametros, inicio)
+    
+    def ejecutar_consulta(self, consulta, parametros=None, obtener_resultados=False, preparada=False):
+        """
+        Ejecuta una consulta SQL.
+        Si la conexión se cortó, reconecta; las lecturas (SELECT) fuera de una
+        transacción se repiten una vez, las escrituras no (pudieron aplicarse).
         
         Args:
             consulta (str): Consulta SQL a ejecutar
             parametros (tuple): Parámetros para la consulta
             obtener_resultados (bool): Si True, retorna los resultados
+            preparada (bool): Si True, usa una sentencia preparada en el servidor que
+                se reutiliza en las siguientes llamadas con el mismo texto (para las
+                consultas frecuentes de texto fijo; no para las armadas con listas variables)
             
         Returns:
-            list|bool: Resultados si obtener_resultados=True, sino bool indicando éxito
+            list|bool: Resultados si obtener_resultados=True, sino bool indicando éxito.
+            Tras una escritura, filas_afectadas y ultimo_id tienen su resultado.
         """
+        self._asegurar_conexion()
         try:
-            self.cursor.execute(consulta, parametros or ())
-            
-            if obtener_resultados:
-                return self.cursor.fetchall()
-            else:
-                self.conexion.commit()
-                return True
-                
+            return self._ejecutar(consulta, parametros, obtener_resultados, preparada)
         except Error as e:
-            print(f"❌ Error ejecutando consulta: {e}")
-            self.conexion.rollback()
-            return False if not obtener_resultados else []
+            error = e
+        
+        perdida = self._es_conexion_perdida(error)
+        if perdida:
+            self._conexion_perdida = True
+            if not self._nivel_transaccion and _es_lectura(consulta) and self.reconectar():
+                try:
+                    return self._ejecutar(consulta, parametros, obtener_resultados, preparada)
+                except Error as e:
+                    error = e
+        # Dentro de una transacción, deshacerla es decisión del bloque transaccion()
+        elif not self._nivel_transaccion:
+            self._deshacer()
+        
+        metricas.incrementar('inventario_errores_bd_total', (('tipo', 'conexion' if perdida else 'consulta'),))
+        print(f"❌ Error ejecutando consulta: {error}")
+        return False if not obtener_resultados else []
     
+    def ejecutar_sentencia(self, consulta, parametros=None):
+        """
+        Ejecuta una escritura igual que ejecutar_consulta (verifica la conexión,
+        mide la duración y registra las consultas lentas), pero si falla la
+        deshace y propaga el error, como ejecutar_lote. Dentro de transaccion()
+        no confirma ni deshace: eso lo decide el bloque.
+
+        Args:
+            consulta (str): Consulta SQL con marcadores %s
+            parametros (tuple): Parámetros para la consulta
+
+        Returns:
+            int: Cantidad de filas afectadas
+        """
+        self._asegurar_conexion()
+        try:
+            self._ejecutar(consulta, parametros, False, False)
+        except Error as e:
+            perdida = self._es_conexion_perdida(e)
+            if perdida:
+                self._conexion_perdida = True  # La próxima operación reconecta
+            elif not self._nivel_transaccion:
+                self._deshacer()
+            metricas.incrementar('inventario_errores_bd_total', (('tipo', 'conexion' if perdida else 'consulta'),))
+            raise
+        return self.filas_afectadas
+
+    def ejecutar_lote(self, consulta, lista_parametros):
+        """
+        Ejecuta la misma consulta para muchos juegos de parámetros (executemany)
+        y confirma una sola vez. Para INSERT ... VALUES el conector arma una
+        única sentencia multi-fila. Dentro de transaccion() no confirma.
+
+        A diferencia de ejecutar_consulta, si falla deshace el lote y propaga
+        el error para que el llamador decida cómo seguir.
+
+        Args:
+            consulta (str): Consulta SQL con marcadores %s
+            lista_parametros (list): Lista de tuplas de parámetros
+
+        Returns:
+            int: Cantidad de filas afectadas
+        """
+        self._asegurar_conexion()
+        inicio = time.perf_counter()
+        try:
+            self.cursor.executemany(consulta, lista_parametros)
+            filas_afectadas = self.cursor.rowcount
+            if not self._nivel_transaccion:
+                self.conexion.commit()
+            return filas_afectadas
+        except Error as e:
+            tipo = 'conexion' if e.errno in _ERRORES_CONEXION else 'consulta'
+            metricas.incrementar('inventario_errores_bd_total', (('tipo', tipo),))
+            if not self._nivel_transaccion:
+                self._deshacer()
+            raise
+        finally:
+            self._medir(consulta, lista_parametros, inicio)
+
+    def iterar_consulta(self, consulta, parametros=None, tamano_bloque=1000):
+        """
+        Recorre el resultado de una consulta fila por fila con un cursor sin
+        buffer: las filas se leen del servidor de a tamano_bloque a medida que
+        se consumen, así la memoria no depende de la cantidad de filas (a
+        diferencia de ejecutar_consulta(..., obtener_resultados=True)).
+
+        Mientras el generador no termine, la conexión no puede ejecutar otras
+        consultas: consumirlo entero o cerrarlo (close()) antes de seguir.
+        Los errores se propagan, como en ejecutar_lote.
+
+        Args:
+            consulta (str): Consulta SQL (SELECT)
+            parametros (tuple): Parámetros para la consulta
+            tamano_bloque (int): Filas por lectura del socket
+
+        Yields:
+            dict: Cada fila
+        """
+        self._asegurar_conexion()
+        inicio = time.perf_counter()
+        cursor = self.conexion.cursor(dictionary=True, buffered=False)
+        try:
+            cursor.execute(consulta, parametros or ())
+            while filas := cursor.fetchmany(tamano_bloque):
+                yield from filas
+        except Error as e:
+            tipo = 'conexion' if e.errno in _ERRORES_CONEXION else 'consulta'
+            metricas.incrementar('inventario_errores_bd_total', (('tipo', tipo),))
+            if e.errno in _ERRORES_CONEXION:
+                self._conexion_perdida = True
+            raise
+        finally:
+            try:
+                # Si se dejó de leer antes del final, las filas pendientes se descartan
+                if self.conexion.unread_result:
+                    self.conexion.consume_results()
+                cursor.close()
+            except Error:
+                self._conexion_perdida = True
+            self._medir(consulta, parametros, inicio)
+
+    @contextmanager
+    def transaccion(self):
+        """
+        Agrupa varias consultas en una unidad de trabajo con un único commit.
+
+        Mientras el bloque está activo, ejecutar_consulta y ejecutar_lote no
+        confirman cada sentencia. Al salir sin errores se hace commit; si se
+        lanza una excepción se deshace todo el bloque y la excepción se propaga.
+        Los bloques anidados usan SAVEPOINT, así un error interno solo deshace
+        su propio bloque.
+
+        Uso:
+            with bd_conexion.transaccion():
+                if not agregar_producto_bd("pera", "fruta", 1.8, 40, bd_conexion):
+                    raise ValueError("No se pudo agregar")
+                actualizar_producto_bd("manzana", "stock", 10, bd_conexion)
+        """
+        punto_guardado = None
+        if self._nivel_transaccion:
+            punto_guardado = f"sp_{self._nivel_transaccion}"
+            self.cursor.execute(f"SAVEPOINT {punto_guardado}")
+        else:
+            # La transacción arranca sobre una conexión verificada
+            self._asegurar_conexion()
+        self._nivel_transaccion += 1
+
+        try:
+            yield self
+        except BaseException:
+            self._nivel_transaccion -= 1
+            if punto_guardado:
+                try:
+                    self.cursor.execute(f"ROLLBACK TO SAVEPOINT {punto_guardado}")
+                except Error:
+                    self._conexion_perdida = True  # Se propaga la excepción original
+            else:
+                self._deshacer()
+            raise
+
+        self._nivel_transaccion -= 1
+        if punto_guardado:
+            self.cursor.execute(f"RELEASE SAVEPOINT {punto_guardado}")
+        else:
+            self.conexion.commit()
+
     def limpiar_todos_los_datos(self):
         """Limpia todos los datos (útil para tests)"""
         if self.modo_prueba:
             try:
                 self.cursor.execute("DELETE FROM productos")
                 self.conexion.commit()
+                if self.cache:
+                    self.cache.limpiar()
                 print("🧹 Datos de prueba limpiados")
                 return True
             except Error as e:
@@ -153,6 +600,144 @@ def obtener_conexion_base_datos(modo_prueba=False):
         return None
 
 
+class PoolConexiones:
+    """
+    Pool de conexiones DatabaseConnection reutilizables entre varios hilos.
+
+    Las conexiones se crean bajo demanda (hasta `tamano`) con
+    obtener_conexion_base_datos y se reutilizan en lugar de abrir un socket
+    nuevo por operación. Cada conexión la usa un único hilo a la vez.
+    """
+
+    def __init__(self, tamano=None, modo_prueba=False, tiempo_espera=None):
+        """
+        Inicializa el pool (sin abrir conexiones todavía)
+
+        Args:
+            tamano (int): Máximo de conexiones abiertas (por defecto DB_POOL_TAMANO o 5)
+            modo_prueba (bool): Si True, conecta a la BD de pruebas
+            tiempo_espera (float): Segundos a esperar por una conexión libre (None = sin límite)
+        """
+        self.modo_prueba = modo_prueba
+        self.tamano = tamano or int(os.getenv('DB_POOL_TAMANO', 5))
+        self.tiempo_espera = tiempo_espera
+        self._disponibles = queue.LifoQueue(maxsize=self.tamano)
+        self._creadas = 0
+        self._candado = threading.Lock()
+        self._cerrado = False
+
+    def _crear_conexion(self):
+        """Abre una conexión nueva si todavía no se alcanzó el tamaño del pool"""
+        with self._candado:
+            if self._creadas >= self.tamano:
+                return None
+            self._creadas += 1
+        bd = obtener_conexion_base_datos(modo_prueba=self.modo_prueba)
+        if bd is None:
+            with self._candado:
+                self._creadas -= 1
+        return bd
+
+    def obtener(self):
+        """
+        Toma una conexión del pool (checkout)
+
+        Returns:
+            DatabaseConnection: Conexión lista para usar, o None si no se pudo obtener
+        """
+        if self._cerrado:
+            return None
+        try:
+            return self._disponibles.get_nowait()
+        except queue.Empty:
+            pass
+
+        bd = self._crear_conexion()
+        if bd is not None:
+            return bd
+
+        try:
+            return self._disponibles.get(timeout=self.tiempo_espera)
+        except queue.Empty:
+            print("❌ Error: No hay conexiones disponibles en el pool")
+            return None
+
+    def devolver(self, bd):
+        """
+        Devuelve una conexión al pool (return)
+
+        Cierra cualquier transacción abierta para que el próximo usuario
+        no herede un snapshot viejo. Si la conexión está caída se descarta.
+
+        Args:
+            bd (DatabaseConnection): Conexión obtenida con obtener()
+        """
+        if bd is None:
+            return
+        try:
+            bd.conexion.rollback()
+            reutilizable = not self._cerrado
+        except Error:
+            reutilizable = False
+
+        if reutilizable:
+            self._disponibles.put(bd)
+        else:
+            bd.desconectar()
+            with self._candado:
+                self._creadas -= 1
+
+    @contextmanager
+    def conexion(self):
+        """
+        Context manager que toma una conexión y la devuelve al salir
+
+        Uso:
+            with pool.conexion() as bd_conexion:
+                agregar_producto_bd("manzana", "fruta", 1.5, 10, bd_conexion)
+        """
+        bd = self.obtener()
+        if bd is None:
+            raise PoolError("No se pudo obtener una conexión del pool")
+        try:
+            yield bd
+        finally:
+            self.devolver(bd)
+
+    def cerrar(self):
+        """Cierra todas las conexiones libres; las que estén en uso se cierran al devolverse"""
+        self._cerrado = True
+        while True:
+            try:
+                bd = self._disponibles.get_nowait()
+            except queue.Empty:
+                break
+            bd.desconectar()
+            with self._candado:
+                self._creadas -= 1
+
+
+def obtener_pool_conexiones(tamano=None, modo_prueba=False, tiempo_espera=None):
+    """
+    Función factory para obtener un pool de conexiones a la base de datos.
+    Abre una primera conexión para verificar la configuración y crear las tablas.
+
+    Args:
+        tamano (int): Máximo de conexiones abiertas (por defecto DB_POOL_TAMANO o 5)
+        modo_prueba (bool): Si True, conecta a la BD de pruebas
+        tiempo_espera (float): Segundos a esperar por una conexión libre
+
+    Returns:
+        PoolConexiones: Pool listo para usar, o None si no se pudo conectar
+    """
+    pool = PoolConexiones(tamano=tamano, modo_prueba=modo_prueba, tiempo_espera=tiempo_espera)
+    bd = pool.obtener()
+    if bd is None:
+        return None
+    pool.devolver(bd)
+    return pool
+
+
 if __name__ == "__main__":
     # Script para configurar la base de datos manualmente
     print("🔧 Configurando base de datos...")
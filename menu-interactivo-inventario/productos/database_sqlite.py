@@ -0,0 +1,294 @@
+"""
+Módulo para manejo de la base de datos SQLite del inventario.
+Backend persistente sin servidor: mismo esquema que la tabla MySQL,
+con journaling WAL y caché de sentencias preparadas de sqlite3.
+"""
+
+import sqlite3
+import os
+from contextlib import contextmanager
+from dotenv import load_dotenv
+from productos.validaciones import normalizar_clave
+
+# Cargar variables de entorno
+load_dotenv()
+
+SENTENCIAS_EN_CACHE = 64  # Sentencias preparadas que sqlite3 mantiene por conexión
+
+# UNIQUE(nombre) ya crea un índice, que cumple el rol de idx_nombre.
+# nombre_clave es el nombre sin tildes, calculado por la aplicación al insertar
+# (normalizar_clave): su índice UNIQUE da búsquedas y duplicados sin distinguir
+# tildes, como utf8mb4_unicode_ci en MySQL. Es una columna común, así el archivo
+# se puede leer y modificar desde cualquier cliente SQLite
+TABLA_PRODUCTOS = """
+    CREATE TABLE IF NOT EXISTS {tabla} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nombre TEXT NOT NULL UNIQUE,
+        tipo TEXT NOT NULL CHECK (tipo IN ('fruta', 'verdura')),
+        precio REAL NOT NULL CHECK (precio > 0),
+        stock INTEGER NOT NULL DEFAULT 0 CHECK (stock >= 0),
+        fecha_creacion TEXT DEFAULT CURRENT_TIMESTAMP,
+        fecha_actualizacion TEXT DEFAULT CURRENT_TIMESTAMP,
+        nombre_clave TEXT NOT NULL
+    )
+"""
+COLUMNAS_SIN_CLAVE = "id, nombre, tipo, precio, stock, fecha_creacion, fecha_actualizacion"
+
+
+class ConexionSQLite:
+    """Maneja la conexión y operaciones básicas con SQLite (misma interfaz que DatabaseConnection)"""
+
+    def __init__(self, modo_prueba=False, ruta=None):
+        """
+        Inicializa la conexión a la base de datos
+
+        Args:
+            modo_prueba (bool): Si True, usa el archivo de pruebas
+            ruta (str): Ruta del archivo SQLite (tiene prioridad sobre el .env)
+        """
+        self.modo_prueba = modo_prueba
+        self.conexion = None
+        self.cursor = None
+        self._nivel_transaccion = 0  # > 0 mientras hay un bloque transaccion() activo
+
+        if ruta is None:
+            ruta = (os.getenv('TEST_SQLITE_RUTA', 'inventario_test.sqlite3') if modo_prueba
+                    else os.getenv('SQLITE_RUTA', 'inventario.sqlite3'))
+        self.ruta = ruta
+
+    def conectar(self):
+        """Abre el archivo SQLite y activa WAL"""
+        try:
+            self.conexion = sqlite3.connect(self.ruta, cached_statements=SENTENCIAS_EN_CACHE)
+            self.conexion.row_factory = sqlite3.Row
+            # WAL: los lectores no bloquean al escritor y cada commit es un append al log
+            self.conexion.execute("PRAGMA journal_mode=WAL")
+            # En modo WAL, NORMAL mantiene la consistencia y evita un fsync por commit
+            self.conexion.execute("PRAGMA synchronous=NORMAL")
+            self.cursor = self.conexion.cursor()
+            return True
+        except sqlite3.Error as e:
+            print(f"❌ Error abriendo SQLite: {e}")
+            return False
+
+    def desconectar(self):
+        """Cierra la conexión con la base de datos"""
+        if self.cursor:
+            self.cursor.close()
+        if self.conexion:
+            self.conexion.close()
+            self.conexion = None
+
+    def crear_tablas(self):
+        """Crea las tablas necesarias para el inventario (equivalentes a las de MySQL)"""
+        try:
+            self._migrar_nombre_clave()
+            self.conexion.executescript(TABLA_PRODUCTOS.format(tabla='productos') + """;
+
+                CREATE INDEX IF NOT EXISTS idx_tipo ON productos (tipo);
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_nombre_clave ON productos (nombre_clave);
+
+                -- Equivalente a ON UPDATE CURRENT_TIMESTAMP de MySQL
+                CREATE TRIGGER IF NOT EXISTS trg_productos_fecha_actualizacion
+                AFTER UPDATE OF precio, stock ON productos
+                BEGIN
+                    UPDATE productos SET fecha_actualizacion = CURRENT_TIMESTAMP WHERE id = NEW.id;
+                END;
+            """)
+            return True
+
+        except sqlite3.Error as e:
+            print(f"❌ Error creando tablas: {e}")
+            return False
+
+    def _migrar_nombre_clave(self):
+        """
+        Agrega nombre_clave a un archivo creado antes de que existiera la columna.
+        SQLite no agrega columnas NOT NULL sin valor por defecto: la tabla se
+        vuelve a crear con el esquema actual (queda igual que en un archivo nuevo)
+        y se copian las filas con su clave. Todo en una transacción.
+
+        Raises:
+            sqlite3.IntegrityError: Si hay nombres que solo difieren en tildes o
+                mayúsculas (no entrarían en el índice UNIQUE de nombre_clave)
+        """
+        columnas = {fila['name'] for fila in self.conexion.execute("PRAGMA table_info(productos)")}
+        if not columnas or 'nombre_clave' in columnas:
+            return
+
+        filas = self.conexion.execute(f"SELECT {COLUMNAS_SIN_CLAVE} FROM productos").fetchall()
+        por_clave = {}
+        for fila in filas:
+            por_clave.setdefault(normalizar_clave(fila['nombre']), []).append(fila['nombre'])
+        repetidos = [" / ".join(nombres) for nombres in por_clave.values() if len(nombres) > 1]
+        if repetidos:
+            raise sqlite3.IntegrityError(
+                f"{self.ruta} tiene productos que solo difieren en tildes o mayúsculas "
+                f"({'; '.join(repetidos)}): renombrar o eliminar los repetidos antes de abrirlo"
+            )
+
+        self.conexion.execute("BEGIN")
+        try:
+            self.conexion.execute(TABLA_PRODUCTOS.format(tabla='productos_migracion'))
+            self.conexion.executemany(
+                f"INSERT INTO productos_migracion ({COLUMNAS_SIN_CLAVE}, nombre_clave) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(*fila, normalizar_clave(fila['nombre'])) for fila in filas]
+            )
+            # Con la tabla vieja se borran también su índice y su trigger: crear_tablas los vuelve a crear
+            self.conexion.execute("DROP TABLE productos")
+            self.conexion.execute("ALTER TABLE productos_migracion RENAME TO productos")
+            self.conexion.commit()
+        except sqlite3.Error:
+            self.conexion.rollback()
+            raise
+
+    def configurar_base_datos(self):
+        """Configura completamente la base de datos (conectar y crear tablas)"""
+        if not self.conectar():
+            return False
+
+        if not self.crear_tablas():
+            return False
+
+        return True
+
+    def ejecutar_consulta(self, consulta, parametros=None, obtener_resultados=False):
+        """
+        Ejecuta una consulta SQL (marcadores ?)
+
+        Args:
+            consulta (str): Consulta SQL a ejecutar
+            parametros (tuple): Parámetros para la consulta
+            obtener_resultados (bool): Si True, retorna los resultados
+
+        Returns:
+            list|bool: Resultados si obtener_resultados=True, sino bool indicando éxito
+        """
+        try:
+            self.cursor.execute(consulta, parametros or ())
+
+            if obtener_resultados:
+                return self.cursor.fetchall()
+            else:
+                if not self._nivel_transaccion:
+                    self.conexion.commit()
+                return True
+
+        except sqlite3.Error as e:
+            print(f"❌ Error ejecutando consulta: {e}")
+            if not self._nivel_transaccion:
+                self.conexion.rollback()
+            return False if not obtener_resultados else []
+
+    def ejecutar_lote(self, consulta, lista_parametros):
+        """
+        Ejecuta la misma consulta para muchos juegos de parámetros (executemany)
+        y confirma una sola vez. Dentro de transaccion() no confirma.
+        Si falla deshace el lote y propaga el error.
+
+        Returns:
+            int: Cantidad de filas afectadas
+        """
+        try:
+            self.cursor.executemany(consulta, lista_parametros)
+            filas_afectadas = self.cursor.rowcount
+            if not self._nivel_transaccion:
+                self.conexion.commit()
+            return filas_afectadas
+        except sqlite3.Error:
+            if not self._nivel_transaccion:
+                self.conexion.rollback()
+            raise
+
+    def iterar_consulta(self, consulta, parametros=None, tamano_bloque=1000):
+        """
+        Recorre el resultado de una consulta fila por fila con un cursor propio,
+        sin armar la lista completa. Mismo contrato que
+        DatabaseConnection.iterar_consulta(); los errores se propagan.
+
+        Yields:
+            sqlite3.Row: Cada fila
+        """
+        cursor = self.conexion.cursor()
+        try:
+            cursor.execute(consulta, parametros or ())
+            while filas := cursor.fetchmany(tamano_bloque):
+                yield from filas
+        finally:
+            cursor.close()
+
+    @contextmanager
+    def transaccion(self):
+        """
+        Agrupa varias consultas en una unidad de trabajo con un único commit.
+        Mismo contrato que DatabaseConnection.transaccion(): los bloques
+        anidados usan SAVEPOINT y una excepción deshace el bloque.
+        """
+        punto_guardado = None
+        if self._nivel_transaccion:
+            punto_guardado = f"sp_{self._nivel_transaccion}"
+            self.cursor.execute(f"SAVEPOINT {punto_guardado}")
+        elif not self.conexion.in_transaction:
+            # BEGIN explícito: si no, un SAVEPOINT anidado abriría y cerraría su propia transacción
+            self.cursor.execute("BEGIN")
+        self._nivel_transaccion += 1
+
+        try:
+            yield self
+        except BaseException:
+            self._nivel_transaccion -= 1
+            if punto_guardado:
+                self.cursor.execute(f"ROLLBACK TO SAVEPOINT {punto_guardado}")
+            else:
+                self.conexion.rollback()
+            raise
+
+        self._nivel_transaccion -= 1
+        if punto_guardado:
+            self.cursor.execute(f"RELEASE SAVEPOINT {punto_guardado}")
+        else:
+            self.conexion.commit()
+
+    def limpiar_todos_los_datos(self):
+        """Limpia todos los datos (útil para tests)"""
+        if self.modo_prueba:
+            try:
+                self.cursor.execute("DELETE FROM productos")
+                self.conexion.commit()
+                return True
+            except sqlite3.Error as e:
+                print(f"❌ Error limpiando datos: {e}")
+                return False
+        else:
+            print("⚠️  No se puede limpiar datos en producción")
+            return False
+
+
+def obtener_conexion_sqlite(modo_prueba=False, ruta=None):
+    """
+    Función factory para obtener una conexión SQLite
+
+    Args:
+        modo_prueba (bool): Si True, usa el archivo de pruebas
+        ruta (str): Ruta del archivo SQLite (opcional)
+
+    Returns:
+        ConexionSQLite: Instancia de conexión configurada
+    """
+    bd = ConexionSQLite(modo_prueba=modo_prueba, ruta=ruta)
+    if bd.configurar_base_datos():
+        return bd
+    else:
+        return None
+
+
+if __name__ == "__main__":
+    # Script para crear el archivo SQLite manualmente
+    print("🔧 Configurando base de datos SQLite...")
+
+    bd = obtener_conexion_sqlite()
+    if bd:
+        print(f"✅ Base de datos SQLite configurada en {bd.ruta}")
+        bd.desconectar()
+    else:
+        print("❌ Error configurando base de datos SQLite")
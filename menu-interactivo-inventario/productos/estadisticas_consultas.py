@@ -0,0 +1,186 @@
+"""
+Módulo con la medición de tiempos de las consultas de DatabaseConnection.
+
+Cada sentencia que pasa por ejecutar_consulta o ejecutar_lote se mide con un
+reloj monotónico y se acumula en un histograma por sentencia (cantidad, p50,
+p95, p99, máximo). Las sentencias se agrupan por su texto normalizado: los
+espacios se compactan y las listas de largo variable (IN (%s, %s, ...) y los
+SELECT ... UNION ALL de los lotes) cuentan como una sola sentencia.
+
+Las consultas que superan el umbral se guardan en un log de consultas lentas
+(las últimas en memoria y, opcionalmente, en un archivo JSON por línea) con la
+forma de sus parámetros (tipos, nunca valores) y, si se pide, su EXPLAIN.
+"""
+
+import json
+import math
+import re
+import threading
+import time
+from collections import deque
+
+SUBDIVISIONES = 8  # Cubetas del histograma por cada potencia de 2 (error de ~9 %)
+
+_ESPACIOS = re.compile(r'\s+')
+_LISTA_IN = re.compile(r'IN \((?:%s, )*%s\)')
+_UNION_ALL = re.compile(r'(SELECT %s(?: AS \w+)?(?:, %s(?: AS \w+)?)*)(?: UNION ALL \1)+')
+
+
+def normalizar_consulta(consulta):
+    """
+    Devuelve el texto con el que se agrupan las estadísticas de una consulta
+
+    Args:
+        consulta (str): Consulta SQL con marcadores %s
+    """
+    consulta = _ESPACIOS.sub(' ', consulta).strip()
+    consulta = _LISTA_IN.sub('IN (...)', consulta)
+    return _UNION_ALL.sub(r'\1 UNION ALL ...', consulta)
+
+
+def forma_parametros(parametros):
+    """
+    Describe los parámetros sin sus valores: "(str, float, int)"
+
+    Args:
+        parametros (tuple|list): Parámetros de una consulta, o lista de tuplas de un lote
+    """
+    if not parametros:
+        return "()"
+    if isinstance(parametros, list) and isinstance(parametros[0], (tuple, list)):
+        return f"{len(parametros)} × {forma_parametros(tuple(parametros[0]))}"
+    if len(parametros) > 8:
+        tipos = sorted({type(valor).__name__ for valor in parametros})
+        return f"({len(parametros)} valores: {', '.join(tipos)})"
+    return "(" + ", ".join(type(valor).__name__ for valor in parametros) + ")"
+
+
+class HistogramaLatencia:
+    """Histograma de latencias con cubetas logarítmicas (memoria acotada, sin guardar muestras)"""
+
+    __slots__ = ('cantidad', 'total', 'maximo', '_cubetas')
+
+    def __init__(self):
+        self.cantidad = 0
+        self.total = 0.0
+        self.maximo = 0.0
+        self._cubetas = {}  # índice -> cantidad; la cubeta i llega hasta 2 ** ((i + 1) / SUBDIVISIONES) µs
+
+    def registrar(self, segundos):
+        """Agrega una muestra (en segundos)"""
+        self.cantidad += 1
+        self.total += segundos
+        if segundos > self.maximo:
+            self.maximo = segundos
+        microsegundos = segundos * 1e6
+        indice = int(math.log2(microsegundos) * SUBDIVISIONES) if microsegundos > 1 else 0
+        self._cubetas[indice] = self._cubetas.get(indice, 0) + 1
+
+    def percentil(self, porcentaje):
+        """
+        Devuelve (aproximado por exceso) el valor bajo el que queda el porcentaje pedido de las muestras
+
+        Args:
+            porcentaje (float): Entre 0 y 100
+
+        Returns:
+            float: Segundos (0.0 si no hay muestras)
+        """
+        if not self.cantidad:
+            return 0.0
+        objetivo = porcentaje / 100 * self.cantidad
+        acumulado = 0
+        for indice in sorted(self._cubetas):
+            acumulado += self._cubetas[indice]
+            if acumulado >= objetivo:
+                return min(2 ** ((indice + 1) / SUBDIVISIONES) / 1e6, self.maximo)
+        return self.maximo
+
+
+class EstadisticasConsultas:
+    """Histogramas por sentencia y log de consultas lentas de una conexión (thread-safe)"""
+
+    def __init__(self, umbral_lenta=0.1, ruta_log=None, capturar_explain=False, max_lentas=100):
+        """
+        Args:
+            umbral_lenta (float): Segundos a partir de los cuales una consulta es lenta (None = no registrar)
+            ruta_log (str): Archivo donde agregar las consultas lentas (una línea JSON cada una)
+            capturar_explain (bool): Si True, guarda el EXPLAIN de cada consulta lenta
+            max_lentas (int): Consultas lentas que se conservan en memoria
+        """
+        self.umbral_lenta = umbral_lenta
+        self.ruta_log = ruta_log
+        self.capturar_explain = capturar_explain
+        self._histogramas = {}  # consulta normalizada -> HistogramaLatencia
+        self._lentas = deque(maxlen=max_lentas)
+        self._candado = threading.Lock()
+
+    def registrar(self, consulta, parametros, segundos, explicar=None):
+        """
+        Acumula la duración de una consulta y, si fue lenta, la agrega al log
+
+        Args:
+            consulta (str): Consulta SQL ejecutada
+            parametros (tuple|list): Sus parámetros (solo se guarda su forma)
+            segundos (float): Duración medida
+            explicar (callable): Devuelve el EXPLAIN de la consulta; solo se llama si fue lenta
+        """
+        clave = normalizar_consulta(consulta)
+        with self._candado:
+            histograma = self._histogramas.get(clave)
+            if histograma is None:
+                histograma = self._histogramas[clave] = HistogramaLatencia()
+            histograma.registrar(segundos)
+
+        if self.umbral_lenta is None or segundos < self.umbral_lenta:
+            return
+        lenta = {
+            'momento': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'consulta': clave,
+            'duracion_ms': round(segundos * 1000, 3),
+            'parametros': forma_parametros(parametros),
+        }
+        if self.capturar_explain and explicar is not None:
+            lenta['explain'] = explicar()
+        with self._candado:
+            self._lentas.append(lenta)
+            if self.ruta_log:
+                with open(self.ruta_log, 'a', encoding='utf-8') as archivo:
+                    archivo.write(json.dumps(lenta, ensure_ascii=False, default=str) + '\n')
+
+    def resumen(self):
+        """
+        Devuelve las latencias por sentencia, de la que más tiempo total consumió a la que menos
+
+        Returns:
+            dict: {consulta: {'cantidad', 'total_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms'}}
+        """
+        with self._candado:
+            ordenadas = sorted(self._histogramas.items(), key=lambda item: item[1].total, reverse=True)
+            return {
+                consulta: {
+                    'cantidad': histograma.cantidad,
+                    'total_ms': round(histograma.total * 1000, 3),
+                    'p50_ms': round(histograma.percentil(50) * 1000, 3),
+                    'p95_ms': round(histograma.percentil(95) * 1000, 3),
+                    'p99_ms': round(histograma.percentil(99) * 1000, 3),
+                    'max_ms': round(histograma.maximo * 1000, 3),
+                }
+                for consulta, histograma in ordenadas
+            }
+
+    def consultas_lentas(self):
+        """
+        Devuelve las últimas consultas lentas (la más reciente al final)
+
+        Returns:
+            list: Diccionarios con momento, consulta, duracion_ms, parametros y, si se pidió, explain
+        """
+        with self._candado:
+            return list(self._lentas)
+
+    def limpiar(self):
+        """Descarta los histogramas y las consultas lentas en memoria (no toca el archivo)"""
+        with self._candado:
+            self._histogramas.clear()
+            self._lentas.clear()
@@ -0,0 +1,136 @@
+"""
+Módulo con la exportación del catálogo a CSV o JSONL, con compresión opcional.
+
+Los productos se escriben a medida que llegan del backend (un cursor sin
+buffer en MySQL, un cursor propio en SQLite o el inventario en memoria) y
+gzip/lzma comprimen de a bloques mientras se escribe: la memoria usada es la
+misma para mil productos que para millones, porque nunca se arma la lista
+completa.
+
+El archivo se escribe con un nombre temporal y se renombra al terminar, así
+una exportación interrumpida no deja un respaldo a medias con el nombre final.
+"""
+
+import csv
+import gzip
+import io
+import json
+import lzma
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+from productos.importacion import CAMPOS_PRODUCTO, detectar_formato as _formato_por_extension
+
+# Compresión -> extensiones que la identifican
+COMPRESIONES = {
+    'gzip': ('.gz',),
+    'lzma': ('.xz', '.lzma'),
+}
+NIVEL_GZIP = 6  # El 9 de gzip.open() comprime apenas mejor y tarda bastante más
+
+
+def detectar_compresion(ruta):
+    """Devuelve 'gzip' o 'lzma' según la extensión, o None si no está comprimido"""
+    for compresion, extensiones in COMPRESIONES.items():
+        if ruta.lower().endswith(extensiones):
+            return compresion
+    return None
+
+
+def detectar_formato(ruta):
+    """Devuelve 'jsonl' o 'csv' según la extensión, ignorando la de la compresión"""
+    compresion = detectar_compresion(ruta)
+    if compresion:
+        ruta = os.path.splitext(ruta)[0]
+    return _formato_por_extension(ruta)
+
+
+@contextmanager
+def abrir_destino(ruta, compresion=None, estandar=None):
+    """
+    Abre el archivo de salida como texto UTF-8, comprimiendo mientras se escribe
+
+    Args:
+        ruta (str): Archivo de salida ('-' = salida estándar)
+        compresion (str): 'gzip', 'lzma' o None
+        estandar: Salida de texto a usar con '-' (por defecto sys.stdout)
+
+    Yields:
+        Archivo de texto donde escribir
+    """
+    estandar = estandar or sys.stdout
+    if ruta == '-' and compresion is None:
+        yield estandar
+        estandar.flush()
+        return
+
+    temporal = None if ruta == '-' else f"{ruta}.tmp"
+    destino = estandar.buffer if ruta == '-' else temporal
+    if compresion == 'gzip':
+        binario = gzip.open(destino, 'wb', compresslevel=NIVEL_GZIP)
+    elif compresion == 'lzma':
+        binario = lzma.open(destino, 'wb')
+    else:
+        binario = open(destino, 'wb')
+    texto = io.TextIOWrapper(binario, encoding='utf-8', newline='')
+    try:
+        yield texto
+        texto.close()  # Escribe el final del flujo comprimido
+    except BaseException:
+        texto.close()
+        if temporal:
+            os.remove(temporal)
+        raise
+    if temporal:
+        os.replace(temporal, ruta)
+
+
+def escribir_productos(productos, salida, formato='csv'):
+    """
+    Escribe los productos en salida a medida que se recorren
+
+    Args:
+        productos (iterable): Diccionarios {"nombre", "tipo", "precio", "stock"}
+        salida: Archivo de texto abierto
+        formato (str): 'csv' (con encabezado) o 'jsonl'
+
+    Returns:
+        int: Cantidad de productos escritos
+    """
+    cantidad = 0
+    if formato == 'jsonl':
+        for producto in productos:
+            salida.write(json.dumps(producto, ensure_ascii=False) + '\n')
+            cantidad += 1
+    else:
+        escritor = csv.writer(salida)
+        escritor.writerow(CAMPOS_PRODUCTO)
+        for producto in productos:
+            escritor.writerow([producto[campo] for campo in CAMPOS_PRODUCTO])
+            cantidad += 1
+    return cantidad
+
+
+def exportar_catalogo(backend, ruta, formato=None, compresion=None, estandar=None):
+    """
+    Exporta todo el catálogo del backend a un archivo
+
+    Args:
+        backend (BackendInventario): Backend abierto
+        ruta (str): Archivo de salida ('-' = salida estándar)
+        formato (str): 'csv' o 'jsonl' (None = según la extensión)
+        compresion (str): 'gzip' o 'lzma' (None = según la extensión)
+        estandar: Salida de texto a usar con '-' (por defecto sys.stdout)
+
+    Returns:
+        dict: {'filas', 'segundos', 'filas_por_segundo'}
+    """
+    compresion = compresion or detectar_compresion(ruta)
+    formato = formato or detectar_formato(ruta)
+    inicio = time.perf_counter()
+    with abrir_destino(ruta, compresion, estandar) as salida:
+        filas = escribir_productos(backend.iterar_productos(), salida, formato)
+    segundos = time.perf_counter() - inicio
+    return {'filas': filas, 'segundos': segundos, 'filas_por_segundo': filas / segundos if segundos else 0.0}
@@ -0,0 +1,270 @@
+"""
+Módulo con la importación de productos desde archivos CSV o JSONL.
+
+El archivo se procesa como una cadena de generadores, fila por fila, sin
+cargarlo entero en memoria:
+
+    parsear_csv / parsear_jsonl  ->  validar_filas  ->  deduplicar  ->  escribir_en_lotes
+
+Cada etapa recibe y devuelve filas (linea, campos, producto, motivo):
+- linea: número de línea en el archivo (para informar los rechazos)
+- campos: diccionario con los valores tal como venían en el archivo
+- producto: tupla (nombre, tipo, precio, stock) validada, o None si se rechazó
+- motivo: por qué se rechazó la fila (None si es válida)
+
+Las filas rechazadas no cortan la importación: escribir_en_lotes las manda a
+un ArchivoRechazos con su motivo y escribe las válidas en el backend de a
+`tamano_lote` por vez. La memoria usada depende del tamaño del lote y de la
+cantidad de nombres distintos (que deduplicar necesita recordar), no del
+tamaño del archivo.
+"""
+
+import csv
+import json
+import sys
+import time
+from contextlib import nullcontext
+
+from productos.backends import TAMANO_LOTE
+from productos.validaciones import validar_nombre, validar_tipo, validar_precio, validar_stock, normalizar_clave
+
+CAMPOS_PRODUCTO = ('nombre', 'tipo', 'precio', 'stock')
+
+
+def validar_producto(nombre, tipo, precio, stock):
+    """
+    Valida los cuatro campos de un producto con las validaciones del menú
+
+    Returns:
+        tuple: (producto, motivo) donde producto es (nombre, tipo, precio, stock)
+               o None si se rechazó, y motivo explica el rechazo
+    """
+    nombre_valido = validar_nombre(nombre, permitir_cancelar=False)
+    if nombre_valido in ('vacio', 'invalido'):
+        return (None, f"nombre {nombre_valido}: {nombre!r}")
+    tipo_valido = validar_tipo(tipo)
+    if tipo_valido in ('cancelado', 'invalido'):
+        return (None, f"tipo inválido: {tipo!r} (debe ser 'fruta' o 'verdura')")
+    precio_valido = validar_precio(precio)
+    if precio_valido in ('cancelado', 'invalido'):
+        return (None, f"precio inválido: {precio!r} (debe ser un número positivo)")
+    stock_valido = validar_stock(stock)
+    if stock_valido in ('cancelado', 'invalido'):
+        return (None, f"stock inválido: {stock!r} (debe ser un entero no negativo)")
+    return ((nombre_valido, tipo_valido, precio_valido, stock_valido), None)
+
+
+def detectar_formato(ruta):
+    """Devuelve 'jsonl' para archivos .jsonl/.ndjson y 'csv' para el resto"""
+    return 'jsonl' if ruta.lower().endswith(('.jsonl', '.ndjson')) else 'csv'
+
+
+# --- Etapas de la cadena ---
+
+def parsear_csv(archivo, encabezado=None):
+    """
+    Lee un CSV con encabezado (debe tener las columnas nombre, tipo, precio y stock)
+
+    Args:
+        archivo: Archivo de texto abierto (con newline='')
+        encabezado (list): Columnas ya leídas (para un tramo del archivo sin
+                           encabezado); None = leerlas de la primera línea
+
+    Yields:
+        tuple: (linea, campos, None, None); las filas con columnas de menos traen motivo
+
+    Raises:
+        ValueError: Si al encabezado le faltan columnas
+    """
+    lector = csv.DictReader(archivo, fieldnames=encabezado)
+    faltantes = [campo for campo in CAMPOS_PRODUCTO if campo not in (lector.fieldnames or ())]
+    if faltantes:
+        raise ValueError(f"al archivo le faltan las columnas: {', '.join(faltantes)}")
+    for campos in lector:
+        if None in campos.values():
+            yield (lector.line_num, campos, None, "faltan columnas en la fila")
+        else:
+            yield (lector.line_num, campos, None, None)
+
+
+def parsear_jsonl(archivo):
+    """
+    Lee un objeto JSON por línea con las claves nombre, tipo, precio y stock
+
+    Yields:
+        tuple: (linea, campos, None, None); las líneas que no son un objeto JSON traen motivo
+    """
+    for linea, texto in enumerate(archivo, start=1):
+        texto = texto.strip()
+        if not texto:
+            continue
+        try:
+            campos = json.loads(texto)
+        except json.JSONDecodeError as e:
+            yield (linea, {'registro': texto}, None, f"JSON inválido: {e.msg}")
+            continue
+        if not isinstance(campos, dict):
+            yield (linea, {'registro': texto}, None, "se esperaba un objeto JSON")
+            continue
+        yield (linea, campos, None, None)
+
+
+def validar_filas(filas):
+    """
+    Valida cada fila con validar_producto (los valores no texto, como los
+    números de JSON, se validan por su representación)
+
+    Yields:
+        tuple: (linea, campos, producto, motivo)
+    """
+    for linea, campos, _, motivo in filas:
+        if motivo is not None:
+            yield (linea, campos, None, motivo)
+            continue
+        valores = ['' if campos.get(campo) is None else str(campos[campo]) for campo in CAMPOS_PRODUCTO]
+        producto, motivo = validar_producto(*valores)
+        yield (linea, campos, producto, motivo)
+
+
+def deduplicar(filas):
+    """
+    Rechaza los nombres repetidos en el archivo (sin importar tildes ni
+    mayúsculas); se queda con la primera aparición
+
+    Yields:
+        tuple: (linea, campos, producto, motivo)
+    """
+    vistos = set()
+    for linea, campos, producto, motivo in filas:
+        if producto is not None:
+            clave = normalizar_clave(producto[0])
+            if clave in vistos:
+                yield (linea, campos, None, "nombre repetido en el archivo")
+                continue
+            vistos.add(clave)
+        yield (linea, campos, producto, motivo)
+
+
+class ArchivoRechazos:
+    """
+    Guarda las filas rechazadas con su línea y su motivo, en el formato del
+    archivo importado (así se pueden corregir y volver a importar).
+    El archivo se crea recién con el primer rechazo.
+    """
+
+    def __init__(self, ruta=None, formato='csv'):
+        """
+        Args:
+            ruta (str): Archivo de rechazos ('-' = stderr, None = solo contarlos)
+            formato (str): 'csv' o 'jsonl'
+        """
+        self.ruta = ruta
+        self.formato = formato
+        self.cantidad = 0
+        self._archivo = None
+        self._escritor = None
+
+    def registrar(self, linea, campos, motivo):
+        """Agrega una fila rechazada"""
+        self.cantidad += 1
+        if self.ruta is None:
+            return
+        if self._archivo is None:
+            self._archivo = sys.stderr if self.ruta == '-' else open(self.ruta, 'w', newline='', encoding='utf-8')
+            if self.formato == 'csv':
+                self._escritor = csv.DictWriter(self._archivo, ('linea', 'motivo') + CAMPOS_PRODUCTO,
+                                                extrasaction='ignore')
+                self._escritor.writeheader()
+        registro = {'linea': linea, 'motivo': motivo, **campos}
+        if self._escritor:
+            self._escritor.writerow(registro)
+        else:
+            self._archivo.write(json.dumps(registro, ensure_ascii=False, default=str) + '\n')
+
+    def cerrar(self):
+        if self._archivo and self._archivo is not sys.stderr:
+            self._archivo.close()
+        self._archivo = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+
+def escribir_en_lotes(filas, backend, rechazos, tamano_lote=TAMANO_LOTE, al_escribir_lote=None):
+    """
+    Última etapa: manda las filas rechazadas a `rechazos` y escribe las válidas
+    en el backend con agregar_lote(), de a tamano_lote productos
+
+    Args:
+        filas (iterable): Filas (linea, campos, producto, motivo)
+        backend (BackendInventario): Backend abierto
+        rechazos (ArchivoRechazos): Destino de los rechazos (incluye los que ya existían)
+        tamano_lote (int): Productos por escritura
+        al_escribir_lote (callable): Se llama con los contadores tras cada lote
+
+    Returns:
+        dict: {'leidas', 'importadas', 'rechazadas', 'existentes'}
+    """
+    contadores = {'leidas': 0, 'importadas': 0, 'rechazadas': 0, 'existentes': 0}
+    lote = {}  # clave normalizada -> (linea, campos, producto)
+
+    def escribir_lote():
+        insertados, duplicados = backend.agregar_lote([producto for _, _, producto in lote.values()], tamano_lote)
+        contadores['importadas'] += insertados
+        for nombre in duplicados:
+            linea, campos, producto = lote[normalizar_clave(nombre)]
+            rechazos.registrar(linea, campos, "ya existe en el inventario")
+            contadores['existentes'] += 1
+        lote.clear()
+        if al_escribir_lote:
+            al_escribir_lote(dict(contadores))
+
+    for linea, campos, producto, motivo in filas:
+        contadores['leidas'] += 1
+        if producto is None:
+            rechazos.registrar(linea, campos, motivo)
+            contadores['rechazadas'] += 1
+            continue
+        lote[normalizar_clave(producto[0])] = (linea, campos, producto)
+        if len(lote) >= tamano_lote:
+            escribir_lote()
+    if lote:
+        escribir_lote()
+    return contadores
+
+
+def importar_archivo(ruta, backend, formato=None, tamano_lote=TAMANO_LOTE, ruta_rechazos=None,
+                     al_escribir_lote=None):
+    """
+    Importa un archivo CSV o JSONL al backend, fila por fila
+
+    Args:
+        ruta (str): Archivo a importar ('-' = entrada estándar)
+        backend (BackendInventario): Backend abierto
+        formato (str): 'csv' o 'jsonl' (None = según la extensión)
+        tamano_lote (int): Productos por escritura en el backend
+        ruta_rechazos (str): Archivo donde guardar las filas rechazadas con su motivo
+        al_escribir_lote (callable): Se llama con los contadores tras cada lote
+
+    Returns:
+        dict: {'leidas', 'importadas', 'rechazadas', 'existentes', 'segundos', 'filas_por_segundo'}
+
+    Raises:
+        OSError: Si no se puede leer el archivo
+        ValueError: Si al encabezado CSV le faltan columnas
+    """
+    formato = formato or detectar_formato(ruta)
+    parsear = parsear_jsonl if formato == 'jsonl' else parsear_csv
+    inicio = time.perf_counter()
+
+    entrada = nullcontext(sys.stdin) if ruta == '-' else open(ruta, newline='', encoding='utf-8-sig')
+    with entrada as archivo, ArchivoRechazos(ruta_rechazos, formato) as rechazos:
+        filas = deduplicar(validar_filas(parsear(archivo)))
+        resumen = escribir_en_lotes(filas, backend, rechazos, tamano_lote, al_escribir_lote)
+
+    resumen['segundos'] = time.perf_counter() - inicio
+    resumen['filas_por_segundo'] = resumen['leidas'] / resumen['segundos'] if resumen['segundos'] else 0.0
+    return resumen
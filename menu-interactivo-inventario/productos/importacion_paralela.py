@@ -0,0 +1,193 @@
+"""
+Módulo con la importación en paralelo de archivos CSV o JSONL muy grandes.
+
+La validación (expresiones regulares, conversión de precios y stocks) es
+trabajo de CPU puro y en archivos de millones de líneas es lo que limita a
+importar_archivo(). Acá el archivo se divide en rangos de bytes que empiezan
+y terminan en un salto de línea, y cada rango se parsea y valida en un
+proceso del ProcessPoolExecutor con las mismas etapas de importacion.py:
+
+    rango de bytes  ->  parsear_csv / parsear_jsonl  ->  validar_filas      (N procesos)
+                                                             |
+                              en el orden del archivo        v
+                                  deduplicar  ->  escribir_en_lotes          (1 proceso)
+
+La escritura queda en un solo lugar (el backend no se comparte entre
+procesos) y recibe los rangos en el orden del archivo, así los números de
+línea, la deduplicación y los motivos de rechazo dan lo mismo que en la
+importación secuencial. Solo hay `en_vuelo` rangos pedidos a la vez: si la
+escritura va más lenta que la validación, los procesos esperan en lugar de
+acumular el archivo entero en memoria.
+
+Diferencia con importar_archivo(): los campos CSV entre comillas no pueden
+contener saltos de línea (un rango podría cortarlos al medio).
+"""
+
+import csv
+import io
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from productos.backends import TAMANO_LOTE
+from productos.importacion import (
+    CAMPOS_PRODUCTO,
+    ArchivoRechazos,
+    deduplicar,
+    detectar_formato,
+    escribir_en_lotes,
+    parsear_csv,
+    parsear_jsonl,
+    validar_filas
+)
+
+TAMANO_RANGO = 4 * 1024 * 1024  # Bytes por tarea: suficiente para que el envío entre procesos no pese
+BOM = b'\xef\xbb\xbf'
+
+
+def leer_encabezado(ruta, formato):
+    """
+    Devuelve dónde empiezan los datos y el encabezado CSV (si corresponde)
+
+    Returns:
+        tuple: (inicio, encabezado, lineas) con el byte donde empiezan los
+               datos, la lista de columnas (None en JSONL) y cuántas líneas
+               ocupa lo que se saltea
+
+    Raises:
+        ValueError: Si al encabezado CSV le faltan columnas
+    """
+    with open(ruta, 'rb') as archivo:
+        inicio = len(BOM) if archivo.read(len(BOM)) == BOM else 0
+        archivo.seek(inicio)
+        if formato == 'jsonl':
+            return (inicio, None, 0)
+        primera = archivo.readline()
+    encabezado = next(csv.reader([primera.decode('utf-8')]), [])
+    faltantes = [campo for campo in CAMPOS_PRODUCTO if campo not in encabezado]
+    if faltantes:
+        raise ValueError(f"al archivo le faltan las columnas: {', '.join(faltantes)}")
+    return (inicio + len(primera), encabezado, 1)
+
+
+def dividir_en_rangos(ruta, inicio=0, tamano_rango=TAMANO_RANGO):
+    """
+    Divide el archivo en rangos de bytes de unos tamano_rango bytes que
+    terminan justo después de un salto de línea
+
+    Yields:
+        tuple: (desde, hasta) en bytes
+    """
+    tamano = os.path.getsize(ruta)
+    with open(ruta, 'rb') as archivo:
+        desde = inicio
+        while desde < tamano:
+            archivo.seek(min(desde + tamano_rango, tamano))
+            archivo.readline()  # Avanza hasta el final de la línea en curso
+            hasta = min(archivo.tell(), tamano)
+            yield (desde, hasta)
+            desde = hasta
+
+
+def validar_rango(ruta, desde, hasta, formato, encabezado):
+    """
+    Parsea y valida un rango del archivo (se ejecuta en otro proceso)
+
+    Args:
+        ruta (str): Archivo a importar
+        desde (int), hasta (int): Bytes del rango
+        formato (str): 'csv' o 'jsonl'
+        encabezado (list): Columnas del CSV (None en JSONL)
+
+    Returns:
+        tuple: (filas, lineas) con las filas (linea, campos, producto, motivo)
+               numeradas desde el comienzo del rango y la cantidad de líneas del rango.
+               Las filas válidas también traen sus campos originales: si después
+               se rechazan (repetidas o ya existentes) se guardan tal como venían
+    """
+    with open(ruta, 'rb') as archivo:
+        archivo.seek(desde)
+        datos = archivo.read(hasta - desde)
+    texto = io.StringIO(datos.decode('utf-8'), newline='')
+    if formato == 'jsonl':
+        filas = parsear_jsonl(texto)
+    else:
+        filas = parsear_csv(texto, encabezado)
+    return (list(validar_filas(filas)), datos.count(b'\n') + (not datos.endswith(b'\n')))
+
+
+def filas_en_orden(ruta, formato, procesos, tamano_rango=TAMANO_RANGO, en_vuelo=None):
+    """
+    Reparte los rangos del archivo entre los procesos y devuelve las filas
+    validadas en el orden del archivo
+
+    Args:
+        ruta (str): Archivo a importar
+        formato (str): 'csv' o 'jsonl'
+        procesos (int): Procesos que validan
+        tamano_rango (int): Bytes por tarea
+        en_vuelo (int): Rangos pedidos y todavía no escritos (por defecto 2 por proceso)
+
+    Yields:
+        tuple: (linea, campos, producto, motivo) con la línea en el archivo completo
+    """
+    inicio, encabezado, desplazamiento = leer_encabezado(ruta, formato)
+    en_vuelo = en_vuelo or 2 * procesos
+    rangos = dividir_en_rangos(ruta, inicio, tamano_rango)
+    ejecutor = ProcessPoolExecutor(procesos)
+    try:
+        pendientes = deque()
+
+        def pedir_siguiente():
+            rango = next(rangos, None)
+            if rango is not None:
+                pendientes.append(ejecutor.submit(validar_rango, ruta, *rango, formato, encabezado))
+
+        for _ in range(en_vuelo):
+            pedir_siguiente()
+        while pendientes:
+            filas, lineas = pendientes.popleft().result()
+            pedir_siguiente()  # Se libera un lugar: el proceso que terminó sigue con otro rango
+            for linea, campos, producto, motivo in filas:
+                yield (desplazamiento + linea, campos, producto, motivo)
+            desplazamiento += lineas
+    finally:
+        ejecutor.shutdown(cancel_futures=True)
+
+
+def importar_archivo_paralelo(ruta, backend, formato=None, procesos=None, tamano_lote=TAMANO_LOTE,
+                              ruta_rechazos=None, al_escribir_lote=None, tamano_rango=TAMANO_RANGO):
+    """
+    Importa un archivo CSV o JSONL validando en varios procesos
+
+    Args:
+        ruta (str): Archivo a importar (no puede ser la entrada estándar)
+        backend (BackendInventario): Backend abierto
+        formato (str): 'csv' o 'jsonl' (None = según la extensión)
+        procesos (int): Procesos que validan (None = uno por núcleo)
+        tamano_lote (int): Productos por escritura en el backend
+        ruta_rechazos (str): Archivo donde guardar las filas rechazadas con su motivo
+        al_escribir_lote (callable): Se llama con los contadores tras cada lote
+        tamano_rango (int): Bytes del archivo por tarea
+
+    Returns:
+        dict: {'leidas', 'importadas', 'rechazadas', 'existentes', 'segundos', 'filas_por_segundo'}
+
+    Raises:
+        OSError: Si no se puede leer el archivo
+        ValueError: Si al encabezado CSV le faltan columnas o la ruta es '-'
+    """
+    if ruta == '-':
+        raise ValueError("la importación en paralelo necesita un archivo (no se puede dividir la entrada estándar)")
+    formato = formato or detectar_formato(ruta)
+    procesos = procesos or os.cpu_count() or 1
+    inicio = time.perf_counter()
+
+    with ArchivoRechazos(ruta_rechazos, formato) as rechazos:
+        filas = deduplicar(filas_en_orden(ruta, formato, procesos, tamano_rango))
+        resumen = escribir_en_lotes(filas, backend, rechazos, tamano_lote, al_escribir_lote)
+
+    resumen['segundos'] = time.perf_counter() - inicio
+    resumen['filas_por_segundo'] = resumen['leidas'] / resumen['segundos'] if resumen['segundos'] else 0.0
+    return resumen
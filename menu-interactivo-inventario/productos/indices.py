@@ -0,0 +1,468 @@
+"""
+Módulo con los índices secundarios del inventario en memoria.
+
+InventarioMemoria mantiene sus índices al día en cada alta, modificación y
+baja. Cada índice declara en `campos` de qué campos del producto depende:
+al actualizar un campo solo se tocan los índices que lo usan.
+"""
+
+from abc import ABC, abstractmethod
+from bisect import bisect_left, insort
+from collections import Counter
+from itertools import islice
+from operator import itemgetter
+
+from productos.validaciones import normalizar_clave
+
+_precio_de = itemgetter(0)
+
+UMBRAL_SIMILITUD = 0.3  # Similitud mínima (0 a 1) para sugerir un nombre
+
+
+def trigramas(nombre):
+    """
+    Devuelve el conjunto de trigramas de la clave normalizada de un nombre.
+    Se rellena con dos espacios al inicio y uno al final (como pg_trgm), así
+    el comienzo de la palabra pesa más: 'kiwi' -> {'  k', ' ki', 'kiw', 'iwi', 'wi '}
+    """
+    texto = f"  {normalizar_clave(nombre)} "
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+def similitud(trigramas_a, trigramas_b):
+    """Similitud de Jaccard entre dos conjuntos de trigramas (0 = nada en común, 1 = iguales)"""
+    comunes = len(trigramas_a & trigramas_b)
+    return comunes / (len(trigramas_a) + len(trigramas_b) - comunes)
+
+
+class Indice(ABC):
+    """
+    Interfaz común de los índices del inventario en memoria.
+    Un índice al que le falte alguno de los métodos no se puede crear (TypeError).
+    """
+
+    campos = ()  # Campos del producto que determinan la posición en el índice
+
+    @abstractmethod
+    def agregar(self, nombre, producto):
+        """Incorpora un producto al índice"""
+
+    @abstractmethod
+    def quitar(self, nombre, producto):
+        """Saca un producto del índice (con los valores que tenía al agregarse)"""
+
+    @abstractmethod
+    def limpiar(self):
+        """Vacía el índice"""
+
+
+class IndiceTipo(Indice):
+    """
+    Índice {tipo: nombres}, equivalente a idx_tipo de MySQL.
+    Los nombres de cada tipo se guardan en un dict usado como conjunto
+    ordenado: altas y bajas en O(1) y se listan en orden de alta.
+    """
+
+    campos = ('tipo',)
+
+    def __init__(self):
+        self._nombres = {}
+
+    def agregar(self, nombre, producto):
+        self._nombres.setdefault(producto.tipo, {})[nombre] = None
+
+    def quitar(self, nombre, producto):
+        nombres = self._nombres.get(producto.tipo)
+        if nombres is not None:
+            nombres.pop(nombre, None)
+            if not nombres:
+                del self._nombres[producto.tipo]
+
+    def limpiar(self):
+        self._nombres.clear()
+
+    def buscar(self, tipo):
+        """
+        Devuelve los nombres de los productos de un tipo
+
+        Args:
+            tipo (str): Tipo del producto ('fruta' o 'verdura')
+
+        Returns:
+            KeysView: Nombres en orden de alta (vacío si no hay productos de ese tipo)
+        """
+        return self._nombres.get(tipo, {}).keys()
+
+    def contar(self, tipo):
+        """Devuelve la cantidad de productos de un tipo"""
+        return len(self._nombres.get(tipo, ()))
+
+
+class IndiceNormalizado(Indice):
+    """
+    Índice {clave normalizada: nombre} para búsquedas sin distinguir tildes
+    ni mayúsculas (ver normalizar_clave). La clave se calcula una sola vez por
+    producto al agregarlo, no en cada búsqueda.
+    Solo guarda los nombres cuya clave es distinta del nombre ("limón" ->
+    'limon'); los demás (la mayoría) son su propia clave y se buscan
+    directamente en el inventario, sin ocupar memoria acá.
+    """
+
+    campos = ()  # Depende solo del nombre
+
+    def __init__(self):
+        self._nombres = {}
+
+    def agregar(self, nombre, producto):
+        clave = normalizar_clave(nombre)
+        if clave != nombre:
+            # Si ya hay un nombre con la misma clave (datos anteriores al índice) se conserva el primero
+            self._nombres.setdefault(clave, nombre)
+
+    def quitar(self, nombre, producto):
+        clave = normalizar_clave(nombre)
+        if clave != nombre and self._nombres.get(clave) == nombre:
+            del self._nombres[clave]
+
+    def limpiar(self):
+        self._nombres.clear()
+
+    def buscar(self, nombre):
+        """
+        Devuelve el nombre guardado equivalente cuya clave difiere del nombre
+
+        Args:
+            nombre (str): Nombre a buscar
+
+        Returns:
+            str|None: Nombre tal como está guardado, o None si el índice no tiene
+                      ninguno equivalente (el nombre igual a la clave se busca aparte)
+        """
+        return self._nombres.get(normalizar_clave(nombre))
+
+
+class IndicePrecio(Indice):
+    """
+    Índice ordenado por precio: pares (precio, nombre) repartidos en bloques
+    ordenados de a lo sumo 2 * TAMANO_BLOQUE elementos, mantenidos con bisect.
+    Insertar solo desplaza los elementos de un bloque (no los de toda la lista),
+    así cargar un millón de productos sigue siendo rápido. Las consultas por
+    rango y los N más baratos cuestan O(log n + k).
+    Los empates de precio se ordenan por nombre (igual que ORDER BY precio, nombre).
+    """
+
+    campos = ('precio',)
+    TAMANO_BLOQUE = 512
+
+    def __init__(self):
+        self._bloques = []   # Listas ordenadas de (precio, nombre), consecutivas entre sí
+        self._maximos = []   # Último par de cada bloque, para ubicar el bloque con bisect
+
+    def agregar(self, nombre, producto):
+        par = (producto.precio, nombre)
+        if not self._bloques:
+            self._bloques.append([par])
+            self._maximos.append(par)
+            return
+        i = bisect_left(self._maximos, par)
+        if i == len(self._bloques):
+            i -= 1  # Mayor que todos: va al final del último bloque
+        bloque = self._bloques[i]
+        insort(bloque, par)
+        self._maximos[i] = bloque[-1]
+        if len(bloque) > 2 * self.TAMANO_BLOQUE:
+            # Bloque demasiado grande: se parte en dos mitades
+            mitad = self.TAMANO_BLOQUE
+            self._bloques[i:i + 1] = [bloque[:mitad], bloque[mitad:]]
+            self._maximos[i:i + 1] = [bloque[mitad - 1], bloque[-1]]
+
+    def quitar(self, nombre, producto):
+        par = (producto.precio, nombre)
+        i = bisect_left(self._maximos, par)
+        if i == len(self._bloques):
+            return
+        bloque = self._bloques[i]
+        posicion = bisect_left(bloque, par)
+        if posicion < len(bloque) and bloque[posicion] == par:
+            del bloque[posicion]
+            if bloque:
+                self._maximos[i] = bloque[-1]
+            else:
+                del self._bloques[i]
+                del self._maximos[i]
+
+    def limpiar(self):
+        self._bloques.clear()
+        self._maximos.clear()
+
+    def _recorrer_desde(self, minimo=None):
+        """Recorre los pares (precio, nombre) en orden, empezando por el primero con precio >= minimo"""
+        i, posicion = 0, 0
+        if minimo is not None:
+            i = bisect_left(self._maximos, minimo, key=_precio_de)
+            if i < len(self._bloques):
+                posicion = bisect_left(self._bloques[i], minimo, key=_precio_de)
+        for bloque in islice(self._bloques, i, None):
+            yield from islice(bloque, posicion, None)
+            posicion = 0
+
+    def buscar_rango(self, minimo=None, maximo=None):
+        """
+        Devuelve los nombres con minimo <= precio <= maximo, ordenados por precio
+
+        Args:
+            minimo (float): Precio mínimo incluido (None = sin límite inferior)
+            maximo (float): Precio máximo incluido (None = sin límite superior)
+
+        Returns:
+            list: Nombres ordenados por (precio, nombre)
+        """
+        nombres = []
+        for precio, nombre in self._recorrer_desde(minimo):
+            if maximo is not None and precio > maximo:
+                break
+            nombres.append(nombre)
+        return nombres
+
+    def mas_baratos(self, cantidad):
+        """
+        Devuelve los nombres de los `cantidad` productos más baratos
+
+        Args:
+            cantidad (int): Cantidad máxima de productos
+
+        Returns:
+            list: Nombres ordenados por (precio, nombre)
+        """
+        return [nombre for _, nombre in islice(self._recorrer_desde(), max(cantidad, 0))]
+
+
+class _NodoPrefijo:
+    """
+    Nodo interno del árbol de prefijos: `etiqueta` es el tramo de texto de la
+    arista que llega al nodo. Las hojas no son nodos: en `hijos` se guarda
+    directamente su etiqueta (un str), que es lo que más abunda en el árbol
+    """
+
+    __slots__ = ('etiqueta', 'hijos', 'fin')
+
+    def __init__(self, etiqueta, hijos=None, fin=False):
+        self.etiqueta = etiqueta
+        self.hijos = hijos  # {primera letra de la etiqueta del hijo: nodo o hoja (str)}
+        self.fin = fin      # True si un nombre termina en este nodo
+
+
+def _etiqueta(hijo):
+    """Etiqueta de la arista que llega a un hijo (nodo u hoja)"""
+    return hijo if type(hijo) is str else hijo.etiqueta
+
+
+def _largo_prefijo_comun(a, b):
+    """Devuelve la cantidad de caracteres iniciales que comparten a y b"""
+    largo = min(len(a), len(b))
+    i = 0
+    while i < largo and a[i] == b[i]:
+        i += 1
+    return i
+
+
+class IndicePrefijos(Indice):
+    """
+    Árbol de prefijos comprimido (radix trie) sobre los nombres de producto.
+    Cada arista guarda un tramo de texto en lugar de una sola letra, así la
+    cantidad de nodos es a lo sumo el doble de la cantidad de nombres, y las
+    hojas (la mitad o más) se guardan como su etiqueta sola, sin nodo.
+    Se mantiene al día en cada alta y baja; buscar por prefijo cuesta
+    O(largo del prefijo + resultados).
+    """
+
+    campos = ()  # Depende solo del nombre: actualizar precio o stock no lo toca
+
+    def __init__(self):
+        self._raiz = _NodoPrefijo('')
+
+    def agregar(self, nombre, producto):
+        nodo, resto = self._raiz, nombre
+        while resto:
+            hijos = nodo.hijos
+            hijo = hijos.get(resto[0]) if hijos else None
+            if hijo is None:
+                if hijos is None:
+                    nodo.hijos = hijos = {}
+                hijos[resto[0]] = resto  # Nueva hoja
+                return
+            etiqueta = _etiqueta(hijo)
+            comun = _largo_prefijo_comun(etiqueta, resto)
+            if comun < len(etiqueta):
+                # El nombre se separa a mitad de la arista: se parte en un nodo intermedio
+                cola = etiqueta[comun:]
+                if type(hijo) is str:
+                    hijo = cola
+                else:
+                    hijo.etiqueta = cola
+                hijo = hijos[resto[0]] = _NodoPrefijo(etiqueta[:comun], hijos={cola[0]: hijo})
+            elif type(hijo) is str:
+                if comun == len(resto):
+                    return  # Ya estaba
+                # Un nombre más largo sigue después de la hoja: pasa a ser nodo
+                hijo = hijos[resto[0]] = _NodoPrefijo(etiqueta, fin=True)
+            nodo, resto = hijo, resto[comun:]
+        nodo.fin = True
+
+    def quitar(self, nombre, producto):
+        camino = []  # Pares (padre, hijo) desde la raíz
+        nodo, resto = self._raiz, nombre
+        while resto:
+            hijo = nodo.hijos.get(resto[0]) if nodo.hijos else None
+            if hijo is None:
+                return
+            etiqueta = _etiqueta(hijo)
+            if not resto.startswith(etiqueta):
+                return
+            camino.append((nodo, hijo))
+            resto = resto[len(etiqueta):]
+            if type(hijo) is str:
+                if resto:
+                    return  # La hoja termina antes que el nombre
+                break
+            nodo = hijo
+        if not camino:
+            return
+
+        padre, hijo = camino[-1]
+        if type(hijo) is str:
+            del padre.hijos[hijo[0]]
+            if not padre.hijos:
+                padre.hijos = None
+            # El padre perdió un hijo: puede quedar como hoja o para fusionar
+            self._compactar(camino[-2][0] if len(camino) > 1 else None, padre)
+        elif hijo.fin:
+            hijo.fin = False
+            self._compactar(padre, hijo)
+
+    @staticmethod
+    def _compactar(padre, nodo):
+        """Convierte en hoja un nodo sin hijos, o fusiona con su hijo un nodo intermedio que tiene uno solo"""
+        if padre is None:
+            return  # La raíz queda siempre
+        clave = nodo.etiqueta[0]
+        if not nodo.hijos:
+            if nodo.fin:
+                padre.hijos[clave] = nodo.etiqueta
+            else:
+                del padre.hijos[clave]
+        elif not nodo.fin and len(nodo.hijos) == 1:
+            (unico,) = nodo.hijos.values()
+            if type(unico) is str:
+                padre.hijos[clave] = nodo.etiqueta + unico
+            else:
+                unico.etiqueta = nodo.etiqueta + unico.etiqueta
+                padre.hijos[clave] = unico
+
+    def limpiar(self):
+        self._raiz = _NodoPrefijo('')
+
+    def buscar(self, prefijo, limite=None):
+        """
+        Devuelve los nombres que empiezan con un prefijo, en orden alfabético
+
+        Args:
+            prefijo (str): Comienzo del nombre (ya normalizado en minúsculas)
+            limite (int): Cantidad máxima de nombres (None = todos)
+
+        Returns:
+            list: Nombres que empiezan con el prefijo
+        """
+        nodo, resto, recorrido = self._raiz, prefijo, ''
+        while resto:
+            hijo = nodo.hijos.get(resto[0]) if type(nodo) is not str and nodo.hijos else None
+            if hijo is None:
+                return []
+            etiqueta = _etiqueta(hijo)
+            if resto.startswith(etiqueta):
+                resto = resto[len(etiqueta):]
+            elif etiqueta.startswith(resto):
+                resto = ''
+            else:
+                return []
+            recorrido += etiqueta
+            nodo = hijo
+
+        # Recorrido en profundidad con los hijos ordenados: los nombres salen en orden alfabético
+        nombres = []
+        pendientes = [(recorrido, nodo)]
+        while pendientes:
+            texto, nodo = pendientes.pop()
+            hoja = type(nodo) is str
+            if hoja or nodo.fin:
+                nombres.append(texto)
+                if limite is not None and len(nombres) >= limite:
+                    break
+            if not hoja and nodo.hijos:
+                for clave in sorted(nodo.hijos, reverse=True):
+                    hijo = nodo.hijos[clave]
+                    pendientes.append((texto + _etiqueta(hijo), hijo))
+        return nombres
+
+
+class IndiceTrigramas(Indice):
+    """
+    Índice invertido {trigrama: nombres} para búsquedas aproximadas ("¿quiso decir?").
+    Los candidatos salen de las listas de los trigramas de la consulta, empezando
+    por las más cortas; las listas de trigramas muy frecuentes (más de
+    LIMITE_FRECUENTES nombres) no se recorren enteras, así nunca se escanea todo
+    el catálogo. Los candidatos con más trigramas en común se ordenan por similitud.
+    """
+
+    campos = ()  # Depende solo del nombre
+    LIMITE_FRECUENTES = 10000
+    CANDIDATOS = 50  # Candidatos a los que se les calcula la similitud exacta
+
+    def __init__(self):
+        self._nombres = {}
+
+    def agregar(self, nombre, producto):
+        for trigrama in trigramas(nombre):
+            self._nombres.setdefault(trigrama, set()).add(nombre)
+
+    def quitar(self, nombre, producto):
+        for trigrama in trigramas(nombre):
+            nombres = self._nombres.get(trigrama)
+            if nombres is not None:
+                nombres.discard(nombre)
+                if not nombres:
+                    del self._nombres[trigrama]
+
+    def limpiar(self):
+        self._nombres.clear()
+
+    def buscar_similares(self, texto, cantidad=5, umbral=UMBRAL_SIMILITUD):
+        """
+        Devuelve los nombres más parecidos a un texto
+
+        Args:
+            texto (str): Nombre buscado (puede tener errores de tipeo)
+            cantidad (int): Cantidad máxima de nombres
+            umbral (float): Similitud mínima para incluir un nombre
+
+        Returns:
+            list: Pares (nombre, similitud) de mayor a menor similitud
+        """
+        consulta = trigramas(texto)
+        listas = sorted((self._nombres[t] for t in consulta if t in self._nombres), key=len)
+
+        coincidencias = Counter()
+        for nombres in listas:
+            if len(nombres) > self.LIMITE_FRECUENTES:
+                if coincidencias:
+                    break  # Ya hay candidatos de trigramas poco frecuentes
+                nombres = islice(nombres, self.LIMITE_FRECUENTES)
+            coincidencias.update(nombres)
+
+        resultados = []
+        for nombre, _ in coincidencias.most_common(self.CANDIDATOS):
+            valor = similitud(consulta, trigramas(nombre))
+            if valor >= umbral:
+                resultados.append((nombre, valor))
+        resultados.sort(key=lambda resultado: (-resultado[1], resultado[0]))
+        return resultados[:cantidad]
@@ -0,0 +1,247 @@
+"""
+Módulo con la estructura compacta del inventario en memoria.
+
+Cada producto se guarda en un registro con __slots__ (sin diccionario por
+instancia ni claves repetidas) y el tipo se interna, así todos los productos
+comparten el mismo objeto 'fruta' o 'verdura'. Los registros se pueden leer
+como diccionarios (producto['precio']) para mantener compatibilidad con el
+código que usaba {"tipo", "precio", "stock"}.
+
+El inventario mantiene índices secundarios (ver indices.py) sincronizados con
+cada alta, modificación y baja, para que las consultas filtradas cuesten
+O(coincidencias) y no O(catálogo). El índice de trigramas solo lo usan las
+búsquedas aproximadas y ocupa varias veces más que los productos mismos: se
+arma recién con la primera consulta que lo necesita (y desde ahí se mantiene
+al día).
+"""
+
+import sys
+from collections.abc import MutableMapping
+
+from productos.indices import IndiceNormalizado, IndicePrecio, IndicePrefijos, IndiceTipo, IndiceTrigramas
+from productos.validaciones import normalizar_clave
+
+CAMPOS_PRODUCTO = ('tipo', 'precio', 'stock')
+
+
+class Producto:
+    """Registro compacto de un producto (tipo, precio, stock)"""
+
+    __slots__ = CAMPOS_PRODUCTO
+
+    def __init__(self, tipo, precio, stock):
+        self.tipo = sys.intern(tipo)
+        self.precio = precio
+        self.stock = stock
+
+    def __getitem__(self, campo):
+        """Permite leer el registro como un diccionario: producto['precio']"""
+        if campo not in CAMPOS_PRODUCTO:
+            raise KeyError(campo)
+        return getattr(self, campo)
+
+    def __eq__(self, otro):
+        if isinstance(otro, Producto):
+            return (self.tipo, self.precio, self.stock) == (otro.tipo, otro.precio, otro.stock)
+        if isinstance(otro, dict):
+            return self.a_diccionario() == otro
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Producto(tipo={self.tipo!r}, precio={self.precio!r}, stock={self.stock!r})"
+
+    def a_diccionario(self):
+        """Devuelve el producto como {"tipo", "precio", "stock"}"""
+        return {"tipo": self.tipo, "precio": self.precio, "stock": self.stock}
+
+
+class InventarioMemoria(MutableMapping):
+    """
+    Inventario en memoria {nombre: Producto}.
+    Acepta asignar diccionarios {"tipo", "precio", "stock"}, que se convierten a Producto.
+    Los cambios de precio/stock se hacen con actualizar(), que mantiene los índices al día.
+    """
+
+    INDICES_BAJO_DEMANDA = ('por_trigramas',)  # Ver _indice_bajo_demanda()
+
+    def __init__(self):
+        self._productos = {}
+        self.por_tipo = IndiceTipo()
+        self.por_precio = IndicePrecio()
+        self.por_clave = IndiceNormalizado()
+        self.por_prefijo = IndicePrefijos()
+        self.por_trigramas = None
+        self._indices = [self.por_tipo, self.por_precio, self.por_clave, self.por_prefijo]
+
+    def __getitem__(self, nombre):
+        return self._productos[nombre]
+
+    def __setitem__(self, nombre, producto):
+        if not isinstance(producto, Producto):
+            producto = Producto(producto["tipo"], producto["precio"], producto["stock"])
+        anterior = self._productos.get(nombre)
+        for indice in self._indices:
+            if anterior is not None:
+                indice.quitar(nombre, anterior)
+            indice.agregar(nombre, producto)
+        self._productos[nombre] = producto
+
+    def __delitem__(self, nombre):
+        producto = self._productos.pop(nombre)
+        for indice in self._indices:
+            indice.quitar(nombre, producto)
+
+    def __contains__(self, nombre):
+        return nombre in self._productos
+
+    def __iter__(self):
+        return iter(self._productos)
+
+    def __len__(self):
+        return len(self._productos)
+
+    def __repr__(self):
+        return f"InventarioMemoria({self._productos!r})"
+
+    # Vistas y limpieza directas sobre el diccionario interno (evitan el camino genérico de MutableMapping)
+    def keys(self):
+        return self._productos.keys()
+
+    def values(self):
+        return self._productos.values()
+
+    def items(self):
+        return self._productos.items()
+
+    def clear(self):
+        self._productos.clear()
+        for indice in self._indices:
+            indice.limpiar()
+        # Los índices bajo demanda se descartan: se vuelven a armar si se usan
+        for atributo in self.INDICES_BAJO_DEMANDA:
+            indice = getattr(self, atributo)
+            if indice is not None:
+                self._indices.remove(indice)
+                setattr(self, atributo, None)
+
+    def _indice_bajo_demanda(self, atributo, clase):
+        """
+        Devuelve un índice que se arma recién la primera vez que se consulta
+
+        Args:
+            atributo (str): Atributo del inventario donde se guarda el índice
+            clase (type): Clase del índice
+
+        Returns:
+            Indice: El índice, ya cargado con todos los productos
+        """
+        indice = getattr(self, atributo)
+        if indice is None:
+            indice = clase()
+            for nombre, producto in self._productos.items():
+                indice.agregar(nombre, producto)
+            setattr(self, atributo, indice)
+            self._indices.append(indice)  # Desde ahora sigue las altas, modificaciones y bajas
+        return indice
+
+    def actualizar(self, nombre, campo, valor):
+        """
+        Cambia el precio o el stock de un producto existente
+
+        Args:
+            nombre (str): Nombre del producto
+            campo (str): 'precio' o 'stock'
+            valor (float|int): Nuevo valor
+        """
+        producto = self._productos[nombre]
+        # Solo se reubica el producto en los índices que dependen del campo modificado
+        afectados = [indice for indice in self._indices if campo in indice.campos]
+        for indice in afectados:
+            indice.quitar(nombre, producto)
+        setattr(producto, campo, valor)
+        for indice in afectados:
+            indice.agregar(nombre, producto)
+
+    def filtrar_por_tipo(self, tipo):
+        """
+        Recorre solo los productos de un tipo usando el índice por tipo
+
+        Args:
+            tipo (str): Tipo del producto ('fruta' o 'verdura')
+
+        Returns:
+            generator: Pares (nombre, Producto) en orden de alta
+        """
+        productos = self._productos
+        return ((nombre, productos[nombre]) for nombre in self.por_tipo.buscar(tipo))
+
+    def filtrar_por_precio(self, minimo=None, maximo=None):
+        """
+        Recorre los productos con precio entre minimo y maximo usando el índice por precio
+
+        Args:
+            minimo (float): Precio mínimo incluido (None = sin límite inferior)
+            maximo (float): Precio máximo incluido (None = sin límite superior)
+
+        Returns:
+            generator: Pares (nombre, Producto) ordenados por precio
+        """
+        productos = self._productos
+        return ((nombre, productos[nombre]) for nombre in self.por_precio.buscar_rango(minimo, maximo))
+
+    def mas_baratos(self, cantidad):
+        """
+        Devuelve los productos más baratos usando el índice por precio
+
+        Args:
+            cantidad (int): Cantidad máxima de productos
+
+        Returns:
+            generator: Pares (nombre, Producto) ordenados por precio
+        """
+        productos = self._productos
+        return ((nombre, productos[nombre]) for nombre in self.por_precio.mas_baratos(cantidad))
+
+    def buscar_por_prefijo(self, prefijo, limite=None):
+        """
+        Devuelve los nombres que empiezan con un prefijo usando el árbol de prefijos
+
+        Args:
+            prefijo (str): Comienzo del nombre
+            limite (int): Cantidad máxima de nombres (None = todos)
+
+        Returns:
+            list: Nombres en orden alfabético
+        """
+        return self.por_prefijo.buscar(prefijo, limite)
+
+    def resolver_nombre(self, nombre):
+        """
+        Busca un producto sin distinguir tildes ni mayúsculas ("limon" encuentra "limón")
+
+        Args:
+            nombre (str): Nombre a buscar
+
+        Returns:
+            str|None: Nombre tal como está guardado, o None si no existe
+        """
+        if nombre in self._productos:
+            return nombre
+        clave = normalizar_clave(nombre)
+        if clave in self._productos:
+            return clave  # Nombre guardado sin tildes ni mayúsculas: no está en el índice
+        return self.por_clave.buscar(clave)
+
+    def buscar_similares(self, texto, cantidad=5):
+        """
+        Devuelve los nombres más parecidos a un texto usando el índice de trigramas
+        (la primera llamada lo arma recorriendo el catálogo)
+
+        Args:
+            texto (str): Nombre buscado (puede tener errores de tipeo)
+            cantidad (int): Cantidad máxima de nombres
+
+        Returns:
+            list: Pares (nombre, similitud) de mayor a menor similitud
+        """
+        return self._indice_bajo_demanda('por_trigramas', IndiceTrigramas).buscar_similares(texto, cantidad)
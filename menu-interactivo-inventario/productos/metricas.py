@@ -0,0 +1,252 @@
+"""
+Módulo con las métricas del inventario en formato de texto de Prometheus.
+
+Registra:
+- inventario_operaciones_total{backend, operacion, resultado}: operaciones por
+  resultado ('ok', 'duplicado', 'no_encontrado', 'cancelado', ...), con las
+  mismas etiquetas desde el menú, la CLI y la importación
+- inventario_operacion_duracion_segundos{backend, operacion}: histograma de
+  latencia de las funciones core (sin el tiempo que el usuario tarda en escribir)
+- inventario_errores_bd_total{tipo}: errores de MySQL ('conexion' o 'consulta')
+- inventario_productos{backend}: tamaño del catálogo
+
+Las métricas están desactivadas por defecto: cada punto de registro solo
+consulta `metricas.activo` y vuelve. Se activan con activar_metricas(), que
+opcionalmente expone /metrics en un puerto HTTP local (METRICAS_PUERTO).
+"""
+
+import inspect
+import threading
+import time
+from functools import wraps
+
+# Límites (en segundos) de las cubetas del histograma de latencia
+CUBETAS_LATENCIA = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Nombre -> (tipo, ayuda) de cada métrica
+_DEFINICIONES = {
+    'inventario_operaciones_total': ('counter', 'Operaciones de altas, cambios y bajas por resultado'),
+    'inventario_operacion_duracion_segundos': ('histogram', 'Latencia de las operaciones core del inventario'),
+    'inventario_errores_bd_total': ('counter', 'Errores de la base de datos MySQL'),
+    'inventario_productos': ('gauge', 'Productos en el catálogo'),
+}
+
+
+def _formatear_etiquetas(etiquetas, extra=()):
+    """Convierte (('backend', 'bd'), ...) en {backend="bd",...}"""
+    pares = tuple(etiquetas) + tuple(extra)
+    if not pares:
+        return ''
+    texto = ','.join(f'{clave}="{_escapar(valor)}"' for clave, valor in pares)
+    return '{' + texto + '}'
+
+
+def _escapar(valor):
+    """Escapa barras, comillas y saltos de línea en el valor de una etiqueta"""
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class _Histograma:
+    """Histograma acumulativo con cubetas fijas (formato de Prometheus)"""
+
+    __slots__ = ('cuentas', 'suma', 'cantidad')
+
+    def __init__(self):
+        self.cuentas = [0] * len(CUBETAS_LATENCIA)
+        self.suma = 0.0
+        self.cantidad = 0
+
+    def observar(self, valor):
+        self.suma += valor
+        self.cantidad += 1
+        for indice, limite in enumerate(CUBETAS_LATENCIA):
+            if valor <= limite:
+                self.cuentas[indice] += 1
+                break
+
+
+class RegistroMetricas:
+    """Contadores, medidores e histogramas con etiquetas (thread-safe)"""
+
+    def __init__(self):
+        self.activo = False
+        self._valores = {}  # (nombre, etiquetas) -> número o _Histograma
+        self._candado = threading.Lock()
+
+    def incrementar(self, nombre, etiquetas=(), cantidad=1):
+        """
+        Suma al contador `nombre` con esas etiquetas
+
+        Args:
+            nombre (str): Nombre de la métrica
+            etiquetas (tuple): Pares (clave, valor)
+            cantidad (int): Valor a sumar
+        """
+        if not self.activo:
+            return
+        clave = (nombre, tuple(etiquetas))
+        with self._candado:
+            self._valores[clave] = self._valores.get(clave, 0) + cantidad
+
+    def fijar(self, nombre, etiquetas, valor):
+        """Fija el valor del medidor `nombre` con esas etiquetas"""
+        if not self.activo:
+            return
+        with self._candado:
+            self._valores[(nombre, tuple(etiquetas))] = valor
+
+    def observar(self, nombre, etiquetas, valor):
+        """Agrega una muestra al histograma `nombre` con esas etiquetas"""
+        if not self.activo:
+            return
+        clave = (nombre, tuple(etiquetas))
+        with self._candado:
+            histograma = self._valores.get(clave)
+            if histograma is None:
+                histograma = self._valores[clave] = _Histograma()
+            histograma.observar(valor)
+
+    def obtener(self, nombre, etiquetas=()):
+        """Devuelve el valor actual de un contador o medidor (0 si no se registró)"""
+        with self._candado:
+            return self._valores.get((nombre, tuple(etiquetas)), 0)
+
+    def limpiar(self):
+        """Descarta todos los valores registrados"""
+        with self._candado:
+            self._valores.clear()
+
+    def exponer(self):
+        """
+        Devuelve todas las métricas en el formato de texto de Prometheus (versión 0.0.4)
+
+        Returns:
+            str: Texto listo para servir en /metrics
+        """
+        with self._candado:
+            valores = sorted(self._valores.items(), key=lambda item: item[0])
+            lineas = []
+            nombre_anterior = None
+            for (nombre, etiquetas), valor in valores:
+                if nombre != nombre_anterior:
+                    tipo, ayuda = _DEFINICIONES.get(nombre, ('untyped', nombre))
+                    lineas.append(f'# HELP {nombre} {ayuda}')
+                    lineas.append(f'# TYPE {nombre} {tipo}')
+                    nombre_anterior = nombre
+                if isinstance(valor, _Histograma):
+                    acumulado = 0
+                    for limite, cuenta in zip(CUBETAS_LATENCIA, valor.cuentas):
+                        acumulado += cuenta
+                        lineas.append(f'{nombre}_bucket{_formatear_etiquetas(etiquetas, [("le", limite)])} {acumulado}')
+                    lineas.append(f'{nombre}_bucket{_formatear_etiquetas(etiquetas, [("le", "+Inf")])} {valor.cantidad}')
+                    lineas.append(f'{nombre}_sum{_formatear_etiquetas(etiquetas)} {valor.suma}')
+                    lineas.append(f'{nombre}_count{_formatear_etiquetas(etiquetas)} {valor.cantidad}')
+                else:
+                    lineas.append(f'{nombre}{_formatear_etiquetas(etiquetas)} {valor}')
+        return '\n'.join(lineas) + '\n'
+
+
+metricas = RegistroMetricas()  # Registro global del proceso
+
+
+def instrumentar(backend, operacion):
+    """
+    Decorador que mide la latencia de una función core del inventario.
+    En un generador se observa una vez por recorrido: suma el tiempo de cada
+    paso dentro del generador, sin el que tarda quien lo consume (ej. imprimir)
+
+    Args:
+        backend (str): Etiqueta del backend ('diccionario', 'bd', 'sqlite')
+        operacion (str): Etiqueta de la operación ('agregar', 'actualizar', ...)
+    """
+    etiquetas = (('backend', backend), ('operacion', operacion))
+
+    def decorador(funcion):
+        if inspect.isgeneratorfunction(funcion):
+            return _instrumentar_generador(funcion, etiquetas)
+
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not metricas.activo:
+                return funcion(*args, **kwargs)
+            inicio = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                metricas.observar('inventario_operacion_duracion_segundos', etiquetas, time.perf_counter() - inicio)
+        return envoltura
+    return decorador
+
+
+def _instrumentar_generador(funcion, etiquetas):
+    """Versión de instrumentar() para generadores (ver instrumentar)"""
+    @wraps(funcion)
+    def envoltura(*args, **kwargs):
+        if not metricas.activo:
+            return (yield from funcion(*args, **kwargs))
+        generador = funcion(*args, **kwargs)
+        duracion = 0.0
+        try:
+            while True:
+                inicio = time.perf_counter()
+                try:
+                    valor = next(generador)
+                except StopIteration as fin:
+                    return fin.value
+                finally:
+                    duracion += time.perf_counter() - inicio
+                yield valor
+        finally:
+            # También si el consumidor corta el recorrido antes de terminar
+            generador.close()
+            metricas.observar('inventario_operacion_duracion_segundos', etiquetas, duracion)
+    return envoltura
+
+
+def iniciar_servidor_metricas(puerto, direccion='127.0.0.1'):
+    """
+    Sirve /metrics en un hilo de fondo
+
+    Args:
+        puerto (int): Puerto HTTP (0 = elegir uno libre)
+        direccion (str): Dirección donde escuchar (por defecto solo local)
+
+    Returns:
+        ThreadingHTTPServer: Servidor en marcha (server_address tiene el puerto real)
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class ManejadorMetricas(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            cuerpo = metricas.exponer().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(cuerpo)))
+            self.end_headers()
+            self.wfile.write(cuerpo)
+
+        def log_message(self, formato, *args):
+            pass  # Sin una línea por cada scrape en la consola del menú
+
+    servidor = ThreadingHTTPServer((direccion, puerto), ManejadorMetricas)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+def activar_metricas(puerto=None):
+    """
+    Activa el registro de métricas y, si se indica un puerto, el endpoint HTTP
+
+    Args:
+        puerto (int): Puerto de /metrics (None = solo registrar, sin servidor)
+
+    Returns:
+        ThreadingHTTPServer|None: Servidor iniciado, si se pidió
+    """
+    metricas.activo = True
+    if puerto is None:
+        return None
+    return iniciar_servidor_metricas(puerto)
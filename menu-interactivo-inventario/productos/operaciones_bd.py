@@ -1,7 +1,80 @@
 # Funciones para agregar, mostrar, actualizar y eliminar productos del inventario usando base de datos MySQL
-from productos.validaciones import validar_nombre, validar_tipo, validar_precio, validar_stock
+from itertools import islice
+from mysql.connector import Error, errorcode
+from productos.validaciones import validar_nombre, validar_tipo, validar_precio, validar_stock, normalizar_clave
+from productos.autocompletado import autocompletar_nombres
+from productos.database import CONSULTA_INSERTAR_TRIGRAMAS
+from productos.indices import IndiceTrigramas, UMBRAL_SIMILITUD, similitud, trigramas
+from productos.metricas import instrumentar
+
+TAMANO_LOTE = 1000  # Filas por sentencia/commit en las operaciones por lotes
+TAMANO_PAGINA = 100  # Filas por página al recorrer el catálogo
+
+# Columnas de los listados (fechas ya formateadas para mostrar)
+_COLUMNAS_LISTADO = """
+    SELECT id, nombre, tipo, precio, stock, 
+           DATE_FORMAT(fecha_creacion, '%d/%m/%Y %H:%i') as fecha_creacion,
+           DATE_FORMAT(fecha_actualizacion, '%d/%m/%Y %H:%i') as fecha_actualizacion
+    FROM productos 
+"""
+
+
+def _dividir_en_lotes(elementos, tamano):
+    """Recorre cualquier iterable entregando listas de a lo sumo `tamano` elementos"""
+    iterador = iter(elementos)
+    while True:
+        lote = list(islice(iterador, tamano))
+        if not lote:
+            return
+        yield lote
+
+
+def _invalidar_cache(bd_conexion, nombre=None):
+    """
+    Descarta de la caché de lecturas lo que pudo cambiar por una escritura
 
+    Args:
+        bd_conexion (DatabaseConnection): Conexión ya establecida
+        nombre (str): Producto modificado (None = vaciar toda la caché)
+    """
+    cache = getattr(bd_conexion, 'cache', None)
+    if cache is None:
+        return
+    if nombre is None:
+        cache.limpiar()
+    else:
+        cache.invalidar_nombre(normalizar_clave(nombre))
+
+
+def _indexar_trigramas(bd_conexion, productos_id):
+    """
+    Agrega a productos_trigramas los trigramas de productos recién insertados
+    (dentro de la transacción del llamador, si la hay)
 
+    Args:
+        bd_conexion (DatabaseConnection): Conexión ya establecida
+        productos_id (iterable): Pares (id, nombre)
+    """
+    filas = [(trigrama, id_producto) for id_producto, nombre in productos_id for trigrama in trigramas(nombre)]
+    if filas:
+        bd_conexion.ejecutar_lote(CONSULTA_INSERTAR_TRIGRAMAS, filas)
+
+
+def _indexar_trigramas_por_nombre(bd_conexion, nombres):
+    """
+    Igual que _indexar_trigramas, buscando primero el id de cada nombre.
+    Si la búsqueda falla, el error se propaga (no se indexa en silencio a medias)
+    """
+    if not nombres:
+        return
+    marcadores = ", ".join(["%s"] * len(nombres))
+    filas = bd_conexion.iterar_consulta(
+        f"SELECT id, nombre FROM productos WHERE nombre IN ({marcadores})", tuple(nombres)
+    )
+    _indexar_trigramas(bd_conexion, [(fila['id'], fila['nombre']) for fila in filas])
+
+
+@instrumentar('bd', 'agregar')
 def agregar_producto_bd(nombre, tipo, precio, stock, bd_conexion):
     """
     Agrega un producto usando UNIQUE constraint para evitar duplicados (thread-safe).
@@ -24,14 +97,20 @@ def agregar_producto_bd(nombre, tipo, precio, stock, bd_conexion):
             VALUES (%s, %s, %s, %s)
         """
 
-        exito = bd_conexion.ejecutar_consulta(
-            consulta_insertar,
-            (nombre, tipo, precio, stock)
-        )
+        # El producto y sus trigramas se guardan en la misma transacción
+        with bd_conexion.transaccion():
+            exito = bd_conexion.ejecutar_consulta(
+                consulta_insertar,
+                (nombre, tipo, precio, stock),
+                preparada=True
+            )
+            filas_afectadas = bd_conexion.filas_afectadas if exito else 0
+            if filas_afectadas > 0:
+                _indexar_trigramas(bd_conexion, [(bd_conexion.ultimo_id, nombre)])
         
         if exito:
-            filas_afectadas = bd_conexion.cursor.rowcount
             if filas_afectadas > 0:
+                _invalidar_cache(bd_conexion, nombre)
                 print(f"✅ Producto '{nombre}' agregado exitosamente a la base de datos")
                 return True
             else:
@@ -47,39 +126,371 @@ def agregar_producto_bd(nombre, tipo, precio, stock, bd_conexion):
         else:
             print(f"❌ Error inesperado al insertar producto: {e}")
         return False
-    
+
+
+def agregar_productos_bd_lote(productos, bd_conexion, tamano_lote=TAMANO_LOTE):
+    """
+    Agrega muchos productos enviándolos en INSERT multi-fila, con un commit por lote.
+    Los duplicados se informan fila por fila sin abortar el resto de la carga.
+
+    Args:
+        productos (iterable): Tuplas (nombre, tipo, precio, stock) ya validadas
+        bd_conexion (DatabaseConnection): Conexión ya establecida
+        tamano_lote (int): Cantidad de filas por sentencia/commit
+
+    Returns:
+        tuple: (insertados, duplicados) con la cantidad de filas agregadas y
+               la lista de nombres que ya existían
+    """
+    consulta_insertar = """
+        INSERT INTO productos (nombre, tipo, precio, stock)
+        VALUES (%s, %s, %s, %s)
+    """
+    insertados = 0
+    duplicados = []
+
+    for lote in _dividir_en_lotes(productos, tamano_lote):
+        # Repetidos dentro del mismo lote (sin importar tildes, como el UNIQUE
+        # con utf8mb4_unicode_ci): se quedan con la primera aparición
+        vistos = set()
+        filas = []
+        for fila in lote:
+            clave = normalizar_clave(fila[0])
+            if clave in vistos:
+                duplicados.append(fila[0])
+            else:
+                vistos.add(clave)
+                filas.append(tuple(fila))
+
+        try:
+            with bd_conexion.transaccion():
+                agregados_lote = bd_conexion.ejecutar_lote(consulta_insertar, filas)
+                _indexar_trigramas_por_nombre(bd_conexion, [fila[0] for fila in filas])
+            insertados += agregados_lote
+            continue
+        except Error as e:
+            if e.errno != errorcode.ER_DUP_ENTRY:
+                print(f"❌ Error insertando lote de productos: {e}")
+                _invalidar_cache(bd_conexion)
+                return (insertados, duplicados)
+
+        # El lote tenía algún duplicado: se reintenta fila por fila para
+        # identificarlos, manteniendo un único commit para todo el lote
+        nuevos_lote = []
+        duplicados_lote = []
+        try:
+            with bd_conexion.transaccion():
+                for fila in filas:
+                    try:
+                        bd_conexion.cursor.execute(consulta_insertar, fila)
+                        nuevos_lote.append((bd_conexion.cursor.lastrowid, fila[0]))
+                    except Error as e:
+                        if e.errno != errorcode.ER_DUP_ENTRY:
+                            raise
+                        duplicados_lote.append(fila[0])
+                _indexar_trigramas(bd_conexion, nuevos_lote)
+            insertados += len(nuevos_lote)
+            duplicados.extend(duplicados_lote)
+        except Error as e:
+            print(f"❌ Error insertando lote de productos: {e}")
+            _invalidar_cache(bd_conexion)
+            return (insertados, duplicados)
+
+    if insertados:
+        _invalidar_cache(bd_conexion)
+    for nombre in duplicados:
+        print(f"❌ Error: El producto '{nombre}' ya existe en la base de datos")
+    print(f"✅ {insertados} productos agregados a la base de datos")
+    return (insertados, duplicados)
+
+
+def sincronizar_productos_bd(productos, bd_conexion, tamano_lote=TAMANO_LOTE):
+    """
+    Inserta los productos nuevos y actualiza precio/stock de los existentes
+    (upsert) usando el UNIQUE de nombre: una sola sentencia
+    INSERT ... ON DUPLICATE KEY UPDATE y un commit por lote.
+
+    Args:
+        productos (iterable): Tuplas (nombre, tipo, precio, stock) ya validadas
+        bd_conexion (DatabaseConnection): Conexión ya establecida
+        tamano_lote (int): Cantidad de filas por sentencia/commit
+
+    Returns:
+        tuple: (insertados, actualizados). Los productos existentes cuyo
+               precio y stock no cambiaron no cuentan como actualizados.
+    """
+    consulta_upsert = """
+        INSERT INTO productos (nombre, tipo, precio, stock)
+        VALUES (%s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE precio = VALUES(precio), stock = VALUES(stock)
+    """
+    insertados = 0
+    actualizados = 0
+
+    for lote in _dividir_en_lotes(productos, tamano_lote):
+        # Si un nombre se repite en el lote (sin importar tildes), gana la última aparición
+        filas = list({normalizar_clave(fila[0]): tuple(fila) for fila in lote}.values())
+        marcadores = ", ".join(["%s"] * len(filas))
+        try:
+            # Conteo y upsert en la misma transacción: un único commit por lote
+            with bd_conexion.transaccion():
+                # iterar_consulta propaga los errores: ejecutar_consulta devolvería []
+                # y todas las filas se contarían (y se indexarían) como nuevas
+                existentes = bd_conexion.iterar_consulta(
+                    f"SELECT nombre FROM productos WHERE nombre IN ({marcadores})",
+                    tuple(fila[0] for fila in filas)
+                )
+                claves_existentes = {normalizar_clave(fila['nombre']) for fila in existentes}
+                filas_afectadas = bd_conexion.ejecutar_lote(consulta_upsert, filas)
+                # Solo los productos nuevos necesitan trigramas (el upsert no cambia nombres)
+                nombres_nuevos = [fila[0] for fila in filas if normalizar_clave(fila[0]) not in claves_existentes]
+                _indexar_trigramas_por_nombre(bd_conexion, nombres_nuevos)
+        except Error as e:
+            print(f"❌ Error sincronizando lote de productos: {e}")
+            _invalidar_cache(bd_conexion)
+            return (insertados, actualizados)
+
+        # MySQL cuenta 1 fila afectada por inserción y 2 por actualización
+        nuevos = len(nombres_nuevos)
+        insertados += nuevos
+        actualizados += (filas_afectadas - nuevos) // 2
+
+    # El upsert puede tocar cualquier parte del catálogo: se vacía toda la caché
+    _invalidar_cache(bd_conexion)
+    print(f"✅ Sincronización completa: {insertados} productos nuevos, {actualizados} actualizados")
+    return (insertados, actualizados)
+
+
+def obtener_pagina_productos(bd_conexion, despues_de=None, limite=TAMANO_PAGINA):
+    """
+    Obtiene una página de productos ordenada por nombre usando paginación por
+    clave (keyset): WHERE nombre > ultimo_nombre, que recorre idx_nombre sin OFFSET.
+
+    Args:
+        bd_conexion (DatabaseConnection): Conexión ya establecida
+        despues_de (str): Último nombre de la página anterior (None para la primera)
+        limite (int): Cantidad máxima de productos de la página
+
+    Returns:
+        list: Productos de la página como diccionarios
+    """
+    cache = bd_conexion.obtener_cache()
+    clave_cache = ('pagina', despues_de, limite)
+    if cache is not None:
+        pagina = cache.obtener(clave_cache)
+        if pagina is not None:
+            return list(pagina)
+
+    if despues_de is None:
+        consulta = _COLUMNAS_LISTADO + "ORDER BY nombre LIMIT %s"
+        parametros = (limite,)
+    else:
+        consulta = _COLUMNAS_LISTADO + "WHERE nombre > %s ORDER BY nombre LIMIT %s"
+        parametros = (despues_de, limite)
+
+    pagina = bd_conexion.ejecutar_consulta(consulta, parametros, obtener_resultados=True, preparada=True)
+    # Una página vacía no se guarda: ejecutar_consulta también devuelve [] ante un error
+    if cache is not None and pagina:
+        # La página cubre los nombres entre despues_de y su último producto; si
+        # vino incompleta llega hasta el final del catálogo (un alta posterior la cambia)
+        desde = normalizar_clave(despues_de) if despues_de is not None else None
+        hasta = normalizar_clave(pagina[-1]['nombre']) if len(pagina) == limite else None
+        cache.guardar(clave_cache, tuple(pagina), (desde, hasta))
+    return pagina
+
+
+@instrumentar('bd', 'obtener')
+def obtener_producto_bd(bd_conexion, nombre):
+    """
+    Obtiene un producto por nombre (sin distinguir tildes ni mayúsculas, como el UNIQUE)
+
+    Args:
+        bd_conexion (DatabaseConnection): Conexión ya establecida
+        nombre (str): Nombre del producto
+
+    Returns:
+        dict|None: El producto, o None si no existe
+    """
+    clave = normalizar_clave(nombre)
+    cache = bd_conexion.obtener_cache()
+    if cache is not None:
+        producto = cache.obtener(('producto', clave))
+        if producto is not None:
+            return dict(producto)
+
+    resultados = bd_conexion.ejecutar_consulta(
+        _COLUMNAS_LISTADO + "WHERE nombre = %s", (nombre,), obtener_resultados=True, preparada=True
+    )
+    if not resultados:
+        return None
+    if cache is not None:
+        cache.guardar(('producto', clave), resultados[0], (clave, clave))
+    return dict(resultados[0])
+
+
+def obtener_productos_por_precio_bd(bd_conexion, minimo, maximo):
+    """
+    Obtiene los productos con precio entre minimo y maximo (incluidos), ordenados por precio.
+    WHERE precio BETWEEN + ORDER BY precio, nombre se resuelven con idx_precio (precio, nombre).
+
+    Args:
+        bd_conexion (DatabaseConnection): Conexión ya establecida
+        minimo (float): Precio mínimo
+        maximo (float): Precio máximo
+
+    Returns:
+        list: Productos como diccionarios
+    """
+    consulta = _COLUMNAS_LISTADO + "WHERE precio BETWEEN %s AND %s ORDER BY precio, nombre"
+    return bd_conexion.ejecutar_consulta(consulta, (minimo, maximo), obtener_resultados=True)
+
+
+def obtener_productos_mas_baratos_bd(bd_conexion, cantidad):
+    """
+    Obtiene los `cantidad` productos más baratos leyendo solo el comienzo de idx_precio.
+
+    Args:
+        bd_conexion (DatabaseConnection): Conexión ya establecida
+        cantidad (int): Cantidad máxima de productos
+
+    Returns:
+        list: Productos como diccionarios, ordenados por precio
+    """
+    consulta = _COLUMNAS_LISTADO + "ORDER BY precio, nombre LIMIT %s"
+    return bd_conexion.ejecutar_consulta(consulta, (cantidad,), obtener_resultados=True)
+
+
+def resolver_nombre_bd(bd_conexion, nombre):
+    """
+    Busca un producto sin distinguir tildes ni mayúsculas ("limon" encuentra "limón").
+    La collation utf8mb4_unicode_ci ya compara así, por lo que WHERE nombre = %s
+    se resuelve con el índice UNIQUE de nombre, sin funciones por fila.
+
+    Args:
+        bd_conexion (DatabaseConnection): Conexión ya establecida
+        nombre (str): Nombre a buscar
+
+    Returns:
+        str|None: Nombre tal como está guardado, o None si no existe
+    """
+    resultados = bd_conexion.ejecutar_consulta(
+        "SELECT nombre FROM productos WHERE nombre = %s", (nombre,), obtener_resultados=True, preparada=True
+    )
+    return resultados[0]['nombre'] if resultados else None
+
+
+def buscar_similares_bd(bd_conexion, texto, cantidad=5):
+    """
+    Obtiene los nombres más parecidos a un texto usando la tabla lateral
+    productos_trigramas: se cuentan los trigramas en común por producto
+    (recorriendo solo las filas de los trigramas de la consulta, por la clave
+    primaria) y a los mejores candidatos se les calcula la similitud exacta.
+
+    Args:
+        bd_conexion (DatabaseConnection): Conexión ya establecida
+        texto (str): Nombre buscado (puede tener errores de tipeo)
+        cantidad (int): Cantidad máxima de nombres
+
+    Returns:
+        list: Pares (nombre, similitud) de mayor a menor similitud
+    """
+    consulta_trigramas = trigramas(texto)
+    marcadores = ", ".join(["%s"] * len(consulta_trigramas))
+    consulta = f"""
+        SELECT p.nombre, COUNT(*) AS comunes
+        FROM productos_trigramas t
+        JOIN productos p ON p.id = t.producto_id
+        WHERE t.trigrama IN ({marcadores})
+        GROUP BY p.id, p.nombre
+        ORDER BY comunes DESC
+        LIMIT %s
+    """
+    candidatos = bd_conexion.ejecutar_consulta(
+        consulta, (*consulta_trigramas, IndiceTrigramas.CANDIDATOS), obtener_resultados=True
+    )
+
+    resultados = []
+    for fila in candidatos:
+        valor = similitud(consulta_trigramas, trigramas(fila['nombre']))
+        if valor >= UMBRAL_SIMILITUD:
+            resultados.append((fila['nombre'], valor))
+    resultados.sort(key=lambda resultado: (-resultado[1], resultado[0]))
+    return resultados[:cantidad]
+
+
+def _sugerir_nombres_bd(bd_conexion, nombre):
+    """Muestra los productos parecidos a un nombre que no se encontró"""
+    similares = buscar_similares_bd(bd_conexion, nombre, 3)
+    if similares:
+        print(f"💡 ¿Quiso decir: {', '.join(similar for similar, _ in similares)}?\n")
+
+
+def buscar_por_prefijo_bd(bd_conexion, prefijo, limite=TAMANO_PAGINA):
+    """
+    Obtiene los nombres que empiezan con un prefijo.
+    LIKE 'prefijo%' (sin comodín al inicio) se resuelve como un rango sobre idx_nombre,
+    que MySQL mantiene al día en cada alta y baja.
+
+    Args:
+        bd_conexion (DatabaseConnection): Conexión ya establecida
+        prefijo (str): Comienzo del nombre
+        limite (int): Cantidad máxima de nombres
+
+    Returns:
+        list: Nombres en orden alfabético
+    """
+    patron = prefijo.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+    consulta = "SELECT nombre FROM productos WHERE nombre LIKE %s ORDER BY nombre LIMIT %s"
+    resultados = bd_conexion.ejecutar_consulta(consulta, (patron, limite), obtener_resultados=True)
+    return [fila['nombre'] for fila in resultados]
+
+
+@instrumentar('bd', 'listar')
+def iterar_productos(bd_conexion, despues_de=None, limite=TAMANO_PAGINA):
+    """
+    Recorre los productos ordenados por nombre de a una página por vez,
+    así la memoria usada no depende del tamaño del catálogo.
+
+    Args:
+        bd_conexion (DatabaseConnection): Conexión ya establecida
+        despues_de (str): Nombre a partir del cual empezar (exclusivo)
+        limite (int): Cantidad de productos pedidos por consulta
+
+    Yields:
+        dict: Cada producto, en orden de nombre
+    """
+    while True:
+        pagina = obtener_pagina_productos(bd_conexion, despues_de, limite)
+        yield from pagina
+        if len(pagina) < limite:
+            return
+        despues_de = pagina[-1]['nombre']
 
 
 def mostrar_productos(bd_conexion):
     """
-    Muestra todos los productos desde la base de datos MySQL
+    Muestra todos los productos desde la base de datos MySQL.
+    Se imprime página por página a medida que llegan de la base de datos.
     
     Args:
         bd_conexion (DatabaseConnection): Conexión ya establecida
     """
     try:
-        consulta = """
-            SELECT id, nombre, tipo, precio, stock, 
-                   DATE_FORMAT(fecha_creacion, '%d/%m/%Y %H:%i') as fecha_creacion,
-                   DATE_FORMAT(fecha_actualizacion, '%d/%m/%Y %H:%i') as fecha_actualizacion
-            FROM productos 
-            ORDER BY nombre
-        """
-
-        productos_bd = bd_conexion.ejecutar_consulta(consulta, obtener_resultados=True)
-
-        if productos_bd:
-            print("\n📋 Lista de productos en la base de datos:")
-            print("-" * 80)
-            for i, producto in enumerate(productos_bd, start=1):
-                print(f"{i}. {producto['nombre']}")
-                print(f"   • Tipo: {producto['tipo']}")
-                print(f"   • Precio: ${producto['precio']}")
-                print(f"   • Stock: {producto['stock']} unidades")
-                print(f"   • Creado: {producto['fecha_creacion']}")
-                print(f"   • Actualizado: {producto['fecha_actualizacion']}")
-                print()
-        else:
+        hay_productos = False
+        for i, producto in enumerate(iterar_productos(bd_conexion), start=1):
+            if not hay_productos:
+                print("\n📋 Lista de productos en la base de datos:")
+                print("-" * 80)
+                hay_productos = True
+            print(f"{i}. {producto['nombre']}")
+            print(f"   • Tipo: {producto['tipo']}")
+            print(f"   • Precio: ${producto['precio']}")
+            print(f"   • Stock: {producto['stock']} unidades")
+            print(f"   • Creado: {producto['fecha_creacion']}")
+            print(f"   • Actualizado: {producto['fecha_actualizacion']}")
+            print()
+
+        if not hay_productos:
             print("📝 No hay productos en la base de datos")
             
     except Exception as e:
@@ -87,6 +498,7 @@ def mostrar_productos(bd_conexion):
   
 
 
+@instrumentar('bd', 'actualizar')
 def actualizar_producto_bd(nombre, campo, nuevo_valor, bd_conexion):
     """
     Actualiza un producto en la base de datos MySQL
@@ -112,15 +524,17 @@ def actualizar_producto_bd(nombre, campo, nuevo_valor, bd_conexion):
 
         exito = bd_conexion.ejecutar_consulta(
             consulta_actualizar,
-            (nuevo_valor, nombre)
+            (nuevo_valor, nombre),
+            preparada=True
         )
         
         if not exito:
             print(f"❌ Error al intentar actualizar el producto '{nombre}'")
             return False
         #Verificar si se afectó alguna fila
-        filas_afectadas = bd_conexion.cursor.rowcount
+        filas_afectadas = bd_conexion.filas_afectadas
         if filas_afectadas > 0:
+            _invalidar_cache(bd_conexion, nombre)
             print(f"✅ {campo.capitalize()} del producto '{nombre}' actualizado a {nuevo_valor}")
             return True
         else:
@@ -133,6 +547,148 @@ def actualizar_producto_bd(nombre, campo, nuevo_valor, bd_conexion):
     
 
 
+@instrumentar('bd', 'ajustar_stock')
+def ajustar_stock_bd(nombre, delta, bd_conexion):
+    """
+    Suma (o resta, con delta negativo) unidades al stock en una sola sentencia atómica.
+    La condición stock + delta >= 0 va en el WHERE, así dos vendedores simultáneos
+    no pierden actualizaciones ni dejan el stock negativo.
+    
+    Args:
+        nombre (str): Nombre del producto (sin importar tildes)
+        delta (int): Unidades a sumar; negativo para descontar
+        bd_conexion (DatabaseConnection): Conexión ya establecida
+
+    Returns:
+        bool: True si se ajustó, False si el producto no existe o el stock quedaría negativo
+    """
+    if delta == 0:
+        # MySQL no cuenta como afectada una fila que no cambia
+        return obtener_producto_bd(bd_conexion, nombre) is not None
+
+    consulta_ajustar = "UPDATE productos SET stock = stock + %s WHERE nombre = %s AND stock + %s >= 0"
+    exito = bd_conexion.ejecutar_consulta(consulta_ajustar, (delta, nombre, delta), preparada=True)
+    if not exito:
+        print(f"❌ Error al intentar ajustar el stock de '{nombre}'")
+        return False
+    if bd_conexion.filas_afectadas > 0:
+        _invalidar_cache(bd_conexion, nombre)
+        print(f"✅ Stock del producto '{nombre}' ajustado en {delta:+d}")
+        return True
+    print(f"❌ Error: El producto '{nombre}' no existe o no tiene stock suficiente")
+    return False
+
+
+def _consulta_ajustes_stock(cantidad):
+    """
+    Arma un UPDATE ... JOIN que suma un delta distinto a cada producto en una
+    sola sentencia. Los productos que quedarían con stock negativo no se tocan.
+
+    Args:
+        cantidad (int): Cantidad de pares (nombre, delta) que recibirá la consulta
+    """
+    ajustes = " UNION ALL ".join(["SELECT %s AS nombre, %s AS delta"] * cantidad)
+    return f"""
+        UPDATE productos p
+        JOIN ({ajustes}) a ON p.nombre = a.nombre
+        SET p.stock = p.stock + a.delta
+        WHERE p.stock + a.delta >= 0
+    """
+
+
+def _consulta_valores_absolutos(cantidad):
+    """
+    Arma un UPDATE ... JOIN que fija precio y/o stock de muchos productos en una
+    sola sentencia. Un valor NULL deja el campo como estaba.
+
+    Args:
+        cantidad (int): Cantidad de tuplas (nombre, precio, stock) que recibirá la consulta
+    """
+    valores = " UNION ALL ".join(["SELECT %s AS nombre, %s AS precio, %s AS stock"] * cantidad)
+    return f"""
+        UPDATE productos p
+        JOIN ({valores}) v ON p.nombre = v.nombre
+        SET p.precio = COALESCE(v.precio, p.precio), p.stock = COALESCE(v.stock, p.stock)
+    """
+
+
+def ajustar_stock_bd_lote(ajustes, bd_conexion, tamano_lote=TAMANO_LOTE):
+    """
+    Aplica muchos ajustes de stock con un único UPDATE ... JOIN por lote (un viaje
+    a la BD por cada `tamano_lote` productos). Los ajustes de un mismo producto se
+    suman y se aplican juntos; cada producto se ajusta o rechaza por separado
+    (inexistente o stock insuficiente).
+
+    Args:
+        ajustes (iterable): Pares (nombre, delta)
+        bd_conexion (DatabaseConnection): Conexión ya establecida
+        tamano_lote (int): Cantidad de productos por sentencia
+
+    Returns:
+        int: Cantidad de productos cuyo stock cambió
+    """
+    # Suma por producto sin importar tildes (como el UNIQUE): en un UPDATE con
+    # JOIN cada fila se modifica una sola vez aunque aparezca repetida
+    deltas = {}
+    for nombre, delta in ajustes:
+        clave = normalizar_clave(nombre)
+        nombre_anterior, delta_anterior = deltas.get(clave, (nombre, 0))
+        deltas[clave] = (nombre_anterior, delta_anterior + delta)
+    filas = [(nombre, delta) for nombre, delta in deltas.values() if delta != 0]
+
+    ajustados = 0
+    for lote in _dividir_en_lotes(filas, tamano_lote):
+        consulta_ajustar = _consulta_ajustes_stock(len(lote))
+        parametros = tuple(valor for fila in lote for valor in fila)
+        if not bd_conexion.ejecutar_consulta(consulta_ajustar, parametros):
+            print("❌ Error al intentar ajustar el stock del lote")
+            break
+        ajustados += bd_conexion.filas_afectadas
+
+    if ajustados:
+        _invalidar_cache(bd_conexion)
+    print(f"✅ Stock ajustado en {ajustados} productos")
+    return ajustados
+
+
+def aplicar_cambios_bd_lote(valores, ajustes, bd_conexion, tamano_lote=TAMANO_LOTE):
+    """
+    Aplica en una sola transacción muchos valores absolutos de precio/stock y
+    luego muchos ajustes relativos de stock, con un UPDATE ... JOIN por lote.
+    Lo usa el buffer de escritura diferida (buffer_escritura.py) para vaciarse.
+
+    A diferencia de las demás funciones, si falla deshace todo y propaga el
+    error (con ejecutar_sentencia), para que el llamador pueda reintentar.
+
+    Args:
+        valores (list): Tuplas (nombre, precio, stock) sin nombres repetidos;
+                        None en precio o stock deja ese campo como estaba
+        ajustes (list): Pares (nombre, delta) sin nombres repetidos
+        bd_conexion (DatabaseConnection): Conexión ya establecida
+        tamano_lote (int): Cantidad de productos por sentencia
+
+    Returns:
+        tuple: (modificados, ajustados) con las filas que cambiaron por los valores
+               absolutos y los productos cuyo ajuste se aplicó (los que quedarían
+               con stock negativo o no existen se descartan)
+    """
+    modificados = 0
+    ajustados = 0
+    with bd_conexion.transaccion():
+        for lote in _dividir_en_lotes(valores, tamano_lote):
+            modificados += bd_conexion.ejecutar_sentencia(
+                _consulta_valores_absolutos(len(lote)), tuple(valor for fila in lote for valor in fila)
+            )
+        for lote in _dividir_en_lotes(ajustes, tamano_lote):
+            ajustados += bd_conexion.ejecutar_sentencia(
+                _consulta_ajustes_stock(len(lote)), tuple(valor for fila in lote for valor in fila)
+            )
+    if modificados or ajustados:
+        _invalidar_cache(bd_conexion)
+    return (modificados, ajustados)
+
+
+@instrumentar('bd', 'eliminar')
 def eliminar_producto_bd(nombre, bd_conexion):
     """
     Elimina un producto usando una conexión existente
@@ -148,13 +704,14 @@ def eliminar_producto_bd(nombre, bd_conexion):
     
         # Intentar eliminar el producto directamente y usar rowcount para verificar
         consulta_eliminar = "DELETE FROM productos WHERE nombre = %s"
-        exito = bd_conexion.ejecutar_consulta(consulta_eliminar, (nombre,))
+        exito = bd_conexion.ejecutar_consulta(consulta_eliminar, (nombre,), preparada=True)
 
         if exito:
             # Verificar cuántas filas fueron afectadas
-            filas_afectadas = bd_conexion.cursor.rowcount
+            filas_afectadas = bd_conexion.filas_afectadas
             
             if filas_afectadas > 0:
+                _invalidar_cache(bd_conexion, nombre)
                 print(f"✅ Producto '{nombre}' eliminado exitosamente")
                 return True
             else:
@@ -241,13 +798,22 @@ def intentar_agregar_producto(bd_conexion):
         return ('duplicado', nombre)
 
 
-def intentar_actualizar_producto(bd_conexion):
+def _encolar_actualizacion(buffer, nombre, campo, valor):
+    """Encola un cambio en el buffer de escritura e informa que se guardará en segundo plano"""
+    buffer.actualizar(nombre, campo, valor)
+    print(f"🕒 {campo.capitalize()} del producto '{nombre}' actualizado a {valor} (se guardará en segundo plano)")
+    return ('ok', nombre)
+
+
+def intentar_actualizar_producto(bd_conexion, buffer=None):
     """
     Función interactiva para actualizar un producto usando BD.
     Valida cada campo por separado y solo repite el input del campo inválido.
     
     Args:
         bd_conexion (DatabaseConnection): Conexión ya establecida
+        buffer (BufferEscritura): Si se indica, el cambio se encola para escribirse
+                                  en segundo plano en lugar de ir directo a la BD
     
     Returns:
         tuple: (resultado, nombre) donde resultado puede ser:
@@ -255,7 +821,8 @@ def intentar_actualizar_producto(bd_conexion):
     """
     # Nombre
     while True:
-        nombre_producto = input('Ingrese el nombre del producto que desea actualizar (o "cancelar" para volver al menú): ')
+        with autocompletar_nombres(lambda prefijo, limite: buscar_por_prefijo_bd(bd_conexion, prefijo, limite)):
+            nombre_producto = input('Ingrese el nombre del producto que desea actualizar (o "cancelar" para volver al menú): ')
         nombre = validar_nombre(nombre_producto)
         if nombre == "cancelado":
             print("Operación cancelada. Volviendo al menú principal.\n")
@@ -268,6 +835,15 @@ def intentar_actualizar_producto(bd_conexion):
             continue
         break
 
+    # Con buffer, el producto se valida antes de encolar (el buffer no informa inexistentes)
+    if buffer is not None:
+        nombre_guardado = resolver_nombre_bd(bd_conexion, nombre)
+        if nombre_guardado is None:
+            print(f"❌ Error: El producto '{nombre}' no existe en la base de datos")
+            _sugerir_nombres_bd(bd_conexion, nombre)
+            return ('no_encontrado', nombre)
+        nombre = nombre_guardado
+
     # Selección de campo a actualizar
     while True:
         print("¿Qué desea actualizar?")
@@ -288,10 +864,13 @@ def intentar_actualizar_producto(bd_conexion):
                 print("El precio debe ser un número positivo.\n")
                 continue
             break
+        if buffer is not None:
+            return _encolar_actualizacion(buffer, nombre, 'precio', precio)
         exito = actualizar_producto_bd(nombre, 'precio', precio, bd_conexion)
         if exito:
             return ('ok', nombre)
         else:
+            _sugerir_nombres_bd(bd_conexion, nombre)
             return ('no_encontrado', nombre)
 
     # Actualización de stock
@@ -303,10 +882,13 @@ def intentar_actualizar_producto(bd_conexion):
                 print("El stock debe ser un número entero no negativo.\n")
                 continue
             break
+        if buffer is not None:
+            return _encolar_actualizacion(buffer, nombre, 'stock', stock)
         exito = actualizar_producto_bd(nombre, 'stock', stock, bd_conexion)
         if exito:
             return ('ok', nombre)
         else:
+            _sugerir_nombres_bd(bd_conexion, nombre)
             return ('no_encontrado', nombre)
 
 
@@ -332,7 +914,8 @@ def intentar_eliminar_producto(bd_conexion):
             return ('no_encontrado', None)
         
         # Input del usuario
-        nombre_producto = input('Ingrese el nombre del producto que desea eliminar (o "cancelar" para volver al menú): ')
+        with autocompletar_nombres(lambda prefijo, limite: buscar_por_prefijo_bd(bd_conexion, prefijo, limite)):
+            nombre_producto = input('Ingrese el nombre del producto que desea eliminar (o "cancelar" para volver al menú): ')
         nombre = validar_nombre(nombre_producto)
         
         if nombre == "cancelado":
@@ -350,6 +933,7 @@ def intentar_eliminar_producto(bd_conexion):
             if exito:
                 return ('ok', nombre)
             else:
+                _sugerir_nombres_bd(bd_conexion, nombre)
                 return ('no_encontrado', nombre)
         else:
             print("Operación cancelada.\n")
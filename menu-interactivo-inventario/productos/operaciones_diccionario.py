@@ -1,7 +1,175 @@
 # Funciones para agregar, mostrar, actualizar y eliminar productos del inventario usando diccionario
+import threading
 from productos.validaciones import validar_nombre, validar_tipo, validar_precio, validar_stock
+from productos.inventario_memoria import InventarioMemoria, Producto
+from productos.autocompletado import autocompletar_nombres
+from productos.metricas import instrumentar
+
+productos = InventarioMemoria()  # Inventario {nombre: Producto} en memoria (variable global)
+_registro = None  # RegistroOperaciones activo cuando la persistencia está habilitada
+_CODIGOS_CAMPO = {"precio": "p", "stock": "s"}  # Código de cada campo en el log de operaciones
+# Serializa las escrituras (altas, cambios, bajas y ajustes): cada una busca el nombre
+# y lo modifica sin que otro hilo lo borre o pise su stock en el medio
+_candado = threading.Lock()
+
+
+def activar_persistencia(directorio, **opciones):
+    """
+    Habilita la persistencia del inventario en memoria: recupera el estado
+    guardado (snapshot + log) y a partir de ahora registra cada operación.
+
+    Args:
+        directorio (str): Carpeta donde se guardan el log y los snapshots
+        **opciones: Parámetros de RegistroOperaciones (operaciones_por_fsync,
+                    intervalo_fsync, compactar_cada)
+
+    Returns:
+        int: Cantidad de productos recuperados
+    """
+    global _registro
+    from productos.persistencia_diccionario import RegistroOperaciones
+
+    desactivar_persistencia()
+    registro = RegistroOperaciones(directorio, lambda: productos, **opciones)
+    productos.clear()
+    productos.update(registro.cargar())
+    _registro = registro
+    return len(productos)
+
+
+def desactivar_persistencia():
+    """Confirma en disco las operaciones pendientes, deja un snapshot y cierra el log"""
+    global _registro
+    if _registro:
+        _registro.cerrar()
+        _registro = None
+
+
+@instrumentar('diccionario', 'agregar')
+def agregar_producto(nombre, tipo, precio, stock):
+    """
+    Agrega un producto al inventario en memoria (sin input).
+    
+    Args:
+        nombre (str): Nombre del producto ya validado
+        tipo (str): Tipo del producto ('fruta' o 'verdura')
+        precio (float): Precio del producto
+        stock (int): Stock disponible
+        
+    Returns:
+        bool: True si se agregó, False si el producto ya existía (sin importar tildes)
+    """
+    with _candado:
+        if productos.resolver_nombre(nombre) is not None:
+            return False
+        productos[nombre] = Producto(tipo, precio, stock)
+        if _registro:
+            _registro.registrar("a", nombre, tipo, precio, stock)
+    return True
+
+
+@instrumentar('diccionario', 'actualizar')
+def actualizar_producto(nombre, campo, nuevo_valor):
+    """
+    Actualiza el precio o el stock de un producto en memoria (sin input).
+    
+    Args:
+        nombre (str): Nombre del producto a actualizar (sin importar tildes)
+        campo (str): Campo a actualizar ('precio' o 'stock')
+        nuevo_valor (float|int): Nuevo valor para el campo
+        
+    Returns:
+        bool: True si se actualizó, False si el campo no es válido o el producto no existe
+    """
+    if campo not in _CODIGOS_CAMPO:
+        return False
+    with _candado:
+        nombre = productos.resolver_nombre(nombre)
+        if nombre is None:
+            return False
+        productos.actualizar(nombre, campo, nuevo_valor)
+        if _registro:
+            _registro.registrar(_CODIGOS_CAMPO[campo], nombre, nuevo_valor)
+    return True
+
+
+@instrumentar('diccionario', 'ajustar_stock')
+def ajustar_stock(nombre, delta):
+    """
+    Suma (o resta, con delta negativo) unidades al stock de forma atómica (sin input).
+    Varios hilos pueden ajustar el mismo producto sin perder actualizaciones.
+    
+    Args:
+        nombre (str): Nombre del producto (sin importar tildes)
+        delta (int): Unidades a sumar; negativo para descontar
+        
+    Returns:
+        bool: True si se ajustó, False si el producto no existe o el stock quedaría negativo
+    """
+    with _candado:
+        nombre = productos.resolver_nombre(nombre)
+        if nombre is None:
+            return False
+        nuevo_stock = productos[nombre].stock + delta
+        if nuevo_stock < 0:
+            return False
+        productos.actualizar(nombre, "stock", nuevo_stock)
+        # Se registra el stock resultante (valor absoluto), así reaplicar el log es seguro
+        if _registro:
+            _registro.registrar("s", nombre, nuevo_stock)
+    return True
+
+
+def ajustar_stock_lote(ajustes):
+    """
+    Aplica muchos ajustes de stock tomando el candado una sola vez (sin input).
+    Los ajustes de un mismo producto se suman y se aplican juntos; cada producto
+    se ajusta o rechaza por separado (inexistente o stock insuficiente).
+    
+    Args:
+        ajustes (iterable): Pares (nombre, delta)
+        
+    Returns:
+        int: Cantidad de productos cuyo stock cambió
+    """
+    ajustados = 0
+    with _candado:
+        deltas = {}
+        for nombre, delta in ajustes:
+            nombre = productos.resolver_nombre(nombre)
+            if nombre is not None:
+                deltas[nombre] = deltas.get(nombre, 0) + delta
+        for nombre, delta in deltas.items():
+            nuevo_stock = productos[nombre].stock + delta
+            if delta == 0 or nuevo_stock < 0:
+                continue
+            productos.actualizar(nombre, "stock", nuevo_stock)
+            if _registro:
+                _registro.registrar("s", nombre, nuevo_stock)
+            ajustados += 1
+    return ajustados
+
+
+@instrumentar('diccionario', 'eliminar')
+def eliminar_producto(nombre):
+    """
+    Elimina un producto del inventario en memoria (sin input).
+    
+    Args:
+        nombre (str): Nombre del producto a eliminar (sin importar tildes)
+        
+    Returns:
+        bool: True si se eliminó, False si el producto no existía
+    """
+    with _candado:
+        nombre = productos.resolver_nombre(nombre)
+        if nombre is None:
+            return False
+        del productos[nombre]
+        if _registro:
+            _registro.registrar("e", nombre)
+    return True
 
-productos = {}  # Diccionario para almacenar los productos (variable global)
 
 def intentar_agregar_producto():
     """
@@ -25,7 +193,7 @@ def intentar_agregar_producto():
         if nombre == "invalido":
             print("El producto debe contener solo letras y espacios, sin números ni caracteres especiales.\n")
             continue
-        if nombre in productos:
+        if productos.resolver_nombre(nombre) is not None:
             print("El producto ya está en la lista.\n")
             return ('duplicado', nombre)
         break
@@ -66,19 +234,121 @@ def intentar_agregar_producto():
             continue
         break
 
-    productos[nombre] = {"tipo": tipo, "precio": precio, "stock": stock}
+    agregar_producto(nombre, tipo, precio, stock)
     print(f"✅ Producto '{nombre}' agregado exitosamente.")
     return ('ok', nombre)  # Indico que se agregó el producto con éxito
 
 
-def mostrar_productos():
-    if productos: # Verifico si el diccionario no está vacía
-        print("Lista de productos:")
-        for i, (nombre, detalles) in enumerate(productos.items(), start=1):
-            print(f"{i}. {nombre} - Tipo: {detalles['tipo']}, Precio: {detalles['precio']}, Stock: {detalles['stock']}")
+def obtener_productos_por_tipo(tipo):
+    """
+    Devuelve los productos de un tipo usando el índice por tipo (sin recorrer todo el inventario).
+    
+    Args:
+        tipo (str): Tipo del producto ('fruta' o 'verdura')
+        
+    Returns:
+        list: Pares (nombre, producto) en orden de alta
+    """
+    return list(productos.filtrar_por_tipo(tipo))
+
+
+def obtener_productos_por_precio(minimo=None, maximo=None):
+    """
+    Devuelve los productos con precio entre minimo y maximo (incluidos) usando el índice por precio.
+    
+    Args:
+        minimo (float): Precio mínimo (None = sin límite inferior)
+        maximo (float): Precio máximo (None = sin límite superior)
+        
+    Returns:
+        list: Pares (nombre, producto) ordenados por precio
+    """
+    return list(productos.filtrar_por_precio(minimo, maximo))
+
+
+def obtener_productos_mas_baratos(cantidad):
+    """
+    Devuelve los `cantidad` productos más baratos usando el índice por precio.
+    
+    Args:
+        cantidad (int): Cantidad máxima de productos
+        
+    Returns:
+        list: Pares (nombre, producto) ordenados por precio
+    """
+    return list(productos.mas_baratos(cantidad))
+
+
+def resolver_nombre(nombre):
+    """
+    Busca un producto sin distinguir tildes ni mayúsculas ("limon" encuentra "limón").
+    
+    Args:
+        nombre (str): Nombre a buscar
+        
+    Returns:
+        str|None: Nombre tal como está guardado, o None si no existe
+    """
+    return productos.resolver_nombre(nombre)
+
+
+def buscar_por_prefijo(prefijo, limite=None):
+    """
+    Devuelve los nombres de productos que empiezan con un prefijo (árbol de prefijos).
+    
+    Args:
+        prefijo (str): Comienzo del nombre (se normaliza igual que validar_nombre)
+        limite (int): Cantidad máxima de nombres (None = todos)
+        
+    Returns:
+        list: Nombres en orden alfabético
+    """
+    return productos.buscar_por_prefijo(prefijo.lstrip().lower(), limite)
+
+
+def buscar_similares(texto, cantidad=5):
+    """
+    Devuelve los nombres de productos más parecidos a un texto (índice de trigramas).
+    
+    Args:
+        texto (str): Nombre buscado (puede tener errores de tipeo)
+        cantidad (int): Cantidad máxima de nombres
+        
+    Returns:
+        list: Pares (nombre, similitud) de mayor a menor similitud
+    """
+    return productos.buscar_similares(texto, cantidad)
+
+
+def _sugerir_nombres(nombre):
+    """Muestra los productos parecidos a un nombre que no se encontró"""
+    similares = buscar_similares(nombre, 3)
+    if similares:
+        print(f"💡 ¿Quiso decir: {', '.join(similar for similar, _ in similares)}?\n")
+
+
+def mostrar_productos(tipo=None):
+    """
+    Muestra el inventario en memoria.
+    
+    Args:
+        tipo (str): Si se indica, muestra solo los productos de ese tipo
+    """
+    listado = productos.items() if tipo is None else productos.filtrar_por_tipo(tipo)
+    encabezado = "Lista de productos:" if tipo is None else f"Lista de productos de tipo {tipo}:"
+    hay_productos = False
+    for i, (nombre, detalles) in enumerate(listado, start=1):
+        if i == 1:
+            print(encabezado)
+            hay_productos = True
+        print(f"{i}. {nombre} - Tipo: {detalles['tipo']}, Precio: {detalles['precio']}, Stock: {detalles['stock']}")
+    if hay_productos:
         print()  # Línea en blanco al final de la lista
-    else:
+    elif tipo is None:
         print("No hay productos en la lista.\n")
+    else:
+        print(f"No hay productos de tipo {tipo} en la lista.\n")
+
 
 def intentar_actualizar_producto():
     """
@@ -91,7 +361,8 @@ def intentar_actualizar_producto():
     """
     # Nombre
     while True:
-        nombre_producto = input('Ingrese el nombre del producto que desea actualizar (o "cancelar" para volver al menú): ')
+        with autocompletar_nombres(buscar_por_prefijo):
+            nombre_producto = input('Ingrese el nombre del producto que desea actualizar (o "cancelar" para volver al menú): ')
         nombre = validar_nombre(nombre_producto)
         if nombre == "cancelado":
             print("Operación cancelada. Volviendo al menú principal.\n")
@@ -99,9 +370,12 @@ def intentar_actualizar_producto():
         if nombre == "vacio":
             print("No se ingresó ningún producto, por favor intente nuevamente.\n")
             continue
-        if nombre not in productos:
+        encontrado = productos.resolver_nombre(nombre)
+        if encontrado is None:
             print("El producto no se encuentra en la lista.\n")
+            _sugerir_nombres(nombre)
             return ('no_encontrado', None)
+        nombre = encontrado
         break
 
     # Elegir opcion a actualizar
@@ -118,7 +392,7 @@ def intentar_actualizar_producto():
                     print("El precio debe ser un número positivo.\n")
                     continue
                 break
-            productos[nombre]["precio"] = precio
+            actualizar_producto(nombre, "precio", precio)
             print(f"✅ Precio del producto '{nombre}' actualizado a {precio}.")
             return ('ok', nombre)
         elif opcion == "2":
@@ -129,7 +403,7 @@ def intentar_actualizar_producto():
                     print("El stock debe ser un número entero no negativo.\n")
                     continue
                 break
-            productos[nombre]["stock"] = stock
+            actualizar_producto(nombre, "stock", stock)
             print(f"✅ Stock del producto '{nombre}' actualizado a {stock}.")
             return ('ok', nombre)
         else:
@@ -140,7 +414,8 @@ def intentar_eliminar_producto():
     if not productos:
         print("No hay productos en la lista.\n")
         return ('no_encontrado', None) #volver al menú principal para evitar loop infinito
-    nombre_producto = input('Ingrese el nombre del producto que desea eliminar (o "cancelar" para volver al menú): ')
+    with autocompletar_nombres(buscar_por_prefijo):
+        nombre_producto = input('Ingrese el nombre del producto que desea eliminar (o "cancelar" para volver al menú): ')
     nombre = validar_nombre(nombre_producto)
     if nombre == "cancelado":
             print("Operación cancelada. Volviendo al menú principal.\n")
@@ -148,13 +423,16 @@ def intentar_eliminar_producto():
     if nombre == "vacio":
             print("No se ingresó ningún producto, por favor intente nuevamente.\n")
             return ('vacio', None)  # Salgo de la función sin eliminar nada
-    if nombre not in productos:
+    encontrado = productos.resolver_nombre(nombre)
+    if encontrado is None:
             print("El producto no se encuentra en la lista.\n")
+            _sugerir_nombres(nombre)
             return ('no_encontrado', None)  # Salgo de la función sin eliminar nada
+    nombre = encontrado
 
     confirmacion = input('Está seguro que desea eliminar el producto? (s/n): ').strip().lower()
     if confirmacion == 's':
-        del productos[nombre]
+        eliminar_producto(nombre)
         print(f"Producto {nombre} eliminado con éxito.\n")
         return ('ok', nombre)  # Indico que se eliminó el producto con éxito
     else:
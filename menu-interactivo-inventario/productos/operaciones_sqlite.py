@@ -0,0 +1,422 @@
+# Funciones para agregar, mostrar, actualizar y eliminar productos del inventario usando SQLite
+# Mismo contrato que operaciones_bd (funciones intentar_* y mostrar_productos reciben la conexión)
+from productos.validaciones import validar_nombre, validar_tipo, validar_precio, validar_stock, normalizar_clave
+from productos.autocompletado import autocompletar_nombres
+from productos.metricas import instrumentar
+
+TAMANO_PAGINA = 100  # Filas por página al recorrer el catálogo
+
+
+@instrumentar('sqlite', 'agregar')
+def agregar_producto_sqlite(nombre, tipo, precio, stock, bd_conexion):
+    """
+    Agrega un producto usando UNIQUE constraint para evitar duplicados.
+    
+    Args:
+        nombre (str): Nombre del producto
+        tipo (str): Tipo del producto ('fruta' o 'verdura')
+        precio (float): Precio del producto
+        stock (int): Stock disponible
+        bd_conexion (ConexionSQLite): Conexión ya establecida
+        
+    Returns:
+        bool: True si se agregó exitosamente, False en caso contrario
+    """
+    consulta_insertar = "INSERT INTO productos (nombre, tipo, precio, stock, nombre_clave) VALUES (?, ?, ?, ?, ?)"
+
+    # La BD maneja duplicados con UNIQUE constraint (el error lo informa ejecutar_consulta)
+    exito = bd_conexion.ejecutar_consulta(consulta_insertar, (nombre, tipo, precio, stock, normalizar_clave(nombre)))
+    if exito and bd_conexion.cursor.rowcount > 0:
+        print(f"✅ Producto '{nombre}' agregado exitosamente a la base de datos")
+        return True
+    return False
+
+
+def obtener_pagina_productos(bd_conexion, despues_de=None, limite=TAMANO_PAGINA):
+    """
+    Obtiene una página de productos ordenada por nombre (paginación por clave)
+
+    Args:
+        bd_conexion (ConexionSQLite): Conexión ya establecida
+        despues_de (str): Último nombre de la página anterior (None para la primera)
+        limite (int): Cantidad máxima de productos de la página
+
+    Returns:
+        list: Productos de la página (sqlite3.Row, accesibles por nombre de columna)
+    """
+    columnas = """
+        SELECT id, nombre, tipo, precio, stock,
+               strftime('%d/%m/%Y %H:%M', fecha_creacion, 'localtime') as fecha_creacion,
+               strftime('%d/%m/%Y %H:%M', fecha_actualizacion, 'localtime') as fecha_actualizacion
+        FROM productos
+    """
+    if despues_de is None:
+        consulta = columnas + "ORDER BY nombre LIMIT ?"
+        parametros = (limite,)
+    else:
+        consulta = columnas + "WHERE nombre > ? ORDER BY nombre LIMIT ?"
+        parametros = (despues_de, limite)
+
+    return bd_conexion.ejecutar_consulta(consulta, parametros, obtener_resultados=True)
+
+
+def resolver_nombre_sqlite(bd_conexion, nombre):
+    """
+    Busca un producto sin distinguir tildes ni mayúsculas ("limon" encuentra "limón")
+    usando el índice de la columna nombre_clave.
+
+    Args:
+        bd_conexion (ConexionSQLite): Conexión ya establecida
+        nombre (str): Nombre a buscar
+
+    Returns:
+        str|None: Nombre tal como está guardado, o None si no existe
+    """
+    resultados = bd_conexion.ejecutar_consulta(
+        "SELECT nombre FROM productos WHERE nombre_clave = ?", (normalizar_clave(nombre),),
+        obtener_resultados=True
+    )
+    return resultados[0]['nombre'] if resultados else None
+
+
+def buscar_por_prefijo_sqlite(bd_conexion, prefijo, limite=TAMANO_PAGINA):
+    """
+    Obtiene los nombres que empiezan con un prefijo.
+    Se consulta como rango (nombre >= prefijo AND nombre < prefijo + U+10FFFF) para que
+    SQLite use el índice UNIQUE de nombre (su LIKE no distingue mayúsculas y no lo usa).
+
+    Args:
+        bd_conexion (ConexionSQLite): Conexión ya establecida
+        prefijo (str): Comienzo del nombre
+        limite (int): Cantidad máxima de nombres
+
+    Returns:
+        list: Nombres en orden alfabético
+    """
+    consulta = "SELECT nombre FROM productos WHERE nombre >= ? AND nombre < ? ORDER BY nombre LIMIT ?"
+    resultados = bd_conexion.ejecutar_consulta(consulta, (prefijo, prefijo + '\U0010ffff', limite),
+                                               obtener_resultados=True)
+    return [fila['nombre'] for fila in resultados]
+
+
+@instrumentar('sqlite', 'listar')
+def iterar_productos(bd_conexion, despues_de=None, limite=TAMANO_PAGINA):
+    """
+    Recorre los productos ordenados por nombre de a una página por vez
+
+    Yields:
+        sqlite3.Row: Cada producto, en orden de nombre
+    """
+    while True:
+        pagina = obtener_pagina_productos(bd_conexion, despues_de, limite)
+        yield from pagina
+        if len(pagina) < limite:
+            return
+        despues_de = pagina[-1]['nombre']
+
+
+def mostrar_productos(bd_conexion):
+    """
+    Muestra todos los productos desde la base de datos SQLite, página por página
+    
+    Args:
+        bd_conexion (ConexionSQLite): Conexión ya establecida
+    """
+    try:
+        hay_productos = False
+        for i, producto in enumerate(iterar_productos(bd_conexion), start=1):
+            if not hay_productos:
+                print("\n📋 Lista de productos en la base de datos:")
+                print("-" * 80)
+                hay_productos = True
+            print(f"{i}. {producto['nombre']}")
+            print(f"   • Tipo: {producto['tipo']}")
+            print(f"   • Precio: ${producto['precio']:.2f}")
+            print(f"   • Stock: {producto['stock']} unidades")
+            print(f"   • Creado: {producto['fecha_creacion']}")
+            print(f"   • Actualizado: {producto['fecha_actualizacion']}")
+            print()
+
+        if not hay_productos:
+            print("📝 No hay productos en la base de datos")
+            
+    except Exception as e:
+        print(f"❌ Error inesperado: {e}")
+
+
+@instrumentar('sqlite', 'actualizar')
+def actualizar_producto_sqlite(nombre, campo, nuevo_valor, bd_conexion):
+    """
+    Actualiza un producto en la base de datos SQLite
+    
+    Args:
+        nombre (str): Nombre del producto a actualizar
+        campo (str): Campo a actualizar ('precio' o 'stock')
+        nuevo_valor (float|int): Nuevo valor para el campo
+        bd_conexion (ConexionSQLite): Conexión ya establecida
+
+    Returns:
+        bool: True si se actualizó exitosamente, False en caso contrario
+    """ 
+    try:
+        
+        # Validar el campo a actualizar
+        if campo not in ['precio', 'stock']:
+            print(f"❌ Error: Campo '{campo}' no válido. Solo se puede actualizar 'precio' o 'stock'")
+            return False
+        
+        # Actualizar el producto (por nombre_clave: sin importar tildes, usando idx_nombre_clave)
+        consulta_actualizar = f"UPDATE productos SET {campo} = ? WHERE nombre_clave = ?"
+
+        exito = bd_conexion.ejecutar_consulta(
+            consulta_actualizar,
+            (nuevo_valor, normalizar_clave(nombre))
+        )
+        
+        if not exito:
+            print(f"❌ Error al intentar actualizar el producto '{nombre}'")
+            return False
+        #Verificar si se afectó alguna fila
+        filas_afectadas = bd_conexion.cursor.rowcount
+        if filas_afectadas > 0:
+            print(f"✅ {campo.capitalize()} del producto '{nombre}' actualizado a {nuevo_valor}")
+            return True
+        else:
+            print(f"❌ Error: El producto '{nombre}' no existe en la base de datos")
+            return False
+        
+    except Exception as e:
+        print(f"❌ Error inesperado: {e}")
+        return False
+    
+
+
+@instrumentar('sqlite', 'eliminar')
+def eliminar_producto_sqlite(nombre, bd_conexion):
+    """
+    Elimina un producto usando una conexión existente
+    
+    Args:
+        nombre (str): Nombre del producto a eliminar
+        bd_conexion (ConexionSQLite): Conexión ya establecida
+        
+    Returns:
+        bool: True si se eliminó exitosamente, False en caso contrario
+    """
+    try:
+    
+        # Intentar eliminar el producto directamente y usar rowcount para verificar
+        consulta_eliminar = "DELETE FROM productos WHERE nombre_clave = ?"
+        exito = bd_conexion.ejecutar_consulta(consulta_eliminar, (normalizar_clave(nombre),))
+
+        if exito:
+            # Verificar cuántas filas fueron afectadas
+            filas_afectadas = bd_conexion.cursor.rowcount
+            
+            if filas_afectadas > 0:
+                print(f"✅ Producto '{nombre}' eliminado exitosamente")
+                return True
+            else:
+                print(f"❌ Error: El producto '{nombre}' no existe")
+                return False
+        else:
+            print("❌ Error: No se pudo ejecutar la eliminación")
+            return False
+            
+    except Exception as e:
+        print(f"❌ Error inesperado: {e}")
+        return False
+    # No cierra conexión - esa responsabilidad es del caller
+
+
+def intentar_agregar_producto(bd_conexion):
+    """
+    Función interactiva para agregar un producto con validaciones usando SQLite.
+    Valida cada campo por separado y solo repite el input del campo inválido.
+    
+    Args:
+        bd_conexion (ConexionSQLite): Conexión ya establecida
+    
+    Returns:
+        tuple: (resultado, nombre) donde resultado puede ser:
+               'ok', 'cancelado', 'vacio', 'invalido', 'duplicado'
+    """
+    # Nombre
+    while True:
+        nombre_producto = input('Ingrese el nombre del producto que desea agregar (o "cancelar" para volver al menú): ')
+        nombre = validar_nombre(nombre_producto)
+        if nombre == "cancelado":
+            print("Operación cancelada. Volviendo al menú principal.\n")
+            return ('cancelado', None)
+        if nombre == "vacio":
+            print("No se ingresó ningún producto, por favor intente nuevamente.\n")
+            continue
+        if nombre == "invalido":
+            print("El producto debe contener solo letras y espacios, sin números ni caracteres especiales.\n")
+            continue
+        break
+
+    # Tipo
+    while True:
+        tipo_producto = input('Ingrese el tipo de producto (fruta/verdura) (o "cancelar" para volver al menú): ')
+        tipo = validar_tipo(tipo_producto)
+        if tipo == 'cancelado':
+            print("Operación cancelada. Volviendo al menú principal.\n")
+            return ('cancelado', None)
+        if tipo == 'invalido':
+            print("El tipo de producto debe ser 'fruta' o 'verdura'.\n")
+            continue
+        break
+
+    # Precio
+    while True:
+        precio_producto = input('Ingrese el precio del producto (o "cancelar" para volver al menú): ')
+        precio = validar_precio(precio_producto)
+        if precio == 'cancelado':
+            print("Operación cancelada. Volviendo al menú principal.\n")
+            return ('cancelado', None)
+        if precio == 'invalido':
+            print("El precio debe ser un número positivo.\n")
+            continue
+        break
+
+    # Stock
+    while True:
+        stock_producto = input('Ingrese el stock del producto (o "cancelar" para volver al menú): ')
+        stock = validar_stock(stock_producto)
+        if stock == 'cancelado':
+            print("Operación cancelada. Volviendo al menú principal.\n")
+            return ('cancelado', None)
+        if stock == 'invalido':
+            print("El stock debe ser un número entero no negativo.\n")
+            continue
+        break
+
+    # Intentar agregar a la base de datos
+    exito = agregar_producto_sqlite(nombre, tipo, precio, stock, bd_conexion)
+    if exito:
+        return ('ok', nombre)
+    else:
+        return ('duplicado', nombre)
+
+
+def intentar_actualizar_producto(bd_conexion):
+    """
+    Función interactiva para actualizar un producto usando SQLite.
+    Valida cada campo por separado y solo repite el input del campo inválido.
+    
+    Args:
+        bd_conexion (ConexionSQLite): Conexión ya establecida
+    
+    Returns:
+        tuple: (resultado, nombre) donde resultado puede ser:
+               'ok', 'cancelado', 'vacio', 'invalido', 'no_encontrado'
+    """
+    # Nombre
+    while True:
+        with autocompletar_nombres(lambda prefijo, limite: buscar_por_prefijo_sqlite(bd_conexion, prefijo, limite)):
+            nombre_producto = input('Ingrese el nombre del producto que desea actualizar (o "cancelar" para volver al menú): ')
+        nombre = validar_nombre(nombre_producto)
+        if nombre == "cancelado":
+            print("Operación cancelada. Volviendo al menú principal.\n")
+            return ('cancelado', None)
+        if nombre == "vacio":
+            print("No se ingresó ningún producto, por favor intente nuevamente.\n")
+            continue
+        if nombre == "invalido":
+            print("El producto debe contener solo letras y espacios, sin números ni caracteres especiales.\n")
+            continue
+        break
+
+    # Selección de campo a actualizar
+    while True:
+        print("¿Qué desea actualizar?")
+        print("1. Precio")
+        print("2. Stock")
+        opcion = input("Seleccione una opción: ")
+        if opcion not in ["1", "2"]:
+            print("Opción inválida. Debe elegir 1 o 2.\n")
+            continue
+        break
+
+    # Actualización de precio
+    if opcion == "1":
+        while True:
+            nuevo_precio = input("Ingrese el nuevo precio: ")
+            precio = validar_precio(nuevo_precio)
+            if precio == 'invalido':
+                print("El precio debe ser un número positivo.\n")
+                continue
+            break
+        exito = actualizar_producto_sqlite(nombre, 'precio', precio, bd_conexion)
+        if exito:
+            return ('ok', nombre)
+        else:
+            return ('no_encontrado', nombre)
+
+    # Actualización de stock
+    if opcion == "2":
+        while True:
+            nuevo_stock = input("Ingrese el nuevo stock: ")
+            stock = validar_stock(nuevo_stock)
+            if stock == 'invalido':
+                print("El stock debe ser un número entero no negativo.\n")
+                continue
+            break
+        exito = actualizar_producto_sqlite(nombre, 'stock', stock, bd_conexion)
+        if exito:
+            return ('ok', nombre)
+        else:
+            return ('no_encontrado', nombre)
+
+
+def intentar_eliminar_producto(bd_conexion):
+    """
+    Función interactiva para eliminar un producto usando SQLite
+    
+    Args:
+        bd_conexion (ConexionSQLite): Conexión ya establecida
+        
+    Returns:
+        tuple: (resultado, nombre) donde resultado puede ser:
+               'ok', 'cancelado', 'vacio', 'no_encontrado'
+    """
+
+    try:
+        # Verificar si hay productos
+        consulta_contar = "SELECT COUNT(*) as total FROM productos"
+        resultado = bd_conexion.ejecutar_consulta(consulta_contar, obtener_resultados=True)
+
+        if not resultado or resultado[0]['total'] == 0:
+            print("No hay productos en la base de datos.\n")
+            return ('no_encontrado', None)
+        
+        # Input del usuario
+        with autocompletar_nombres(lambda prefijo, limite: buscar_por_prefijo_sqlite(bd_conexion, prefijo, limite)):
+            nombre_producto = input('Ingrese el nombre del producto que desea eliminar (o "cancelar" para volver al menú): ')
+        nombre = validar_nombre(nombre_producto)
+        
+        if nombre == "cancelado":
+            print("Operación cancelada. Volviendo al menú principal.\n")
+            return ('cancelado', None)
+        if nombre == "vacio":
+            print("No se ingresó ningún producto, por favor intente nuevamente.\n")
+            return ('vacio', None)
+
+        # Confirmación
+        confirmacion = input('¿Está seguro que desea eliminar el producto? (s/n): ').strip().lower()
+        if confirmacion == 's':
+            # Pasar la conexión existente (NO modo_prueba)
+            exito = eliminar_producto_sqlite(nombre, bd_conexion)
+            if exito:
+                return ('ok', nombre)
+            else:
+                return ('no_encontrado', nombre)
+        else:
+            print("Operación cancelada.\n")
+            return ('cancelado', None)
+            
+    except Exception as e:
+        print(f"❌ Error inesperado: {e}")
+        return ('no_encontrado', None)
+
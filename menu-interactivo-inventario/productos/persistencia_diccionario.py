@@ -0,0 +1,267 @@
+"""
+Módulo de persistencia opcional para el backend diccionario.
+
+Cada alta, modificación o baja se agrega a un log de operaciones (una línea
+JSON compacta por operación). Las escrituras se confirman en disco en grupo
+(group commit): un único fsync cada `operaciones_por_fsync` operaciones o cada
+`intervalo_fsync` segundos, lo que ocurra primero. Cada `compactar_cada`
+operaciones se escribe un snapshot completo y se vacía el log, así la
+recuperación al arrancar es snapshot + la cola del log.
+
+La compactación la hace el hilo de fondo: bajo el candado solo se copia el
+inventario y se rota el log (operaciones.log pasa a operaciones.log.anterior);
+el snapshot se serializa y se escribe sin frenar a quien registra operaciones.
+El log anterior se borra recién cuando el snapshot está en disco, y al
+arrancar se leen snapshot + log anterior (si quedó) + log. Reaplicar
+operaciones que el snapshot ya incluye es seguro: guardan valores absolutos.
+
+Contrato de durabilidad: una operación puede perderse ante una caída del
+sistema mientras no haya pasado su fsync (a lo sumo `intervalo_fsync`
+segundos u `operaciones_por_fsync` operaciones; mientras el hilo de fondo
+escribe un snapshot, el límite por tiempo espera a que termine). Al cerrar se
+sincroniza todo.
+"""
+
+import json
+import os
+import shutil
+import threading
+
+ARCHIVO_LOG = 'operaciones.log'
+ARCHIVO_LOG_ANTERIOR = 'operaciones.log.anterior'
+ARCHIVO_SNAPSHOT = 'snapshot.json'
+
+
+def _sincronizar_directorio(directorio):
+    """Hace fsync del directorio, para que los renombres y archivos nuevos sobrevivan a una caída"""
+    descriptor = os.open(directorio, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+def _a_registro(detalles):
+    """Convierte los detalles de un producto en un diccionario serializable"""
+    return {"tipo": detalles["tipo"], "precio": detalles["precio"], "stock": detalles["stock"]}
+
+
+def aplicar_operacion(productos, operacion):
+    """
+    Aplica una operación del log sobre el inventario.
+    Todas las operaciones guardan valores absolutos, por lo que reaplicarlas es seguro.
+
+    Args:
+        productos (dict): Inventario en memoria
+        operacion (list): ['a', nombre, tipo, precio, stock] | ['p', nombre, precio]
+                          | ['s', nombre, stock] | ['e', nombre]
+    """
+    codigo, nombre = operacion[0], operacion[1]
+    if codigo == 'a':
+        productos[nombre] = {"tipo": operacion[2], "precio": operacion[3], "stock": operacion[4]}
+    elif codigo == 'p' and nombre in productos:
+        productos[nombre]["precio"] = operacion[2]
+    elif codigo == 's' and nombre in productos:
+        productos[nombre]["stock"] = operacion[2]
+    elif codigo == 'e':
+        productos.pop(nombre, None)
+
+
+class RegistroOperaciones:
+    """Log de operaciones append-only con group commit y snapshots compactados"""
+
+    def __init__(self, directorio, obtener_estado, operaciones_por_fsync=64,
+                 intervalo_fsync=0.05, compactar_cada=100000):
+        """
+        Args:
+            directorio (str): Carpeta donde se guardan el log y el snapshot
+            obtener_estado (callable): Devuelve el inventario actual (para los snapshots)
+            operaciones_por_fsync (int): Operaciones máximas pendientes antes de un fsync
+            intervalo_fsync (float): Segundos máximos que una operación espera su fsync
+            compactar_cada (int): Operaciones en el log que disparan un snapshot
+        """
+        os.makedirs(directorio, exist_ok=True)
+        self.directorio = directorio
+        self.ruta_log = os.path.join(directorio, ARCHIVO_LOG)
+        self.ruta_log_anterior = os.path.join(directorio, ARCHIVO_LOG_ANTERIOR)
+        self.ruta_snapshot = os.path.join(directorio, ARCHIVO_SNAPSHOT)
+        self.obtener_estado = obtener_estado
+        self.operaciones_por_fsync = operaciones_por_fsync
+        self.intervalo_fsync = intervalo_fsync
+        self.compactar_cada = compactar_cada
+
+        self._archivo = None
+        self._pendientes = 0  # Operaciones escritas pero todavía sin fsync
+        self._en_log = 0      # Operaciones en el log desde el último snapshot
+        self._candado = threading.Lock()
+        self._candado_compactacion = threading.Lock()  # Una compactación por vez
+        self._compactacion_pedida = False
+        self._despertar = threading.Event()
+        self._detener = threading.Event()
+        self._hilo = None
+
+    def cargar(self):
+        """
+        Recupera el inventario leyendo el snapshot y reaplicando el log.
+        Una última línea incompleta (escritura cortada por una caída) se descarta.
+        Luego abre el log para seguir agregando operaciones.
+
+        Returns:
+            dict: Inventario recuperado {nombre: {"tipo", "precio", "stock"}}
+        """
+        productos = {}
+        if os.path.exists(self.ruta_snapshot):
+            with open(self.ruta_snapshot, encoding='utf-8') as archivo:
+                productos = json.load(archivo)
+
+        # El log anterior existe si una compactación no llegó a terminar
+        for ruta in (self.ruta_log_anterior, self.ruta_log):
+            if os.path.exists(ruta):
+                self._en_log += self._reaplicar_log(ruta, productos)
+
+        self._archivo = open(self.ruta_log, 'a', encoding='utf-8')
+        self._hilo = threading.Thread(target=self._trabajar_en_segundo_plano, daemon=True)
+        self._hilo.start()
+        return productos
+
+    @staticmethod
+    def _reaplicar_log(ruta, productos):
+        """
+        Aplica las operaciones de un log sobre el inventario y corta una
+        última línea incompleta
+
+        Returns:
+            int: Cantidad de operaciones aplicadas
+        """
+        aplicadas = 0
+        with open(ruta, 'rb+') as archivo:
+            bytes_validos = 0
+            for linea in archivo:
+                try:
+                    operacion = json.loads(linea)
+                except ValueError:
+                    break
+                if not linea.endswith(b'\n'):
+                    break
+                aplicar_operacion(productos, operacion)
+                bytes_validos += len(linea)
+                aplicadas += 1
+            # Se corta la línea incompleta para que las nuevas operaciones no queden pegadas a ella
+            archivo.truncate(bytes_validos)
+        return aplicadas
+
+    def registrar(self, *operacion):
+        """
+        Agrega una operación al log (ver aplicar_operacion para el formato).
+        Hace fsync si se alcanzó el tamaño del grupo y, si el log creció
+        demasiado, le pide al hilo de fondo que lo compacte.
+        """
+        linea = json.dumps(operacion, ensure_ascii=False, separators=(',', ':'))
+        with self._candado:
+            self._archivo.write(linea + '\n')
+            self._pendientes += 1
+            self._en_log += 1
+            if self._pendientes >= self.operaciones_por_fsync:
+                self._sincronizar()
+            if self._en_log >= self.compactar_cada and not self._compactacion_pedida:
+                self._compactacion_pedida = True
+                self._despertar.set()
+
+    def _sincronizar(self):
+        """Vuelca el buffer y hace fsync (requiere tener el candado)"""
+        if self._pendientes:
+            self._archivo.flush()
+            os.fsync(self._archivo.fileno())
+            self._pendientes = 0
+
+    def sincronizar(self):
+        """Garantiza que todas las operaciones registradas estén en disco"""
+        with self._candado:
+            self._sincronizar()
+
+    def _trabajar_en_segundo_plano(self):
+        """
+        Hilo de fondo: confirma en disco las operaciones que esperan más de
+        intervalo_fsync y compacta el log cuando registrar() lo pide
+        """
+        while not self._detener.is_set():
+            self._despertar.wait(self.intervalo_fsync)
+            self._despertar.clear()
+            self.sincronizar()
+            if self._compactacion_pedida and not self._detener.is_set():
+                try:
+                    self.compactar()
+                except OSError as e:
+                    # El log anterior queda en disco: la próxima compactación lo reintenta
+                    print(f"❌ Error compactando el log de operaciones: {e}")
+                finally:
+                    self._compactacion_pedida = False
+
+    def compactar(self):
+        """
+        Escribe un snapshot del inventario completo y vacía el log.
+
+        Bajo el candado solo se copia el inventario y se rota el log; la
+        serialización y el fsync del snapshot se hacen sin el candado, así
+        registrar() no se frena. El snapshot se escribe en un archivo temporal
+        y se renombra de forma atómica: una caída a mitad de camino deja el
+        snapshot anterior y el log anterior intactos.
+        """
+        with self._candado_compactacion:
+            with self._candado:
+                self._sincronizar()
+                # Copia de los pares (nombre, registro): list() la hace de una vez, sin
+                # código Python en el medio, así otro hilo no cambia el diccionario a mitad
+                # de camino. Los registros se leen después, sin el candado: si alguno ya
+                # tiene un cambio posterior, ese cambio también está en el log nuevo y
+                # reaplicarlo al arrancar da el mismo resultado
+                elementos = list(self.obtener_estado().items())
+                self._rotar_log()
+
+            estado = {nombre: _a_registro(detalles) for nombre, detalles in elementos}
+            ruta_temporal = self.ruta_snapshot + '.tmp'
+            with open(ruta_temporal, 'w', encoding='utf-8') as archivo:
+                json.dump(estado, archivo, ensure_ascii=False, separators=(',', ':'))
+                archivo.flush()
+                os.fsync(archivo.fileno())
+            os.replace(ruta_temporal, self.ruta_snapshot)
+            # El renombre tiene que estar en disco antes de borrar el log que cubre
+            _sincronizar_directorio(self.directorio)
+            os.remove(self.ruta_log_anterior)
+
+    def _rotar_log(self):
+        """
+        Pasa las operaciones del log al log anterior y empieza un log vacío
+        (requiere tener el candado y el log sincronizado). El archivo abierto se
+        cierra recién después de moverlo: si falla, el log sigue como estaba
+        """
+        if os.path.exists(self.ruta_log_anterior):
+            # Quedó de una compactación que falló: se le agregan las operaciones nuevas
+            with open(self.ruta_log, 'rb') as origen, open(self.ruta_log_anterior, 'ab') as destino:
+                shutil.copyfileobj(origen, destino)
+                destino.flush()
+                os.fsync(destino.fileno())
+            os.remove(self.ruta_log)
+        else:
+            os.replace(self.ruta_log, self.ruta_log_anterior)
+        self._archivo.close()
+        self._archivo = open(self.ruta_log, 'a', encoding='utf-8')
+        _sincronizar_directorio(self.directorio)
+        self._en_log = 0
+
+    def cerrar(self, compactar=True):
+        """
+        Detiene el hilo de sincronización y cierra el log
+
+        Args:
+            compactar (bool): Si True, deja un snapshot para que el próximo arranque sea rápido
+        """
+        self._detener.set()
+        self._despertar.set()
+        if self._hilo:
+            self._hilo.join()
+        if compactar and (self._en_log or os.path.exists(self.ruta_log_anterior)):
+            self.compactar()
+        with self._candado:
+            self._sincronizar()
+            self._archivo.close()
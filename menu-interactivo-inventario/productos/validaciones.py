@@ -1,6 +1,7 @@
 # Funciones para validar entradas del usuario
 
 import re
+import unicodedata
 
 # --- Funciones auxiliares ---
 def validar_nombre(texto: str, permitir_cancelar=True):
@@ -26,6 +27,18 @@ def validar_nombre(texto: str, permitir_cancelar=True):
     #si todo está bien, retorno el texto limpio
     return texto
 
+def normalizar_clave(nombre: str):
+    """
+    Devuelve la clave de búsqueda de un nombre: minúsculas y sin tildes.
+    - "Limón" y "limon" tienen la misma clave: 'limon'.
+    - Igual que la collation utf8mb4_unicode_ci de MySQL, la ñ se compara como n.
+    """
+    nombre = nombre.strip().lower()
+    if nombre.isascii():
+        return nombre
+    descompuesto = unicodedata.normalize('NFD', nombre)
+    return ''.join(caracter for caracter in descompuesto if not unicodedata.combining(caracter))
+
 def validar_tipo(tipo_str: str):
     """
     Valida que el tipo sea 'fruta' o 'verdura'.
@@ -4,5 +4,17 @@ Paquete que contiene todos los tests del sistema:
 
 - test_validaciones.py: Tests de funciones puras de validación
 - test_operaciones.py: Tests de operaciones CRUD con estado
+- test_operaciones_sqlite.py: Tests del backend SQLite
+- test_backends.py: Tests del registro de backends
+- test_persistencia_diccionario.py: Tests del log de operaciones del diccionario
+- test_inventario_memoria.py: Tests de los registros compactos en memoria
+- test_cache_consultas.py: Tests de la caché de lecturas de MySQL
+- test_buffer_escritura.py: Tests del buffer de escritura diferida
+- test_estadisticas_consultas.py: Tests de los tiempos de las consultas y el log de lentas
+- test_metricas.py: Tests de las métricas Prometheus y el endpoint /metrics
+- test_cli_inventario.py: Tests de la CLI no interactiva y sus códigos de salida
+- test_importacion.py: Tests de la importación de archivos CSV/JSONL
+- test_importacion_paralela.py: Tests de la importación en paralelo
+- test_exportacion.py: Tests de la exportación del catálogo
 - test_integracion_menu.py: Tests de integración del menú completo
 """
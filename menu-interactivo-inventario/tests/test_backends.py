@@ -0,0 +1,138 @@
+"""
+Unit tests para el registro de backends de almacenamiento.
+
+Este módulo prueba:
+- Resolución de backends por nombre (incluye registro por ruta 'modulo:Clase')
+- Importación diferida: el modo diccionario no carga mysql.connector
+- Delegación de las operaciones interactivas al módulo de cada backend
+- Interfaz abstracta: un backend incompleto no se puede crear
+
+Para ejecutar:
+    python -m unittest tests.test_backends -v
+"""
+
+import unittest
+from unittest.mock import patch
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from io import StringIO
+from contextlib import redirect_stdout
+
+# Agregar el directorio padre al path para poder importar los módulos
+DIRECTORIO_PROYECTO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, DIRECTORIO_PROYECTO)
+
+from productos.backends import (
+    BackendConConexion,
+    BackendDiccionario,
+    BackendInventario,
+    BackendSQLite,
+    obtener_backend,
+    registrar_backend,
+    backends_disponibles
+)
+from productos.operaciones_diccionario import productos
+
+
+class TestBackends(unittest.TestCase):
+    """Tests para el registro y la interfaz común de backends"""
+
+    def setUp(self):
+        productos.clear()
+
+    def tearDown(self):
+        productos.clear()
+
+    def test_01_backends_registrados(self):
+        """Test: Los tres modos conocidos están registrados"""
+        for nombre in ['diccionario', 'bd', 'sqlite']:
+            self.assertIn(nombre, backends_disponibles())
+
+    def test_02_obtener_backend_por_nombre(self):
+        """Test: obtener_backend crea la clase correcta sin distinguir mayúsculas"""
+        self.assertIsInstance(obtener_backend('Diccionario'), BackendDiccionario)
+        self.assertIsInstance(obtener_backend('sqlite'), BackendSQLite)
+
+    def test_03_obtener_backend_desconocido(self):
+        """Test: Un nombre no registrado devuelve None"""
+        self.assertIsNone(obtener_backend('cassandra'))
+
+    def test_04_registrar_backend_por_ruta(self):
+        """Test: Un backend registrado como 'modulo:Clase' se importa al pedirlo"""
+        registrar_backend('memoria', 'productos.backends:BackendDiccionario')
+        self.assertIsInstance(obtener_backend('memoria'), BackendDiccionario)
+
+    def test_05_modo_diccionario_no_importa_mysql(self):
+        """Test: Abrir el backend diccionario no carga mysql.connector"""
+        codigo = (
+            "import sys\n"
+            "from productos.backends import obtener_backend\n"
+            "obtener_backend('diccionario').abrir()\n"
+            "print('mysql.connector' in sys.modules)\n"
+        )
+        salida = subprocess.run(
+            [sys.executable, "-c", codigo], cwd=DIRECTORIO_PROYECTO,
+            capture_output=True, text=True, check=True
+        )
+        self.assertEqual(salida.stdout.strip(), "False")
+
+    @patch('builtins.input', side_effect=['manzana', 'fruta', '100', '5'])
+    def test_06_backend_diccionario_delega(self, mock_input):
+        """Test: El backend diccionario usa operaciones_diccionario"""
+        backend = obtener_backend('diccionario')
+        self.assertTrue(backend.abrir())
+        with redirect_stdout(StringIO()):
+            estado, nombre = backend.intentar_agregar_producto()
+        self.assertEqual((estado, nombre), ('ok', 'manzana'))
+        self.assertIn('manzana', productos)
+
+    @patch('builtins.input', side_effect=['manzana', 'fruta', '100', '5'])
+    def test_07_backend_sqlite_maneja_su_conexion(self, mock_input):
+        """Test: El backend SQLite abre y cierra su propia conexión"""
+        directorio = tempfile.mkdtemp()
+        try:
+            backend = obtener_backend('sqlite', modo_prueba=True,
+                                      ruta=os.path.join(directorio, "backend.sqlite3"))
+            with redirect_stdout(StringIO()):
+                self.assertTrue(backend.abrir())
+                estado, _ = backend.intentar_agregar_producto()
+                backend.cerrar()
+            self.assertEqual(estado, 'ok')
+            self.assertIsNone(backend.bd_conexion)
+        finally:
+            shutil.rmtree(directorio, ignore_errors=True)
+
+
+    def test_08_backend_mysql_buffer_desde_entorno(self):
+        """Test: El buffer de escritura de MySQL se configura con DB_BUFFER_INTERVALO"""
+        with patch.dict(os.environ, {'DB_BUFFER_INTERVALO': '0.25'}):
+            self.assertEqual(obtener_backend('bd').intervalo_buffer, 0.25)
+        with patch.dict(os.environ, {'DB_BUFFER_INTERVALO': ''}):
+            self.assertEqual(obtener_backend('bd').intervalo_buffer, 0)
+
+    def test_09_backend_incompleto_no_se_crea(self):
+        """Test: Un backend sin todas las operaciones obligatorias falla al crearlo"""
+        class BackendSoloLectura(BackendInventario):
+            def iterar_productos(self):
+                yield {"nombre": "kiwi", "tipo": "fruta", "precio": 1.0, "stock": 1}
+
+        with self.assertRaises(TypeError):
+            BackendSoloLectura()
+        with self.assertRaises(TypeError):
+            BackendConConexion()
+
+        class BackendLista(BackendSoloLectura):
+            intentar_agregar_producto = mostrar_productos = lambda self: ('ok', None)
+            intentar_actualizar_producto = intentar_eliminar_producto = lambda self: ('ok', None)
+            agregar = lambda self, nombre, tipo, precio, stock: False
+            actualizar = lambda self, nombre, campo, valor: False
+            eliminar = lambda self, nombre: False
+
+        self.assertEqual(BackendLista().contar_productos(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+"""
+Unit tests para el buffer de escritura diferida de MySQL.
+
+Este módulo prueba la combinación de cambios en memoria (no necesita servidor;
+el vaciado contra la base de datos se prueba en test_operaciones_bd):
+- Precio y stock absolutos: gana el último
+- Ajustes relativos: se suman, y un stock absoluto los reemplaza
+- Reencolado de un lote fallido sin pisar cambios más nuevos
+- Vaciado inmediato al alcanzar max_pendientes
+- Errores transitorios: el lote se reencola y el hilo sigue vivo
+- Otros errores: solo se descartan los cambios que no se pueden guardar
+
+Para ejecutar:
+    python -m unittest tests.test_buffer_escritura -v
+"""
+
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import time
+from io import StringIO
+from contextlib import redirect_stdout
+from mysql.connector import Error, errorcode
+
+# Agregar el directorio padre al path para poder importar los módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from productos.buffer_escritura import BufferEscritura
+
+
+class TestBufferEscritura(unittest.TestCase):
+    """Tests para la combinación de cambios de BufferEscritura"""
+
+    def setUp(self):
+        """Buffer sin conexión ni hilo: solo se prueba el encolado"""
+        self.buffer = BufferEscritura(None, max_pendientes=3)
+
+    def _pendiente(self, clave):
+        cambio = self.buffer._pendientes[clave]
+        return (cambio.nombre, cambio.precio, cambio.stock, cambio.delta)
+
+    def test_01_combina_por_producto(self):
+        """Test: Varios cambios de un producto (sin importar tildes) ocupan una sola entrada"""
+        self.buffer.actualizar("limón", "precio", 10.0)
+        self.buffer.actualizar("Limon", "precio", 12.0)
+        self.buffer.ajustar_stock("limón", -2)
+        self.buffer.ajustar_stock("limón", -3)
+        self.assertEqual(len(self.buffer), 1)
+        self.assertEqual(self._pendiente("limon"), ("limón", 12.0, None, -5))
+
+    def test_02_stock_absoluto_reemplaza_ajustes(self):
+        """Test: Un stock absoluto descarta los ajustes anteriores, no los posteriores"""
+        self.buffer.ajustar_stock("pera", -3)
+        self.buffer.actualizar("pera", "stock", 40)
+        self.buffer.ajustar_stock("pera", 2)
+        self.assertEqual(self._pendiente("pera"), ("pera", None, 40, 2))
+
+    def test_03_campo_invalido(self):
+        """Test: Solo se aceptan precio y stock"""
+        self.assertFalse(self.buffer.actualizar("pera", "tipo", "fruta"))
+        self.assertEqual(len(self.buffer), 0)
+
+    def test_04_reencolar_respeta_cambios_nuevos(self):
+        """Test: Al reencolar un lote fallido, lo encolado después tiene prioridad"""
+        self.buffer.actualizar("pera", "precio", 1.0)
+        self.buffer.actualizar("pera", "stock", 10)
+        self.buffer.ajustar_stock("pera", -1)
+        self.buffer.ajustar_stock("uva", -4)
+        lote, self.buffer._pendientes = self.buffer._pendientes, {}
+
+        self.buffer.actualizar("pera", "precio", 2.0)
+        self.buffer.ajustar_stock("pera", -2)
+        self.buffer.actualizar("uva", "stock", 7)
+        self.buffer._reencolar(lote)
+
+        self.assertEqual(self._pendiente("pera"), ("pera", 2.0, 10, -3))
+        self.assertEqual(self._pendiente("uva"), ("uva", None, 7, 0))
+
+    def test_05_pide_vaciado_al_llenarse(self):
+        """Test: Al alcanzar max_pendientes productos se despierta al hilo de vaciado"""
+        self.buffer.ajustar_stock("pera", 1)
+        self.buffer.ajustar_stock("pera", 1)
+        self.buffer.ajustar_stock("uva", 1)
+        self.assertFalse(self.buffer._despertar.is_set())
+        self.buffer.ajustar_stock("kiwi", 1)
+        self.assertTrue(self.buffer._despertar.is_set())
+
+    def test_06_vaciar_sin_cambios(self):
+        """Test: Vaciar un buffer vacío no toca la base de datos"""
+        self.assertEqual(self.buffer.vaciar(), 0)
+
+    @patch('productos.buffer_escritura.aplicar_cambios_bd_lote',
+           side_effect=Error("Lost connection to MySQL server", errno=errorcode.CR_SERVER_LOST))
+    def test_07_error_transitorio_reencola(self, mock_aplicar):
+        """Test: Si se corta la conexión, el lote queda encolado para el próximo vaciado"""
+        self.buffer.ajustar_stock("pera", -2)
+        with redirect_stdout(StringIO()) as salida:
+            self.assertEqual(self.buffer.vaciar(), 0)
+        self.assertIn("se reintentará", salida.getvalue())
+        self.assertEqual(self._pendiente("pera"), ("pera", None, None, -2))
+        self.assertEqual(self.buffer.descartados, 0)
+
+    @patch('productos.buffer_escritura.aplicar_cambios_bd_lote',
+           side_effect=[Error("Lock wait timeout exceeded", errno=errorcode.ER_LOCK_WAIT_TIMEOUT), (0, 1)])
+    def test_08_hilo_sigue_vivo_tras_un_error(self, mock_aplicar):
+        """Test: El hilo de fondo sobrevive a un vaciado fallido y escribe en el siguiente"""
+        buffer = BufferEscritura(None, intervalo=0.01)
+        buffer.ajustar_stock("pera", -2)
+        with redirect_stdout(StringIO()):
+            buffer.iniciar()
+            limite = time.monotonic() + 5
+            while buffer.escritos == 0 and time.monotonic() < limite:
+                time.sleep(0.01)
+            self.assertTrue(buffer._hilo.is_alive())
+            buffer.cerrar()
+        self.assertEqual((buffer.escritos, len(buffer), mock_aplicar.call_count), (1, 0, 2))
+
+    def test_09_precio_que_no_entra_se_descarta_solo(self):
+        """Test: Un precio fuera de rango para DECIMAL(10,2) no frena a los demás cambios"""
+        escritos = []
+
+        def aplicar(valores, ajustes, bd_conexion):
+            # Como MySQL: la transacción entera falla si algún precio no entra en la columna
+            if any(precio is not None and not abs(precio) < 1e8 for _, precio, _ in valores):
+                raise Error("Out of range value for column 'precio'", errno=errorcode.ER_WARN_DATA_OUT_OF_RANGE)
+            escritos.extend(nombre for nombre, *_ in valores + ajustes)
+            return (len(valores), len(ajustes))
+
+        buffer = BufferEscritura(None, al_vaciar=lambda nombres: None)
+        for i in range(10):
+            buffer.actualizar(f"fruta {i}", "precio", 1.5)
+        buffer.actualizar("fruta 4", "precio", 1e20)
+        buffer.actualizar("pera", "precio", float('nan'))
+        buffer.ajustar_stock("uva", -1)
+        with patch('productos.buffer_escritura.aplicar_cambios_bd_lote', side_effect=aplicar):
+            with redirect_stdout(StringIO()) as salida:
+                self.assertEqual(buffer.vaciar(), 10)
+
+        self.assertNotIn("se reintentará", salida.getvalue())
+        self.assertIn("'fruta 4'", salida.getvalue())
+        self.assertEqual(sorted(escritos), sorted([f"fruta {i}" for i in range(10) if i != 4] + ["uva"]))
+        self.assertEqual((buffer.escritos, buffer.descartados, len(buffer)), (10, 2, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
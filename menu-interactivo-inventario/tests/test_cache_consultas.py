@@ -0,0 +1,111 @@
+"""
+Unit tests para la caché de lecturas de MySQL (no necesitan servidor).
+
+Este módulo prueba:
+- Desalojo LRU al superar la capacidad
+- Vencimiento de entradas por TTL
+- Invalidación precisa por rango de nombres
+- Contadores de aciertos y fallos
+- Caché desactivada por defecto en DatabaseConnection (se activa con DB_CACHE_TAMANO)
+
+Para ejecutar:
+    python -m unittest tests.test_cache_consultas -v
+"""
+
+import unittest
+from unittest.mock import patch
+import os
+import sys
+
+# Agregar el directorio padre al path para poder importar los módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from productos.cache_consultas import CacheConsultas
+from productos.database import DatabaseConnection
+
+
+class TestCacheConsultas(unittest.TestCase):
+    """Tests para CacheConsultas"""
+
+    def test_01_guarda_y_devuelve(self):
+        """Test: Un valor guardado se devuelve hasta que vence"""
+        cache = CacheConsultas()
+        self.assertIsNone(cache.obtener('a'))
+        cache.guardar('a', [1, 2])
+        self.assertEqual(cache.obtener('a'), [1, 2])
+
+    def test_02_desaloja_la_menos_usada(self):
+        """Test: Al superar la capacidad se descarta la entrada usada hace más tiempo"""
+        cache = CacheConsultas(capacidad=2)
+        cache.guardar('a', 1)
+        cache.guardar('b', 2)
+        cache.obtener('a')
+        cache.guardar('c', 3)
+        self.assertIsNone(cache.obtener('b'))
+        self.assertEqual(cache.obtener('a'), 1)
+        self.assertEqual(cache.obtener('c'), 3)
+        self.assertEqual(cache.estadisticas()['desalojos'], 1)
+
+    def test_03_vence_por_ttl(self):
+        """Test: Una entrada deja de devolverse al pasar el TTL"""
+        cache = CacheConsultas(ttl=10)
+        with patch('productos.cache_consultas.time.monotonic', return_value=100.0):
+            cache.guardar('a', 1)
+        with patch('productos.cache_consultas.time.monotonic', return_value=109.0):
+            self.assertEqual(cache.obtener('a'), 1)
+        with patch('productos.cache_consultas.time.monotonic', return_value=110.0):
+            self.assertIsNone(cache.obtener('a'))
+        self.assertEqual(cache.estadisticas()['vencidas'], 1)
+
+    def test_04_invalida_solo_rangos_que_contienen_el_nombre(self):
+        """Test: Una escritura descarta solo las entradas cuyo rango incluye el nombre"""
+        cache = CacheConsultas()
+        cache.guardar('pagina 1', 'a-f', (None, 'frutilla'))
+        cache.guardar('pagina 2', 'f-m', ('frutilla', 'manzana'))
+        cache.guardar('ultima', 'm-', ('manzana', None))
+        cache.guardar('kiwi', 'kiwi', ('kiwi', 'kiwi'))
+        cache.invalidar_nombre('limon')
+        self.assertEqual(cache.obtener('pagina 1'), 'a-f')
+        self.assertIsNone(cache.obtener('pagina 2'))
+        self.assertEqual(cache.obtener('ultima'), 'm-')
+        self.assertEqual(cache.obtener('kiwi'), 'kiwi')
+
+        cache.invalidar_nombre('manzana')
+        self.assertIsNone(cache.obtener('ultima'))
+        cache.invalidar_nombre('zapallo')
+        self.assertEqual(cache.estadisticas()['invalidaciones'], 2)
+
+    def test_05_limpiar_descarta_todo(self):
+        """Test: limpiar() vacía la caché, incluso las entradas sin rango"""
+        cache = CacheConsultas()
+        cache.guardar('a', 1)
+        cache.guardar('b', 2, ('b', 'b'))
+        cache.limpiar()
+        self.assertIsNone(cache.obtener('a'))
+        self.assertIsNone(cache.obtener('b'))
+        self.assertEqual(cache.estadisticas()['entradas'], 0)
+
+    def test_06_contadores(self):
+        """Test: Aciertos, fallos y tasa de aciertos"""
+        cache = CacheConsultas()
+        cache.obtener('a')
+        cache.guardar('a', 1)
+        cache.obtener('a')
+        cache.obtener('a')
+        cache.obtener('a')
+        estadisticas = cache.estadisticas()
+        self.assertEqual(estadisticas['aciertos'], 3)
+        self.assertEqual(estadisticas['fallos'], 1)
+        self.assertAlmostEqual(estadisticas['tasa_aciertos'], 0.75)
+
+    def test_07_desactivada_por_defecto(self):
+        """Test: Sin DB_CACHE_TAMANO la conexión no cachea; con un tamaño, sí"""
+        with patch.dict(os.environ, {'DB_CACHE_TAMANO': ''}):
+            self.assertIsNone(DatabaseConnection(modo_prueba=True).cache)
+        with patch.dict(os.environ, {'DB_CACHE_TAMANO': '64', 'DB_CACHE_TTL': '5'}):
+            cache = DatabaseConnection(modo_prueba=True).cache
+        self.assertEqual((cache.capacidad, cache.ttl), (64, 5.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
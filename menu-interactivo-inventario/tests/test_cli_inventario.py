@@ -0,0 +1,155 @@
+"""
+Unit tests para la CLI no interactiva (cli_inventario.py).
+
+Este módulo prueba:
+- Subcomandos agregar, actualizar, eliminar, listar, exportar e importar sin input()
+- Lectura de muchos elementos desde stdin con "-"
+- Códigos de salida (todo procesado, rechazos/duplicados, argumentos inválidos, error)
+- Backends diccionario (con persistencia) y SQLite
+
+Para ejecutar:
+    python -m unittest tests.test_cli_inventario -v
+"""
+
+import unittest
+from unittest.mock import patch
+import gzip
+import json
+import os
+import shutil
+import sys
+import tempfile
+from io import StringIO
+from contextlib import redirect_stderr, redirect_stdout
+
+# Agregar el directorio padre al path para poder importar los módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cli_inventario import SALIDA_ERROR, SALIDA_OK, SALIDA_PARCIAL, SALIDA_USO, main
+from productos.operaciones_diccionario import productos
+
+
+class TestCLIInventario(unittest.TestCase):
+    """Tests para los subcomandos de la CLI"""
+
+    def setUp(self):
+        productos.clear()
+        self.directorio = tempfile.mkdtemp()
+        self.entorno = patch.dict(os.environ, {
+            'DICCIONARIO_DIR_PERSISTENCIA': self.directorio,
+            'SQLITE_RUTA': os.path.join(self.directorio, "cli.sqlite3"),
+            'TEST_SQLITE_RUTA': os.path.join(self.directorio, "cli_test.sqlite3"),
+        })
+        self.entorno.start()
+
+    def tearDown(self):
+        self.entorno.stop()
+        productos.clear()
+        shutil.rmtree(self.directorio, ignore_errors=True)
+
+    def ejecutar(self, *argumentos, entrada=None):
+        """Ejecuta la CLI y devuelve (código, stdout, stderr)"""
+        salida, errores = StringIO(), StringIO()
+        with patch('sys.stdin', StringIO(entrada or '')), redirect_stdout(salida), redirect_stderr(errores):
+            try:
+                codigo = main(list(argumentos))
+            except SystemExit as e:
+                codigo = e.code
+        productos.clear()  # Cada invocación es un proceso nuevo: el estado vuelve del disco
+        return codigo, salida.getvalue(), errores.getvalue()
+
+    def listar(self, modo='diccionario'):
+        codigo, salida, _ = self.ejecutar('--modo', modo, 'listar', '--formato', 'jsonl')
+        self.assertEqual(codigo, SALIDA_OK)
+        return [json.loads(linea) for linea in salida.splitlines()]
+
+    def test_01_agregar_y_listar(self):
+        """Test: agregar recibe varios productos y listar los devuelve en JSONL"""
+        codigo, salida, _ = self.ejecutar('--modo', 'diccionario', 'agregar',
+                                          'manzana,fruta,100,5', 'Zanahoria,verdura,50.5,10')
+        self.assertEqual(codigo, SALIDA_OK)
+        self.assertIn('2 procesados', salida)
+        self.assertEqual(self.listar(), [
+            {"nombre": "manzana", "tipo": "fruta", "precio": 100.0, "stock": 5},
+            {"nombre": "zanahoria", "tipo": "verdura", "precio": 50.5, "stock": 10},
+        ])
+
+    def test_02_rechazados_y_duplicados_salen_con_1(self):
+        """Test: Filas inválidas y duplicadas se informan por stderr y la salida es 1"""
+        codigo, salida, errores = self.ejecutar('--modo', 'diccionario', 'agregar',
+                                                'manzana,fruta,100,5', 'Manzana,fruta,1,1',
+                                                'kiwi,carne,1,1', 'pera,fruta,-3,1', 'solo_nombre')
+        self.assertEqual(codigo, SALIDA_PARCIAL)
+        self.assertIn('1 procesados, 3 rechazados, 1 duplicados', salida)
+        self.assertIn("tipo inválido", errores)
+        self.assertIn("precio inválido", errores)
+        self.assertEqual(len(self.listar()), 1)
+
+    def test_03_actualizar_desde_stdin(self):
+        """Test: actualizar lee pares nombre=valor de stdin; los inexistentes dan salida 1"""
+        self.ejecutar('--modo', 'diccionario', 'agregar', 'manzana,fruta,100,5', 'pera,fruta,80,3')
+        codigo, salida, _ = self.ejecutar('--modo', 'diccionario', 'actualizar', 'stock', '-',
+                                          entrada="manzana=7\n\npera=9\nkiwi=1\n")
+        self.assertEqual(codigo, SALIDA_PARCIAL)
+        self.assertIn('2 procesados, 0 rechazados, 0 duplicados, 1 no encontrados', salida)
+        self.assertEqual([p['stock'] for p in self.listar()], [7, 9])
+
+    def test_04_eliminar(self):
+        """Test: eliminar borra varios productos en una invocación"""
+        self.ejecutar('--modo', 'diccionario', 'agregar', 'manzana,fruta,100,5', 'pera,fruta,80,3')
+        codigo, _, _ = self.ejecutar('--modo', 'diccionario', 'eliminar', 'manzana', 'pera')
+        self.assertEqual(codigo, SALIDA_OK)
+        self.assertEqual(self.listar(), [])
+
+    def test_05_importar_csv_en_sqlite(self):
+        """Test: importar carga un CSV en SQLite con lotes pequeños"""
+        ruta_csv = os.path.join(self.directorio, "productos.csv")
+        with open(ruta_csv, 'w', encoding='utf-8') as archivo:
+            archivo.write("nombre,tipo,precio,stock\nlimón,fruta,2,3\nlimon,fruta,2,3\n"
+                          "papa,verdura,1.5,40\nbatata,verdura,abc,1\n")
+        codigo, salida, errores = self.ejecutar('--modo', 'sqlite', '--tamano-lote', '2', '-q',
+                                                'importar', ruta_csv)
+        self.assertEqual(codigo, SALIDA_PARCIAL)
+        self.assertIn('2 procesados, 2 rechazados, 0 duplicados', salida)
+        self.assertIn('nombre repetido en el archivo', errores)
+        self.assertIn('filas/s', errores)
+        self.assertEqual([p['nombre'] for p in self.listar('sqlite')], ['limón', 'papa'])
+
+    def test_06_errores_de_uso_y_de_archivo(self):
+        """Test: Argumentos inválidos salen con 2 y un archivo inexistente con 3"""
+        codigo, _, _ = self.ejecutar('--modo', 'diccionario', 'actualizar', 'tipo', 'manzana=fruta')
+        self.assertEqual(codigo, SALIDA_USO)
+        codigo, _, _ = self.ejecutar('--modo', 'diccionario', '--tamano-lote', '0', 'listar')
+        self.assertEqual(codigo, SALIDA_USO)
+        codigo, _, errores = self.ejecutar('--modo', 'diccionario', 'importar',
+                                           os.path.join(self.directorio, "no_existe.csv"))
+        self.assertEqual(codigo, SALIDA_ERROR)
+        self.assertIn('❌ Error', errores)
+
+    def test_07_exportar_comprimido(self):
+        """Test: exportar escribe el catálogo comprimido según la extensión"""
+        self.ejecutar('--modo', 'sqlite', 'agregar', 'manzana,fruta,100,5', 'pera,fruta,80,3')
+        ruta = os.path.join(self.directorio, "respaldo.jsonl.gz")
+        codigo, salida, errores = self.ejecutar('--modo', 'sqlite', 'exportar', ruta)
+        self.assertEqual(codigo, SALIDA_OK)
+        self.assertEqual(salida, '')
+        self.assertIn('2 productos exportados', errores)
+        with gzip.open(ruta, 'rt', encoding='utf-8') as archivo:
+            self.assertEqual([json.loads(linea)['nombre'] for linea in archivo], ['manzana', 'pera'])
+
+    def test_08_importar_en_paralelo(self):
+        """Test: importar --procesos valida en varios procesos; con stdin es un error de uso"""
+        ruta_csv = os.path.join(self.directorio, "productos.csv")
+        with open(ruta_csv, 'w', encoding='utf-8') as archivo:
+            archivo.write("nombre,tipo,precio,stock\nlimón,fruta,2,3\nlimon,fruta,2,3\npapa,verdura,1.5,40\n")
+        codigo, salida, _ = self.ejecutar('--modo', 'sqlite', '-q', 'importar', ruta_csv, '--procesos', '2')
+        self.assertEqual(codigo, SALIDA_PARCIAL)
+        self.assertIn('2 procesados, 1 rechazados', salida)
+        self.assertEqual([p['nombre'] for p in self.listar('sqlite')], ['limón', 'papa'])
+
+        codigo, _, _ = self.ejecutar('--modo', 'sqlite', 'importar', '-', '--procesos', '2')
+        self.assertEqual(codigo, SALIDA_USO)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+Unit tests para la medición de tiempos de las consultas (no necesitan servidor).
+
+Este módulo prueba:
+- Agrupación de consultas por texto normalizado (listas IN y lotes UNION ALL)
+- Forma de los parámetros sin sus valores
+- Percentiles del histograma de latencias
+- Log de consultas lentas (umbral, EXPLAIN opcional y archivo JSON por línea)
+
+Para ejecutar:
+    python -m unittest tests.test_estadisticas_consultas -v
+"""
+
+import unittest
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+# Agregar el directorio padre al path para poder importar los módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from productos.estadisticas_consultas import (
+    EstadisticasConsultas,
+    HistogramaLatencia,
+    forma_parametros,
+    normalizar_consulta
+)
+
+
+class TestEstadisticasConsultas(unittest.TestCase):
+    """Tests para EstadisticasConsultas y sus funciones auxiliares"""
+
+    def test_01_normalizar_consulta(self):
+        """Test: Espacios, listas IN y lotes UNION ALL de cualquier largo se agrupan"""
+        self.assertEqual(
+            normalizar_consulta("SELECT nombre\n    FROM productos WHERE nombre IN (%s, %s, %s)"),
+            "SELECT nombre FROM productos WHERE nombre IN (...)"
+        )
+        lote = " UNION ALL ".join(["SELECT %s AS nombre, %s AS delta"] * 4)
+        self.assertEqual(
+            normalizar_consulta(f"UPDATE productos p JOIN ({lote}) a ON p.nombre = a.nombre"),
+            "UPDATE productos p JOIN (SELECT %s AS nombre, %s AS delta UNION ALL ...) a ON p.nombre = a.nombre"
+        )
+
+    def test_02_forma_parametros(self):
+        """Test: Se describen los tipos de los parámetros, nunca sus valores"""
+        self.assertEqual(forma_parametros(("manzana", 1.5, 10)), "(str, float, int)")
+        self.assertEqual(forma_parametros([("pera", 1), ("uva", 2)]), "2 × (str, int)")
+        self.assertEqual(forma_parametros(None), "()")
+        self.assertNotIn("manzana", forma_parametros(("manzana",)))
+
+    def test_03_percentiles(self):
+        """Test: Los percentiles del histograma tienen un error acotado (~9 %)"""
+        histograma = HistogramaLatencia()
+        for milisegundos in range(1, 1001):
+            histograma.registrar(milisegundos / 1000)
+        self.assertEqual(histograma.cantidad, 1000)
+        self.assertEqual(histograma.maximo, 1.0)
+        for porcentaje, esperado in [(50, 0.5), (95, 0.95), (99, 0.99)]:
+            self.assertGreaterEqual(histograma.percentil(porcentaje), esperado * 0.99)
+            self.assertLessEqual(histograma.percentil(porcentaje), esperado * 1.1)
+
+    def test_04_resumen_por_sentencia(self):
+        """Test: El resumen agrupa por sentencia y ordena por tiempo total"""
+        estadisticas = EstadisticasConsultas(umbral_lenta=None)
+        for _ in range(3):
+            estadisticas.registrar("SELECT 1", (), 0.001)
+        estadisticas.registrar("DELETE FROM productos WHERE nombre = %s", ("pera",), 0.5)
+        resumen = estadisticas.resumen()
+        self.assertEqual(list(resumen), ["DELETE FROM productos WHERE nombre = %s", "SELECT 1"])
+        self.assertEqual(resumen["SELECT 1"]["cantidad"], 3)
+        self.assertEqual(resumen["DELETE FROM productos WHERE nombre = %s"]["max_ms"], 500.0)
+
+    def test_05_consultas_lentas_con_explain(self):
+        """Test: Solo las consultas sobre el umbral van al log, con su EXPLAIN si se pide"""
+        directorio = tempfile.mkdtemp()
+        try:
+            ruta = os.path.join(directorio, "lentas.log")
+            estadisticas = EstadisticasConsultas(umbral_lenta=0.1, ruta_log=ruta, capturar_explain=True)
+            llamadas = []
+
+            def explicar():
+                llamadas.append(1)
+                return [{"type": "ALL"}]
+
+            estadisticas.registrar("SELECT * FROM productos WHERE precio > %s", (1.0,), 0.05, explicar)
+            estadisticas.registrar("SELECT * FROM productos WHERE precio > %s", (1.0,), 0.25, explicar)
+
+            self.assertEqual(len(llamadas), 1)
+            lentas = estadisticas.consultas_lentas()
+            self.assertEqual(len(lentas), 1)
+            self.assertEqual(lentas[0]["duracion_ms"], 250.0)
+            self.assertEqual(lentas[0]["parametros"], "(float)")
+            self.assertEqual(lentas[0]["explain"], [{"type": "ALL"}])
+            with open(ruta, encoding="utf-8") as archivo:
+                self.assertEqual(json.loads(archivo.readline())["consulta"],
+                                 "SELECT * FROM productos WHERE precio > %s")
+        finally:
+            shutil.rmtree(directorio, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+Unit tests para la exportación del catálogo (no necesitan servidor MySQL).
+
+Este módulo prueba:
+- Exportación a CSV y JSONL desde el diccionario y desde SQLite
+- Compresión gzip/lzma elegida por extensión o por parámetro
+- Nombre temporal: una exportación interrumpida no deja el archivo final
+- Ida y vuelta: lo exportado se puede volver a importar
+
+Para ejecutar:
+    python -m unittest tests.test_exportacion -v
+"""
+
+import unittest
+import csv
+import gzip
+import json
+import lzma
+import os
+import shutil
+import sys
+import tempfile
+from io import StringIO
+from contextlib import redirect_stdout
+
+# Agregar el directorio padre al path para poder importar los módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from productos.backends import obtener_backend
+from productos.exportacion import detectar_compresion, detectar_formato, exportar_catalogo
+from productos.importacion import importar_archivo
+from productos.operaciones_diccionario import agregar_producto, productos
+
+
+class TestExportacion(unittest.TestCase):
+    """Tests para exportar_catalogo"""
+
+    def setUp(self):
+        productos.clear()
+        self.directorio = tempfile.mkdtemp()
+        self.backend = obtener_backend('diccionario', directorio_persistencia='')
+        self.backend.abrir()
+        with redirect_stdout(StringIO()):
+            agregar_producto('manzana', 'fruta', 100.5, 5)
+            agregar_producto('limón', 'fruta', 2.0, 30)
+
+    def tearDown(self):
+        productos.clear()
+        shutil.rmtree(self.directorio, ignore_errors=True)
+
+    def ruta(self, nombre):
+        return os.path.join(self.directorio, nombre)
+
+    def test_01_detectar_por_extension(self):
+        """Test: El formato y la compresión salen de la extensión"""
+        self.assertEqual((detectar_formato("a.jsonl.gz"), detectar_compresion("a.jsonl.gz")), ('jsonl', 'gzip'))
+        self.assertEqual((detectar_formato("a.csv.xz"), detectar_compresion("a.csv.xz")), ('csv', 'lzma'))
+        self.assertEqual((detectar_formato("a.csv"), detectar_compresion("a.csv")), ('csv', None))
+
+    def test_02_exportar_csv(self):
+        """Test: El CSV tiene encabezado y una fila por producto"""
+        resumen = exportar_catalogo(self.backend, self.ruta("catalogo.csv"))
+        self.assertEqual(resumen['filas'], 2)
+        with open(self.ruta("catalogo.csv"), newline='', encoding='utf-8') as archivo:
+            filas = list(csv.DictReader(archivo))
+        self.assertEqual(filas[1], {'nombre': 'limón', 'tipo': 'fruta', 'precio': '2.0', 'stock': '30'})
+
+    def test_03_exportar_comprimido(self):
+        """Test: gzip y lzma comprimen mientras se escribe y se leen con su módulo"""
+        exportar_catalogo(self.backend, self.ruta("catalogo.jsonl.gz"))
+        with gzip.open(self.ruta("catalogo.jsonl.gz"), 'rt', encoding='utf-8') as archivo:
+            self.assertEqual(json.loads(archivo.readline()),
+                             {"nombre": "manzana", "tipo": "fruta", "precio": 100.5, "stock": 5})
+
+        exportar_catalogo(self.backend, self.ruta("respaldo"), formato='jsonl', compresion='lzma')
+        with lzma.open(self.ruta("respaldo"), 'rt', encoding='utf-8') as archivo:
+            self.assertEqual(len(archivo.readlines()), 2)
+
+    def test_04_interrupcion_no_deja_archivo(self):
+        """Test: Si el recorrido falla, no queda ni el archivo final ni el temporal"""
+        def iterar_con_error():
+            yield {"nombre": "manzana", "tipo": "fruta", "precio": 1.0, "stock": 1}
+            raise RuntimeError("se cortó la conexión")
+
+        self.backend.iterar_productos = iterar_con_error
+        with self.assertRaises(RuntimeError):
+            exportar_catalogo(self.backend, self.ruta("catalogo.csv.gz"))
+        self.assertEqual(os.listdir(self.directorio), [])
+
+    def test_05_sqlite_ida_y_vuelta(self):
+        """Test: Lo exportado desde SQLite (cursor propio) se vuelve a importar igual"""
+        sqlite = obtener_backend('sqlite', modo_prueba=True, ruta=self.ruta("inventario.sqlite3"))
+        with redirect_stdout(StringIO()):
+            sqlite.abrir()
+            sqlite.agregar_lote([(f"fruta {letra}", "fruta", 1.25, 3) for letra in "abcde"])
+            resumen = exportar_catalogo(sqlite, self.ruta("catalogo.csv"))
+            sqlite.cerrar()
+
+            productos.clear()
+            importado = importar_archivo(self.ruta("catalogo.csv"), self.backend)
+
+        self.assertEqual(resumen['filas'], 5)
+        self.assertEqual(importado['importadas'], 5)
+        self.assertEqual(productos['fruta c']['precio'], 1.25)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+"""
+Unit tests para la importación de archivos CSV/JSONL (no necesitan servidor).
+
+Este módulo prueba:
+- Etapas de la cadena: parseo, validación y deduplicación fila por fila
+- Archivo de rechazos con la línea y el motivo, en el formato de entrada
+- Escritura en lotes en el backend y productos que ya existían
+- Resumen con filas leídas, importadas, rechazadas y filas por segundo
+
+Para ejecutar:
+    python -m unittest tests.test_importacion -v
+"""
+
+import unittest
+import csv
+import json
+import os
+import shutil
+import sys
+import tempfile
+from io import StringIO
+from contextlib import redirect_stdout
+
+# Agregar el directorio padre al path para poder importar los módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from productos.backends import obtener_backend
+from productos.importacion import (
+    deduplicar,
+    importar_archivo,
+    parsear_csv,
+    parsear_jsonl,
+    validar_filas
+)
+from productos.operaciones_diccionario import agregar_producto, productos
+
+
+class TestImportacion(unittest.TestCase):
+    """Tests para la cadena de importación"""
+
+    def setUp(self):
+        productos.clear()
+        self.directorio = tempfile.mkdtemp()
+        self.backend = obtener_backend('diccionario', directorio_persistencia='')
+        self.backend.abrir()
+
+    def tearDown(self):
+        productos.clear()
+        shutil.rmtree(self.directorio, ignore_errors=True)
+
+    def escribir(self, nombre, contenido):
+        ruta = os.path.join(self.directorio, nombre)
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            archivo.write(contenido)
+        return ruta
+
+    def test_01_etapas_csv(self):
+        """Test: Cada etapa marca el motivo del rechazo sin cortar la cadena"""
+        entrada = StringIO("nombre,tipo,precio,stock\nManzana,fruta,100,5\nkiwi,carne,1,1\n"
+                           "manzana,fruta,1,1\npera,fruta\n")
+        filas = list(deduplicar(validar_filas(parsear_csv(entrada))))
+
+        self.assertEqual([(linea, producto, motivo) for linea, _, producto, motivo in filas], [
+            (2, ('manzana', 'fruta', 100.0, 5), None),
+            (3, None, "tipo inválido: 'carne' (debe ser 'fruta' o 'verdura')"),
+            (4, None, "nombre repetido en el archivo"),
+            (5, None, "faltan columnas en la fila"),
+        ])
+
+    def test_02_encabezado_incompleto(self):
+        """Test: Un CSV sin las cuatro columnas se rechaza entero"""
+        with self.assertRaises(ValueError):
+            list(parsear_csv(StringIO("nombre,precio\nmanzana,10\n")))
+
+    def test_03_etapas_jsonl(self):
+        """Test: JSONL acepta números nativos y rechaza líneas que no son objetos"""
+        entrada = StringIO('{"nombre": "pera", "tipo": "fruta", "precio": 2.5, "stock": 3}\n'
+                           '\n'
+                           '{"nombre": "papa", "tipo": "verdura"\n'
+                           '[1, 2]\n'
+                           '{"nombre": "uva", "tipo": "fruta", "precio": 4, "stock": 1.5}\n')
+        filas = list(validar_filas(parsear_jsonl(entrada)))
+
+        self.assertEqual(filas[0][2], ('pera', 'fruta', 2.5, 3))
+        self.assertEqual([linea for linea, *_ in filas], [1, 3, 4, 5])
+        self.assertTrue(filas[1][3].startswith("JSON inválido"))
+        self.assertEqual(filas[2][3], "se esperaba un objeto JSON")
+        self.assertTrue(filas[3][3].startswith("stock inválido"))
+
+    def test_04_importar_csv_con_rechazos(self):
+        """Test: Las filas válidas se importan y las rechazadas van al archivo con su motivo"""
+        with redirect_stdout(StringIO()):
+            agregar_producto('limón', 'fruta', 3, 10)
+        ruta = self.escribir("productos.csv", "nombre,tipo,precio,stock\nmanzana,fruta,100,5\n"
+                                              "limon,fruta,2,3\npapa,verdura,abc,4\n")
+        ruta_rechazos = os.path.join(self.directorio, "rechazos.csv")
+
+        with redirect_stdout(StringIO()):
+            resumen = importar_archivo(ruta, self.backend, ruta_rechazos=ruta_rechazos)
+
+        self.assertEqual({clave: resumen[clave] for clave in ('leidas', 'importadas', 'rechazadas', 'existentes')},
+                         {'leidas': 3, 'importadas': 1, 'rechazadas': 1, 'existentes': 1})
+        self.assertGreater(resumen['filas_por_segundo'], 0)
+        self.assertIn('manzana', productos)
+        with open(ruta_rechazos, newline='', encoding='utf-8') as archivo:
+            rechazos = list(csv.DictReader(archivo))
+        self.assertEqual([(fila['linea'], fila['nombre'], fila['motivo']) for fila in rechazos], [
+            ('4', 'papa', "precio inválido: 'abc' (debe ser un número positivo)"),
+            ('3', 'limon', "ya existe en el inventario"),
+        ])
+
+    def test_05_importar_jsonl_en_lotes(self):
+        """Test: Se escribe de a tamano_lote productos y los rechazos quedan en JSONL"""
+        lineas = [json.dumps({"nombre": f"fruta {letra}", "tipo": "fruta", "precio": 1, "stock": 1})
+                  for letra in "abcdefg"]
+        lineas.append('{"nombre": "mal"}')
+        ruta = self.escribir("productos.jsonl", "\n".join(lineas) + "\n")
+        ruta_rechazos = os.path.join(self.directorio, "rechazos.jsonl")
+        lotes = []
+
+        with redirect_stdout(StringIO()):
+            resumen = importar_archivo(ruta, self.backend, tamano_lote=3, ruta_rechazos=ruta_rechazos,
+                                       al_escribir_lote=lotes.append)
+
+        self.assertEqual(resumen['importadas'], 7)
+        self.assertEqual([lote['importadas'] for lote in lotes], [3, 6, 7])
+        with open(ruta_rechazos, encoding='utf-8') as archivo:
+            rechazo = json.loads(archivo.readline())
+        self.assertEqual((rechazo['linea'], rechazo['nombre']), (8, 'mal'))
+        self.assertTrue(rechazo['motivo'].startswith("tipo inválido"))
+
+    def test_06_sin_rechazos_no_crea_archivo(self):
+        """Test: El archivo de rechazos se crea recién con el primer rechazo"""
+        ruta = self.escribir("productos.csv", "nombre,tipo,precio,stock\nmanzana,fruta,100,5\n")
+        ruta_rechazos = os.path.join(self.directorio, "rechazos.csv")
+        with redirect_stdout(StringIO()):
+            importar_archivo(ruta, self.backend, ruta_rechazos=ruta_rechazos)
+        self.assertFalse(os.path.exists(ruta_rechazos))
+
+
+if __name__ == '__main__':
+    unittest.main()
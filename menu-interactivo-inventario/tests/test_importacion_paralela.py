@@ -0,0 +1,126 @@
+"""
+Unit tests para la importación en paralelo (no necesitan servidor).
+
+Este módulo prueba:
+- División del archivo en rangos de bytes que terminan en un salto de línea
+- Mismo resultado que la importación secuencial (líneas, rechazos con sus campos originales, duplicados)
+- Orden de las filas aunque los rangos se validen en varios procesos
+- Errores de encabezado y de entrada estándar
+
+Para ejecutar:
+    python -m unittest tests.test_importacion_paralela -v
+"""
+
+import unittest
+import csv
+import json
+import os
+import shutil
+import sys
+import tempfile
+from io import StringIO
+from contextlib import redirect_stdout
+
+# Agregar el directorio padre al path para poder importar los módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from productos.backends import obtener_backend
+from productos.importacion import importar_archivo
+from productos.importacion_paralela import dividir_en_rangos, filas_en_orden, importar_archivo_paralelo
+from productos.operaciones_diccionario import agregar_producto, productos
+
+NOMBRES = [f"fruta {a}{b}" for a in "abcdefgh" for b in "abcdefgh"]
+
+
+class TestImportacionParalela(unittest.TestCase):
+    """Tests para importar_archivo_paralelo"""
+
+    def setUp(self):
+        productos.clear()
+        self.directorio = tempfile.mkdtemp()
+        self.backend = obtener_backend('diccionario', directorio_persistencia='')
+        self.backend.abrir()
+
+    def tearDown(self):
+        productos.clear()
+        shutil.rmtree(self.directorio, ignore_errors=True)
+
+    def escribir(self, nombre, contenido):
+        ruta = os.path.join(self.directorio, nombre)
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            archivo.write(contenido)
+        return ruta
+
+    def importar(self, funcion, ruta, **opciones):
+        """Importa en un inventario con un solo producto (NOMBRES[3]) y devuelve (resumen, rechazos)"""
+        productos.clear()
+        ruta_rechazos = os.path.join(self.directorio, f"rechazos_{funcion.__name__}.csv")
+        with redirect_stdout(StringIO()):
+            agregar_producto(NOMBRES[3], 'fruta', 1.0, 1)
+            resumen = funcion(ruta, self.backend, ruta_rechazos=ruta_rechazos, **opciones)
+        with open(ruta_rechazos, newline='', encoding='utf-8') as archivo:
+            rechazos = [tuple(fila.values()) for fila in csv.DictReader(archivo)]
+        return ({clave: resumen[clave] for clave in ('leidas', 'importadas', 'rechazadas')}, rechazos)
+
+    def test_01_rangos_terminan_en_linea(self):
+        """Test: Los rangos son contiguos, cubren el archivo y cortan después de un salto de línea"""
+        ruta = self.escribir("productos.csv", "".join(f"{nombre},fruta,1,1\n" for nombre in NOMBRES))
+        with open(ruta, 'rb') as archivo:
+            datos = archivo.read()
+
+        rangos = list(dividir_en_rangos(ruta, 0, 100))
+        self.assertGreater(len(rangos), 5)
+        self.assertEqual((rangos[0][0], rangos[-1][1]), (0, len(datos)))
+        for (_, hasta), (desde, _) in zip(rangos, rangos[1:]):
+            self.assertEqual(hasta, desde)
+            self.assertEqual(datos[hasta - 1:hasta], b'\n')
+
+    def test_02_igual_que_secuencial_csv(self):
+        """Test: Con rangos chicos y varios procesos, el resultado es el de importar_archivo"""
+        lineas = ["\ufeffnombre,tipo,precio,stock"]  # Con BOM, como los CSV de Excel
+        for i, nombre in enumerate(NOMBRES):
+            lineas.append(f"{nombre},{'carne' if i % 7 == 0 else 'fruta'},{i + 0.5},{i}")
+            if i % 10 == 0:
+                lineas.extend(["", f"{nombre.upper()},fruta,1,1"])
+        ruta = self.escribir("productos.csv", "\n".join(lineas))  # Sin salto de línea al final
+
+        secuencial = self.importar(importar_archivo, ruta)
+        paralelo = self.importar(importar_archivo_paralelo, ruta, procesos=3, tamano_rango=64)
+
+        self.assertEqual(paralelo, secuencial)
+        self.assertEqual(len(productos), secuencial[0]['importadas'] + 1)
+        motivos = [fila[1] for fila in paralelo[1]]
+        self.assertIn("nombre repetido en el archivo", motivos)
+        self.assertIn("ya existe en el inventario", motivos)
+        self.assertEqual(max(int(fila[0]) for fila in paralelo[1]), len(lineas))  # Aunque no termine en \n
+
+    def test_03_orden_jsonl(self):
+        """Test: Las filas llegan numeradas y en el orden del archivo"""
+        ruta = self.escribir("productos.jsonl", "".join(
+            json.dumps({"nombre": nombre, "tipo": "fruta", "precio": 1, "stock": 1}) + "\n" for nombre in NOMBRES))
+
+        filas = list(filas_en_orden(ruta, 'jsonl', procesos=2, tamano_rango=50, en_vuelo=3))
+
+        self.assertEqual([linea for linea, *_ in filas], list(range(1, len(NOMBRES) + 1)))
+        self.assertEqual([producto[0] for _, _, producto, _ in filas], NOMBRES)
+
+    def test_04_cortar_la_lectura(self):
+        """Test: Cerrar el generador a mitad de camino cancela los rangos pendientes"""
+        ruta = self.escribir("productos.csv", "nombre,tipo,precio,stock\n" +
+                             "".join(f"{nombre},fruta,1,1\n" for nombre in NOMBRES))
+        filas = filas_en_orden(ruta, 'csv', procesos=2, tamano_rango=30)
+        self.assertEqual(next(filas)[:1], (2,))
+        filas.close()
+
+    def test_05_errores(self):
+        """Test: Encabezado incompleto y entrada estándar se rechazan antes de importar"""
+        ruta = self.escribir("productos.csv", "nombre,precio\nmanzana,10\n")
+        with self.assertRaises(ValueError):
+            importar_archivo_paralelo(ruta, self.backend, procesos=2)
+        with self.assertRaises(ValueError):
+            importar_archivo_paralelo('-', self.backend, procesos=2)
+        self.assertEqual(len(productos), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,226 @@
+"""
+Unit tests para la estructura compacta del inventario en memoria.
+
+Este módulo prueba:
+- Registros Producto con __slots__ y tipo internado
+- Compatibilidad de lectura con el formato diccionario
+- InventarioMemoria (conversión de diccionarios, actualizar, clear)
+- Índice secundario por tipo
+- Índice ordenado por precio (rangos y más baratos)
+- Árbol de prefijos sobre los nombres
+- Índice de nombres normalizados (sin tildes)
+- Índice de trigramas (búsqueda aproximada), armado bajo demanda
+- Memoria por producto (no debe crecer con índices que no se usan)
+- Interfaz Indice: un índice incompleto no se puede crear
+
+Para ejecutar:
+    python -m unittest tests.test_inventario_memoria -v
+"""
+
+import unittest
+import os
+import sys
+
+# Agregar el directorio padre al path para poder importar los módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from productos.inventario_memoria import InventarioMemoria, Producto
+from productos.indices import Indice, IndiceTipo, trigramas
+from benchmarks.benchmark_backends import generar_nombres
+from benchmarks.benchmark_memoria import bytes_por_producto, construir_diccionarios, construir_inventario
+
+
+class TestInventarioMemoria(unittest.TestCase):
+    """Tests para Producto e InventarioMemoria"""
+
+    def setUp(self):
+        """Crea un inventario vacío antes de cada test"""
+        self.inventario = InventarioMemoria()
+
+    def test_01_producto_sin_diccionario_por_instancia(self):
+        """Test: Producto usa __slots__ y no tiene __dict__"""
+        producto = Producto("fruta", 100.0, 50)
+        self.assertFalse(hasattr(producto, "__dict__"))
+        with self.assertRaises(AttributeError):
+            producto.color = "rojo"
+
+    def test_02_tipo_internado(self):
+        """Test: Productos del mismo tipo comparten el mismo objeto str"""
+        tipo_a = "".join(["fru", "ta"])
+        tipo_b = "".join(["fr", "uta"])
+        self.assertIs(Producto(tipo_a, 1.0, 1).tipo, Producto(tipo_b, 2.0, 2).tipo)
+
+    def test_03_lectura_como_diccionario(self):
+        """Test: producto['campo'] funciona y un campo inexistente da KeyError"""
+        producto = Producto("verdura", 25.5, 10)
+        self.assertEqual(producto["tipo"], "verdura")
+        self.assertEqual(producto["precio"], 25.5)
+        self.assertEqual(producto["stock"], 10)
+        self.assertEqual(producto, {"tipo": "verdura", "precio": 25.5, "stock": 10})
+        with self.assertRaises(KeyError):
+            producto["color"]
+
+    def test_04_asignar_diccionario_convierte_a_producto(self):
+        """Test: Asignar un diccionario guarda un Producto"""
+        self.inventario["manzana"] = {"tipo": "fruta", "precio": 100.0, "stock": 50}
+        self.assertIsInstance(self.inventario["manzana"], Producto)
+        self.assertIn("manzana", self.inventario)
+        self.assertEqual(len(self.inventario), 1)
+
+    def test_05_actualizar_y_eliminar(self):
+        """Test: actualizar cambia un campo y del/clear eliminan productos"""
+        self.inventario["tomate"] = Producto("verdura", 25.0, 10)
+        self.inventario["pera"] = Producto("fruta", 80.0, 5)
+        self.inventario.actualizar("tomate", "stock", 3)
+        self.assertEqual(self.inventario["tomate"].stock, 3)
+
+        del self.inventario["tomate"]
+        self.assertEqual(list(self.inventario), ["pera"])
+        self.inventario.clear()
+        self.assertEqual(len(self.inventario), 0)
+
+    def test_06_indice_tipo_sigue_altas_y_bajas(self):
+        """Test: El índice por tipo refleja altas, reemplazos y bajas"""
+        self.inventario["manzana"] = Producto("fruta", 100.0, 50)
+        self.inventario["tomate"] = Producto("verdura", 25.0, 10)
+        self.inventario["pera"] = Producto("fruta", 80.0, 5)
+        self.assertEqual(list(self.inventario.por_tipo.buscar("fruta")), ["manzana", "pera"])
+
+        # Reemplazar un producto con otro tipo lo mueve de conjunto
+        self.inventario["pera"] = Producto("verdura", 80.0, 5)
+        self.assertEqual(list(self.inventario.por_tipo.buscar("fruta")), ["manzana"])
+        self.assertEqual(self.inventario.por_tipo.contar("verdura"), 2)
+
+        del self.inventario["manzana"]
+        self.assertEqual(list(self.inventario.por_tipo.buscar("fruta")), [])
+
+    def test_07_filtrar_por_tipo(self):
+        """Test: filtrar_por_tipo devuelve solo los productos de ese tipo, ya actualizados"""
+        self.inventario["manzana"] = Producto("fruta", 100.0, 50)
+        self.inventario["tomate"] = Producto("verdura", 25.0, 10)
+        self.inventario.actualizar("tomate", "precio", 30.0)
+        filtrados = list(self.inventario.filtrar_por_tipo("verdura"))
+        self.assertEqual(filtrados, [("tomate", Producto("verdura", 30.0, 10))])
+        self.assertEqual(list(self.inventario.filtrar_por_tipo("cereal")), [])
+
+    def test_08_clear_vacia_indices(self):
+        """Test: clear también vacía el índice por tipo"""
+        self.inventario["manzana"] = Producto("fruta", 100.0, 50)
+        self.inventario.clear()
+        self.assertEqual(self.inventario.por_tipo.contar("fruta"), 0)
+
+    def test_09_rango_de_precios(self):
+        """Test: filtrar_por_precio devuelve el rango incluido, ordenado por precio y nombre"""
+        for nombre, precio in [("uva", 50.0), ("kiwi", 10.0), ("apio", 30.0), ("pera", 30.0)]:
+            self.inventario[nombre] = Producto("fruta", precio, 1)
+        nombres = [nombre for nombre, _ in self.inventario.filtrar_por_precio(10.0, 30.0)]
+        self.assertEqual(nombres, ["kiwi", "apio", "pera"])
+        self.assertEqual(self.inventario.por_precio.buscar_rango(minimo=40.0), ["uva"])
+        self.assertEqual(self.inventario.por_precio.buscar_rango(60.0, 70.0), [])
+
+    def test_10_mas_baratos_sigue_actualizaciones(self):
+        """Test: Cambiar el precio o eliminar un producto reordena el índice"""
+        for nombre, precio in [("uva", 50.0), ("kiwi", 10.0), ("apio", 30.0)]:
+            self.inventario[nombre] = Producto("fruta", precio, 1)
+        self.inventario.actualizar("uva", "precio", 5.0)
+        self.assertEqual([nombre for nombre, _ in self.inventario.mas_baratos(2)], ["uva", "kiwi"])
+
+        # Cambiar el stock no toca el índice por precio
+        self.inventario.actualizar("kiwi", "stock", 99)
+        del self.inventario["uva"]
+        self.assertEqual(self.inventario.por_precio.mas_baratos(5), ["kiwi", "apio"])
+
+    def test_11_buscar_por_prefijo(self):
+        """Test: El árbol de prefijos devuelve los nombres en orden alfabético"""
+        for nombre in ["limón", "lima", "lechuga", "li", "kiwi"]:
+            self.inventario[nombre] = Producto("fruta", 1.0, 1)
+        self.assertEqual(self.inventario.buscar_por_prefijo("li"), ["li", "lima", "limón"])
+        self.assertEqual(self.inventario.buscar_por_prefijo("lim"), ["lima", "limón"])
+        self.assertEqual(self.inventario.buscar_por_prefijo("l", limite=2), ["lechuga", "li"])
+        self.assertEqual(self.inventario.buscar_por_prefijo("x"), [])
+
+    def test_12_prefijos_siguen_bajas(self):
+        """Test: El árbol sigue cada alta y baja; eliminar nombres lo compacta sin perder los demás"""
+        self.inventario["limón"] = Producto("fruta", 1.0, 1)
+        self.assertEqual(self.inventario.buscar_por_prefijo("li"), ["limón"])
+        for nombre in ["lima", "li"]:
+            self.inventario[nombre] = Producto("fruta", 1.0, 1)
+        self.assertEqual(self.inventario.buscar_por_prefijo("li"), ["li", "lima", "limón"])
+        del self.inventario["lima"]
+        del self.inventario["li"]
+        self.assertEqual(self.inventario.buscar_por_prefijo("li"), ["limón"])
+        del self.inventario["limón"]
+        self.assertEqual(self.inventario.buscar_por_prefijo(""), [])
+
+    def test_13_resolver_nombre_sin_tildes(self):
+        """Test: resolver_nombre encuentra el producto sin importar tildes ni mayúsculas"""
+        self.inventario["limón"] = Producto("fruta", 1.0, 1)
+        self.assertEqual(self.inventario.resolver_nombre("limon"), "limón")
+        self.assertEqual(self.inventario.resolver_nombre("LIMÓN"), "limón")
+        self.assertIsNone(self.inventario.resolver_nombre("lima"))
+        del self.inventario["limón"]
+        self.assertIsNone(self.inventario.resolver_nombre("limon"))
+
+    def test_14_trigramas_con_relleno(self):
+        """Test: Los trigramas se calculan sobre la clave normalizada, con relleno"""
+        self.assertEqual(trigramas("Kiwí"), {"  k", " ki", "kiw", "iwi", "wi "})
+
+    def test_15_buscar_similares(self):
+        """Test: buscar_similares ordena por similitud y sigue las bajas"""
+        for nombre in ["manzana", "mandarina", "zanahoria", "kiwi"]:
+            self.inventario[nombre] = Producto("fruta", 1.0, 1)
+        similares = self.inventario.buscar_similares("manzna")
+        self.assertEqual([nombre for nombre, _ in similares], ["manzana", "mandarina"])
+        self.assertGreater(similares[0][1], similares[1][1])
+        self.assertEqual(self.inventario.buscar_similares("xyz"), [])
+
+        del self.inventario["manzana"]
+        self.assertEqual([nombre for nombre, _ in self.inventario.buscar_similares("manzna")], ["mandarina"])
+
+    def test_16_trigramas_bajo_demanda(self):
+        """Test: El índice de trigramas se arma en la primera búsqueda y después sigue las altas"""
+        self.inventario["manzana"] = Producto("fruta", 1.0, 1)
+        self.assertIsNone(self.inventario.por_trigramas)
+
+        self.assertEqual([nombre for nombre, _ in self.inventario.buscar_similares("manzna")], ["manzana"])
+        self.assertIsNotNone(self.inventario.por_trigramas)
+        self.inventario["mandarina"] = Producto("fruta", 1.0, 1)
+        self.assertEqual(len(self.inventario.buscar_similares("manzna")), 2)
+
+        self.inventario.clear()
+        self.assertIsNone(self.inventario.por_trigramas)
+        self.assertEqual(self.inventario.buscar_por_prefijo(""), [])
+
+    def test_17_memoria_por_producto(self):
+        """Test: Con los índices que se mantienen siempre, ocupa menos que los diccionarios anidados"""
+        nombres = generar_nombres(20000)
+        _, diccionarios = bytes_por_producto(nombres, construir_diccionarios)
+        _, inventario = bytes_por_producto(nombres, construir_inventario)
+        self.assertLess(inventario, diccionarios)
+
+    def test_18_indice_normalizado_solo_guarda_nombres_con_tildes(self):
+        """Test: Los nombres que ya son su propia clave no ocupan lugar en el índice"""
+        for nombre in ["kiwi", "limón", "Pera"]:
+            self.inventario[nombre] = Producto("fruta", 1.0, 1)
+        self.assertEqual(self.inventario.por_clave._nombres, {"limon": "limón", "pera": "Pera"})
+        self.assertEqual(self.inventario.resolver_nombre("KIWI"), "kiwi")
+        self.assertEqual(self.inventario.resolver_nombre("pera"), "Pera")
+
+    def test_19_indice_incompleto_no_se_crea(self):
+        """Test: Un índice sin todos los métodos de Indice falla al crearlo, no en la primera alta"""
+        class IndiceSinLimpiar(Indice):
+            def agregar(self, nombre, producto):
+                pass
+
+            def quitar(self, nombre, producto):
+                pass
+
+        with self.assertRaises(TypeError):
+            IndiceSinLimpiar()
+        with self.assertRaises(TypeError):
+            Indice()
+        self.assertIsInstance(IndiceTipo(), Indice)
+
+
+if __name__ == '__main__':
+    unittest.main()
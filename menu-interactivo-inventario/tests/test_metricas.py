@@ -0,0 +1,232 @@
+"""
+Unit tests para las métricas del inventario (no necesitan servidor MySQL).
+
+Este módulo prueba:
+- Registro desactivado: los puntos de medición no guardan nada
+- Formato de texto de Prometheus (HELP/TYPE, etiquetas, histograma acumulativo)
+- Latencia de las funciones core con el decorador instrumentar
+- Listados: una observación por recorrido completo, no por página
+- Resultados de las operaciones del menú y tamaño del catálogo por backend
+- Operaciones de la CLI y la importación (agregar, agregar_lote) en los mismos contadores
+- Endpoint HTTP /metrics
+
+Para ejecutar:
+    python -m unittest tests.test_metricas -v
+"""
+
+import unittest
+from unittest.mock import patch
+import os
+import shutil
+import sys
+import tempfile
+import urllib.error
+import urllib.request
+from io import StringIO
+from contextlib import redirect_stdout
+
+# Agregar el directorio padre al path para poder importar los módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from productos.backends import BackendDiccionario, obtener_backend
+from productos.importacion import importar_archivo
+from productos.metricas import RegistroMetricas, instrumentar, iniciar_servidor_metricas, metricas
+from productos.operaciones_diccionario import agregar_producto, productos
+from productos.operaciones_sqlite import iterar_productos, mostrar_productos
+
+
+class TestMetricas(unittest.TestCase):
+    """Tests para RegistroMetricas y su integración con los backends"""
+
+    def setUp(self):
+        productos.clear()
+        metricas.limpiar()
+        metricas.activo = True
+
+    def tearDown(self):
+        metricas.activo = False
+        metricas.limpiar()
+        productos.clear()
+
+    def test_01_registro_desactivado_no_guarda(self):
+        """Test: Con activo=False contadores, medidores e histogramas no registran nada"""
+        registro = RegistroMetricas()
+        registro.incrementar('inventario_operaciones_total', (('resultado', 'ok'),))
+        registro.fijar('inventario_productos', (('backend', 'bd'),), 10)
+        registro.observar('inventario_operacion_duracion_segundos', (), 0.01)
+        self.assertEqual(registro.exponer(), '\n')
+
+    def test_02_formato_prometheus(self):
+        """Test: Cada métrica sale con HELP, TYPE y sus etiquetas escapadas"""
+        registro = RegistroMetricas()
+        registro.activo = True
+        registro.incrementar('inventario_errores_bd_total', (('tipo', 'consulta'),))
+        registro.incrementar('inventario_errores_bd_total', (('tipo', 'consulta'),), 2)
+        registro.fijar('inventario_productos', (('backend', 'di"cc'),), 7)
+        texto = registro.exponer()
+
+        self.assertIn('# TYPE inventario_errores_bd_total counter', texto)
+        self.assertIn('inventario_errores_bd_total{tipo="consulta"} 3', texto)
+        self.assertIn('# TYPE inventario_productos gauge', texto)
+        self.assertIn('inventario_productos{backend="di\\"cc"} 7', texto)
+
+    def test_03_histograma_acumulativo(self):
+        """Test: Las cubetas son acumulativas y +Inf coincide con _count"""
+        registro = RegistroMetricas()
+        registro.activo = True
+        etiquetas = (('backend', 'bd'), ('operacion', 'agregar'))
+        for segundos in (0.00005, 0.002, 0.002, 30.0):
+            registro.observar('inventario_operacion_duracion_segundos', etiquetas, segundos)
+        texto = registro.exponer()
+
+        self.assertIn('# TYPE inventario_operacion_duracion_segundos histogram', texto)
+        self.assertIn('inventario_operacion_duracion_segundos_bucket{backend="bd",operacion="agregar",le="0.0001"} 1', texto)
+        self.assertIn('inventario_operacion_duracion_segundos_bucket{backend="bd",operacion="agregar",le="0.005"} 3', texto)
+        self.assertIn('inventario_operacion_duracion_segundos_bucket{backend="bd",operacion="agregar",le="5.0"} 3', texto)
+        self.assertIn('inventario_operacion_duracion_segundos_bucket{backend="bd",operacion="agregar",le="+Inf"} 4', texto)
+        self.assertIn('inventario_operacion_duracion_segundos_count{backend="bd",operacion="agregar"} 4', texto)
+
+    def test_04_instrumentar_mide_funciones_core(self):
+        """Test: Las funciones core decoradas registran su latencia"""
+        with redirect_stdout(StringIO()):
+            agregar_producto('manzana', 'fruta', 100, 5)
+            agregar_producto('pera', 'fruta', 80, 3)
+
+        texto = metricas.exponer()
+        self.assertIn('inventario_operacion_duracion_segundos_count{backend="diccionario",operacion="agregar"} 2',
+                      texto)
+
+        @instrumentar('prueba', 'falla')
+        def falla():
+            raise ValueError("error")
+
+        with self.assertRaises(ValueError):
+            falla()
+        self.assertIn('inventario_operacion_duracion_segundos_count{backend="prueba",operacion="falla"} 1',
+                      metricas.exponer())
+
+    @patch('builtins.input', side_effect=['manzana', 'fruta', '100', '5',
+                                          'manzana',
+                                          'kiwi',
+                                          'manzana', 's'])
+    def test_05_backend_cuenta_resultados_y_catalogo(self, mock_input):
+        """Test: El backend cuenta cada resultado del menú y mantiene el tamaño del catálogo"""
+        backend = obtener_backend('diccionario')
+        with redirect_stdout(StringIO()):
+            backend.abrir()
+            self.assertEqual(backend.intentar_agregar_producto()[0], 'ok')
+            self.assertEqual(backend.intentar_agregar_producto()[0], 'duplicado')
+            self.assertEqual(backend.intentar_eliminar_producto()[0], 'no_encontrado')
+            self.assertEqual(backend.intentar_eliminar_producto()[0], 'ok')
+
+        def operaciones(operacion, resultado):
+            return metricas.obtener('inventario_operaciones_total', (
+                ('backend', 'diccionario'), ('operacion', operacion), ('resultado', resultado)))
+
+        self.assertEqual(operaciones('agregar', 'ok'), 1)
+        self.assertEqual(operaciones('agregar', 'duplicado'), 1)
+        self.assertEqual(operaciones('eliminar', 'no_encontrado'), 1)
+        self.assertEqual(operaciones('eliminar', 'ok'), 1)
+        self.assertEqual(metricas.obtener('inventario_productos', (('backend', 'diccionario'),)), 0)
+
+    def test_06_catalogo_sqlite_al_abrir(self):
+        """Test: Al abrir un backend con conexión, el medidor arranca con el tamaño real"""
+        directorio = tempfile.mkdtemp()
+        try:
+            ruta = os.path.join(directorio, "metricas.sqlite3")
+            with redirect_stdout(StringIO()):
+                backend = obtener_backend('sqlite', modo_prueba=True, ruta=ruta)
+                backend.abrir()
+                backend.bd_conexion.ejecutar_consulta(
+                    "INSERT INTO productos (nombre, tipo, precio, stock, nombre_clave) VALUES (?, ?, ?, ?, ?)",
+                    ('manzana', 'fruta', 100, 5, 'manzana'))
+                backend.cerrar()
+                backend.abrir()
+                backend.cerrar()
+            self.assertEqual(metricas.obtener('inventario_productos', (('backend', 'sqlite'),)), 1)
+        finally:
+            shutil.rmtree(directorio, ignore_errors=True)
+
+    def test_07_endpoint_http(self):
+        """Test: /metrics devuelve el texto de Prometheus y otras rutas dan 404"""
+        metricas.incrementar('inventario_errores_bd_total', (('tipo', 'conexion'),))
+        servidor = iniciar_servidor_metricas(0)
+        try:
+            url = f"http://127.0.0.1:{servidor.server_address[1]}"
+            with urllib.request.urlopen(f"{url}/metrics", timeout=5) as respuesta:
+                self.assertIn('text/plain', respuesta.headers['Content-Type'])
+                cuerpo = respuesta.read().decode('utf-8')
+            self.assertIn('inventario_errores_bd_total{tipo="conexion"} 1', cuerpo)
+
+            with self.assertRaises(urllib.error.HTTPError) as contexto:
+                urllib.request.urlopen(f"{url}/otra", timeout=5)
+            contexto.exception.close()
+        finally:
+            servidor.shutdown()
+            servidor.server_close()
+
+    def test_08_cli_e_importacion_cuentan(self):
+        """Test: agregar/eliminar sin menú, la importación y un agregar_lote propio también cuentan"""
+        directorio = tempfile.mkdtemp()
+        try:
+            ruta = os.path.join(directorio, "productos.csv")
+            with open(ruta, 'w', encoding='utf-8') as archivo:
+                archivo.write("nombre,tipo,precio,stock\npera,fruta,80,3\nbanana,fruta,50,2\n")
+            backend = obtener_backend('diccionario', directorio_persistencia='')
+            with redirect_stdout(StringIO()):
+                backend.abrir()
+                self.assertTrue(backend.agregar('manzana', 'fruta', 100, 5))
+                self.assertFalse(backend.agregar('manzana', 'fruta', 100, 5))
+                self.assertTrue(backend.eliminar('manzana'))
+                self.assertFalse(backend.actualizar('manzana', 'stock', 1))
+                self.assertFalse(backend.eliminar('manzana'))
+                importar_archivo(ruta, backend)
+        finally:
+            shutil.rmtree(directorio, ignore_errors=True)
+
+        def operaciones(backend, resultado, operacion='agregar'):
+            return metricas.obtener('inventario_operaciones_total', (
+                ('backend', backend), ('operacion', operacion), ('resultado', resultado)))
+
+        # Mismas etiquetas que el menú: nada cuenta como 'fallido'
+        self.assertEqual(operaciones('diccionario', 'ok'), 3)
+        self.assertEqual(operaciones('diccionario', 'duplicado'), 1)
+        self.assertEqual(operaciones('diccionario', 'no_encontrado', 'actualizar'), 1)
+        self.assertEqual(operaciones('diccionario', 'no_encontrado', 'eliminar'), 1)
+        self.assertEqual(operaciones('diccionario', 'fallido'), 0)
+        self.assertEqual(metricas.obtener('inventario_productos', (('backend', 'diccionario'),)), 2)
+
+        class BackendLote(BackendDiccionario):
+            nombre = 'lote'
+
+            def agregar_lote(self, productos, tamano_lote=1000):
+                return (2, ['kiwi'])
+
+        self.assertEqual(BackendLote().agregar_lote([]), (2, ['kiwi']))
+        self.assertEqual((operaciones('lote', 'ok'), operaciones('lote', 'duplicado')), (2, 1))
+
+    def test_09_listado_se_mide_una_vez_por_recorrido(self):
+        """Test: listar se observa una vez por listado completo o cortado, no por página"""
+        directorio = tempfile.mkdtemp()
+        try:
+            with redirect_stdout(StringIO()):
+                backend = obtener_backend('sqlite', modo_prueba=True, ruta=os.path.join(directorio, "listado.sqlite3"))
+                backend.abrir()
+                for nombre in ["apio", "banana", "kiwi", "pera", "uva"]:
+                    backend.agregar(nombre, 'fruta', 10, 1)
+                recorridos = [producto['nombre'] for producto in iterar_productos(backend.bd_conexion, limite=2)]
+                mostrar_productos(backend.bd_conexion)
+                # Un recorrido que se corta antes de terminar también se observa
+                recorrido = iterar_productos(backend.bd_conexion, limite=2)
+                next(recorrido)
+                recorrido.close()
+                backend.cerrar()
+        finally:
+            shutil.rmtree(directorio, ignore_errors=True)
+
+        self.assertEqual(len(recorridos), 5)
+        self.assertIn('inventario_operacion_duracion_segundos_count{backend="sqlite",operacion="listar"} 3',
+                      metricas.exponer())
+
+if __name__ == '__main__':
+    unittest.main()
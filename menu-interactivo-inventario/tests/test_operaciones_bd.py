@@ -33,6 +33,19 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from productos.operaciones_bd import (
     agregar_producto_bd, 
+    agregar_productos_bd_lote,
+    sincronizar_productos_bd,
+    iterar_productos,
+    obtener_productos_por_precio_bd,
+    obtener_productos_mas_baratos_bd,
+    buscar_por_prefijo_bd,
+    resolver_nombre_bd,
+    buscar_similares_bd,
+    obtener_pagina_productos,
+    obtener_producto_bd,
+    ajustar_stock_bd,
+    ajustar_stock_bd_lote,
+    aplicar_cambios_bd_lote,
     mostrar_productos, 
     actualizar_producto_bd, 
     eliminar_producto_bd,
@@ -40,7 +53,12 @@ from productos.operaciones_bd import (
     intentar_actualizar_producto,
     intentar_eliminar_producto
 )
-from productos.database import obtener_conexion_base_datos
+from productos.database import obtener_conexion_base_datos, obtener_pool_conexiones
+from productos.buffer_escritura import BufferEscritura
+from productos.cache_consultas import CacheConsultas
+from concurrent.futures import ThreadPoolExecutor
+from mysql.connector import Error
+from productos.metricas import metricas
 
 class TestOperacionesBD(unittest.TestCase):
     """Tests para operaciones de base de datos optimizadas"""
@@ -285,5 +303,434 @@ class TestOperacionesBD(unittest.TestCase):
         self.assertEqual(estado, 'no_encontrado')
         self.assertIsNone(producto)
 
+    def test_30_agregar_productos_lote_exitoso(self):
+        """Test: Agregar un lote más grande que tamano_lote inserta todo"""
+        productos = [(f"producto {letra}", "fruta", 1.0, 10) for letra in "abcdefg"]
+        with redirect_stdout(StringIO()):
+            insertados, duplicados = agregar_productos_bd_lote(productos, self.bd_conexion, tamano_lote=3)
+        self.assertEqual(insertados, 7)
+        self.assertEqual(duplicados, [])
+
+    def test_31_agregar_productos_lote_con_duplicados(self):
+        """Test: Los duplicados se informan sin abortar el resto del lote"""
+        agregar_producto_bd("pera", "fruta", 1.80, 40, self.bd_conexion)
+        productos = [
+            ("manzana", "fruta", 1.50, 100),
+            ("pera", "fruta", 2.00, 10),
+            ("tomate", "verdura", 2.00, 30),
+            ("manzana", "fruta", 1.60, 5),
+        ]
+        with redirect_stdout(StringIO()):
+            insertados, duplicados = agregar_productos_bd_lote(productos, self.bd_conexion)
+        self.assertEqual(insertados, 2)
+        self.assertCountEqual(duplicados, ["pera", "manzana"])
+
+    def test_32_agregar_productos_lote_vacio(self):
+        """Test: Un lote vacío no inserta nada"""
+        with redirect_stdout(StringIO()):
+            insertados, duplicados = agregar_productos_bd_lote([], self.bd_conexion)
+        self.assertEqual((insertados, duplicados), (0, []))
+
+    def test_33_sincronizar_productos_inserta_y_actualiza(self):
+        """Test: El upsert inserta los nuevos y actualiza precio/stock de los existentes"""
+        agregar_producto_bd("pera", "fruta", 1.80, 40, self.bd_conexion)
+        agregar_producto_bd("apio", "verdura", 1.50, 15, self.bd_conexion)
+        productos = [
+            ("pera", "fruta", 2.00, 40),
+            ("apio", "verdura", 1.50, 15),
+            ("tomate", "verdura", 2.00, 30),
+        ]
+        with redirect_stdout(StringIO()):
+            insertados, actualizados = sincronizar_productos_bd(productos, self.bd_conexion)
+        self.assertEqual(insertados, 1)
+        self.assertEqual(actualizados, 1, "Apio no cambió, no debe contarse como actualizado")
+
+        pera = self.bd_conexion.ejecutar_consulta(
+            "SELECT precio, stock FROM productos WHERE nombre = %s", ("pera",), obtener_resultados=True
+        )
+        self.assertEqual(float(pera[0]['precio']), 2.00)
+
+    def test_34_sincronizar_productos_repetidos_en_lote(self):
+        """Test: Si un nombre se repite en el lote, gana la última aparición"""
+        productos = [("kiwi", "fruta", 1.00, 5), ("kiwi", "fruta", 3.00, 7)]
+        with redirect_stdout(StringIO()):
+            insertados, actualizados = sincronizar_productos_bd(productos, self.bd_conexion)
+        self.assertEqual((insertados, actualizados), (1, 0))
+        kiwi = self.bd_conexion.ejecutar_consulta(
+            "SELECT stock FROM productos WHERE nombre = %s", ("kiwi",), obtener_resultados=True
+        )
+        self.assertEqual(kiwi[0]['stock'], 7)
+
+    def _contar_productos(self):
+        """Devuelve la cantidad de productos en la BD de pruebas"""
+        resultado = self.bd_conexion.ejecutar_consulta(
+            "SELECT COUNT(*) as total FROM productos", obtener_resultados=True
+        )
+        return resultado[0]['total']
+
+    def test_35_transaccion_confirma_al_salir(self):
+        """Test: Las escrituras dentro de transaccion() se confirman juntas al salir"""
+        with self.bd_conexion.transaccion():
+            agregar_producto_bd("uva", "fruta", 3.00, 20, self.bd_conexion)
+            agregar_producto_bd("kiwi", "fruta", 2.00, 10, self.bd_conexion)
+        self.assertEqual(self._contar_productos(), 2)
+
+    def test_36_transaccion_deshace_si_hay_error(self):
+        """Test: Una excepción dentro de transaccion() deshace todo el bloque"""
+        with self.assertRaises(ValueError):
+            with self.bd_conexion.transaccion():
+                agregar_producto_bd("uva", "fruta", 3.00, 20, self.bd_conexion)
+                raise ValueError("falla a mitad de la operación")
+        self.assertEqual(self._contar_productos(), 0)
+
+    def test_37_transaccion_anidada_usa_savepoint(self):
+        """Test: Un error en un bloque anidado solo deshace ese bloque"""
+        with self.bd_conexion.transaccion():
+            agregar_producto_bd("uva", "fruta", 3.00, 20, self.bd_conexion)
+            with self.assertRaises(ValueError):
+                with self.bd_conexion.transaccion():
+                    agregar_producto_bd("kiwi", "fruta", 2.00, 10, self.bd_conexion)
+                    raise ValueError("falla el bloque interno")
+        self.assertEqual(self._contar_productos(), 1)
+
+    def test_38_iterar_productos_recorre_todas_las_paginas(self):
+        """Test: La paginación por clave devuelve todos los productos en orden"""
+        nombres = ["uva", "apio", "kiwi", "pera", "tomate"]
+        for nombre in nombres:
+            agregar_producto_bd(nombre, "fruta", 1.00, 10, self.bd_conexion)
+        recorridos = [producto['nombre'] for producto in iterar_productos(self.bd_conexion, limite=2)]
+        self.assertEqual(recorridos, sorted(nombres))
+
+    def test_39_iterar_productos_despues_de(self):
+        """Test: iterar_productos empieza después del nombre indicado"""
+        for nombre in ["apio", "kiwi", "pera"]:
+            agregar_producto_bd(nombre, "fruta", 1.00, 10, self.bd_conexion)
+        recorridos = [producto['nombre'] for producto in iterar_productos(self.bd_conexion, despues_de="apio")]
+        self.assertEqual(recorridos, ["kiwi", "pera"])
+
+    def test_40_productos_por_precio_bd(self):
+        """Test: BETWEEN devuelve los productos del rango ordenados por precio"""
+        for nombre, precio in [("apio", 30.00), ("kiwi", 10.00), ("pera", 20.00), ("uva", 50.00)]:
+            agregar_producto_bd(nombre, "fruta", precio, 10, self.bd_conexion)
+        resultado = obtener_productos_por_precio_bd(self.bd_conexion, 10.00, 30.00)
+        self.assertEqual([producto['nombre'] for producto in resultado], ["kiwi", "pera", "apio"])
+
+    def test_41_productos_mas_baratos_bd(self):
+        """Test: Los N más baratos se devuelven en orden de precio"""
+        for nombre, precio in [("apio", 30.00), ("kiwi", 10.00), ("pera", 20.00)]:
+            agregar_producto_bd(nombre, "fruta", precio, 10, self.bd_conexion)
+        resultado = obtener_productos_mas_baratos_bd(self.bd_conexion, 2)
+        self.assertEqual([producto['nombre'] for producto in resultado], ["kiwi", "pera"])
+
+    def test_42_indice_precio_existe(self):
+        """Test: La tabla productos tiene idx_precio"""
+        indices = self.bd_conexion.ejecutar_consulta(
+            "SHOW INDEX FROM productos WHERE Key_name = 'idx_precio'", obtener_resultados=True
+        )
+        self.assertTrue(indices)
+
+    def test_43_buscar_por_prefijo_bd(self):
+        """Test: LIKE por prefijo devuelve los nombres en orden y respeta el límite"""
+        for nombre in ["limón", "lima", "lechuga", "kiwi"]:
+            agregar_producto_bd(nombre, "fruta", 1.00, 10, self.bd_conexion)
+        self.assertEqual(buscar_por_prefijo_bd(self.bd_conexion, "li"), ["lima", "limón"])
+        self.assertEqual(buscar_por_prefijo_bd(self.bd_conexion, "l", limite=1), ["lechuga"])
+        self.assertEqual(buscar_por_prefijo_bd(self.bd_conexion, "%"), [])
+
+    def test_44_nombres_sin_distinguir_tildes_bd(self):
+        """Test: La collation trata 'limon' y 'limón' como el mismo producto"""
+        self.assertTrue(agregar_producto_bd("limón", "fruta", 1.00, 10, self.bd_conexion))
+        self.assertFalse(agregar_producto_bd("limon", "fruta", 2.00, 10, self.bd_conexion))
+        self.assertEqual(resolver_nombre_bd(self.bd_conexion, "LIMON"), "limón")
+        self.assertIsNone(resolver_nombre_bd(self.bd_conexion, "lima"))
+
+    def test_45_buscar_similares_bd(self):
+        """Test: La tabla de trigramas sugiere nombres parecidos (altas individuales y por lote)"""
+        agregar_producto_bd("zanahoria", "verdura", 1.00, 10, self.bd_conexion)
+        agregar_productos_bd_lote([("manzana", "fruta", 1.00, 1), ("mandarina", "fruta", 1.00, 1)], self.bd_conexion)
+        self.assertEqual([nombre for nombre, _ in buscar_similares_bd(self.bd_conexion, "zanaoria")], ["zanahoria"])
+        self.assertEqual([nombre for nombre, _ in buscar_similares_bd(self.bd_conexion, "manzna")],
+                         ["manzana", "mandarina"])
+
+    def test_46_trigramas_se_borran_en_cascada(self):
+        """Test: Al eliminar un producto sus trigramas se borran (ON DELETE CASCADE)"""
+        agregar_producto_bd("zanahoria", "verdura", 1.00, 10, self.bd_conexion)
+        eliminar_producto_bd("zanahoria", self.bd_conexion)
+        self.assertEqual(buscar_similares_bd(self.bd_conexion, "zanahoria"), [])
+        filas = self.bd_conexion.ejecutar_consulta(
+            "SELECT COUNT(*) AS total FROM productos_trigramas", obtener_resultados=True
+        )
+        self.assertEqual(filas[0]['total'], 0)
+
+    def test_47_cache_de_paginas_y_productos(self):
+        """Test: Con la caché activada, las lecturas repetidas se sirven desde ella"""
+        self.bd_conexion.cache = CacheConsultas(256, 30)
+        agregar_producto_bd("manzana", "fruta", 1.00, 10, self.bd_conexion)
+        aciertos = self.bd_conexion.cache.aciertos
+        obtener_pagina_productos(self.bd_conexion)
+        obtener_pagina_productos(self.bd_conexion)
+        self.assertEqual(obtener_producto_bd(self.bd_conexion, "Manzana")['stock'], 10)
+        self.assertEqual(obtener_producto_bd(self.bd_conexion, "manzana")['stock'], 10)
+        self.assertEqual(self.bd_conexion.cache.aciertos - aciertos, 2)
+
+    def test_48_escrituras_invalidan_la_cache(self):
+        """Test: Agregar, actualizar y eliminar no dejan lecturas viejas en la caché"""
+        self.bd_conexion.cache = CacheConsultas(256, 30)
+        agregar_producto_bd("manzana", "fruta", 1.00, 10, self.bd_conexion)
+        self.assertEqual(len(obtener_pagina_productos(self.bd_conexion)), 1)
+        obtener_producto_bd(self.bd_conexion, "manzana")
+
+        agregar_producto_bd("banana", "fruta", 2.00, 5, self.bd_conexion)
+        self.assertEqual(len(obtener_pagina_productos(self.bd_conexion)), 2)
+        actualizar_producto_bd("manzana", "stock", 3, self.bd_conexion)
+        self.assertEqual(obtener_producto_bd(self.bd_conexion, "manzana")['stock'], 3)
+        eliminar_producto_bd("manzana", self.bd_conexion)
+        self.assertIsNone(obtener_producto_bd(self.bd_conexion, "manzana"))
+        self.assertEqual([p['nombre'] for p in obtener_pagina_productos(self.bd_conexion)], ["banana"])
+
+    def test_49_ajustar_stock_bd(self):
+        """Test: Ajustes relativos de stock sin bajar de cero"""
+        agregar_producto_bd("limón", "fruta", 1.00, 5, self.bd_conexion)
+        with redirect_stdout(StringIO()):
+            self.assertTrue(ajustar_stock_bd("limon", 3, self.bd_conexion))
+            self.assertTrue(ajustar_stock_bd("limón", -8, self.bd_conexion))
+            self.assertFalse(ajustar_stock_bd("limón", -1, self.bd_conexion))
+            self.assertFalse(ajustar_stock_bd("pera", 1, self.bd_conexion))
+        self.assertEqual(obtener_producto_bd(self.bd_conexion, "limón")['stock'], 0)
+
+    def test_50_ajustar_stock_bd_lote(self):
+        """Test: Muchos ajustes en un UPDATE, rechazando los que dejarían stock negativo"""
+        agregar_producto_bd("manzana", "fruta", 1.00, 50, self.bd_conexion)
+        agregar_producto_bd("tomate", "verdura", 2.00, 2, self.bd_conexion)
+        with redirect_stdout(StringIO()):
+            ajustados = ajustar_stock_bd_lote(
+                [("manzana", -10), ("tomate", -5), ("Manzana", 3), ("pera", 1)], self.bd_conexion
+            )
+        self.assertEqual(ajustados, 1)
+        self.assertEqual(obtener_producto_bd(self.bd_conexion, "manzana")['stock'], 43)
+        self.assertEqual(obtener_producto_bd(self.bd_conexion, "tomate")['stock'], 2)
+
+    def test_51_buffer_escritura_combina_y_vacia(self):
+        """Test: El buffer escribe en un solo vaciado los cambios combinados por producto"""
+        agregar_producto_bd("manzana", "fruta", 1.00, 50, self.bd_conexion)
+        agregar_producto_bd("tomate", "verdura", 2.00, 2, self.bd_conexion)
+        conexion_buffer = obtener_conexion_base_datos(modo_prueba=True)
+        try:
+            buffer = BufferEscritura(conexion_buffer, intervalo=60)
+            for _ in range(30):
+                buffer.ajustar_stock("manzana", -1)
+            buffer.actualizar("manzana", "precio", 1.25)
+            buffer.ajustar_stock("tomate", -5)
+            self.assertEqual(obtener_producto_bd(self.bd_conexion, "manzana")['stock'], 50)
+
+            with redirect_stdout(StringIO()):
+                self.assertEqual(buffer.cerrar(), 2)
+            self.assertEqual(obtener_producto_bd(self.bd_conexion, "manzana")['stock'], 20)
+            self.assertEqual(float(obtener_producto_bd(self.bd_conexion, "manzana")['precio']), 1.25)
+            self.assertEqual(obtener_producto_bd(self.bd_conexion, "tomate")['stock'], 2)
+            self.assertEqual(buffer.descartados, 1)
+        finally:
+            conexion_buffer.desconectar()
+
+    def test_52_sentencias_preparadas_se_reutilizan(self):
+        """Test: Las consultas frecuentes usan una sentencia preparada por texto, con tamaño acotado"""
+        self.bd_conexion.max_preparadas = 2
+        agregar_producto_bd("manzana", "fruta", 1.00, 10, self.bd_conexion)
+        actualizar_producto_bd("manzana", "stock", 20, self.bd_conexion)
+        _, cursor = self.bd_conexion._preparadas["UPDATE productos SET stock = %s WHERE nombre = %s"]
+        actualizar_producto_bd("manzana", "stock", 30, self.bd_conexion)
+        self.assertIs(self.bd_conexion._preparadas["UPDATE productos SET stock = %s WHERE nombre = %s"][1], cursor)
+
+        actualizar_producto_bd("manzana", "precio", 2.00, self.bd_conexion)
+        self.assertEqual(len(self.bd_conexion._preparadas), 2)
+        self.assertEqual(obtener_producto_bd(self.bd_conexion, "manzana")['stock'], 30)
+
+    def test_53_estadisticas_de_consultas(self):
+        """Test: Cada consulta se mide por sentencia y las lentas se registran con su EXPLAIN"""
+        self.bd_conexion.estadisticas.limpiar()
+        self.bd_conexion.estadisticas.umbral_lenta = 0
+        self.bd_conexion.estadisticas.capturar_explain = True
+        agregar_producto_bd("manzana", "fruta", 1.00, 10, self.bd_conexion)
+        agregar_producto_bd("pera", "fruta", 2.00, 10, self.bd_conexion)
+
+        resumen = self.bd_conexion.estadisticas.resumen()
+        insert = [datos for consulta, datos in resumen.items() if consulta.startswith("INSERT INTO productos ")]
+        self.assertEqual(insert[0]['cantidad'], 2)
+        self.assertLessEqual(insert[0]['p50_ms'], insert[0]['max_ms'])
+        lenta = self.bd_conexion.estadisticas.consultas_lentas()[0]
+        self.assertEqual(lenta['parametros'], "(str, str, float, int)")
+        self.assertIsInstance(lenta['explain'], list)
+
+    def test_54_iterar_consulta_sin_buffer(self):
+        """Test: iterar_consulta trae las filas de a bloques y libera la conexión aunque se corte antes"""
+        agregar_productos_bd_lote([(f"fruta {i:03d}", "fruta", 1.00, i) for i in range(25)], self.bd_conexion)
+
+        filas = self.bd_conexion.iterar_consulta(
+            "SELECT nombre, stock FROM productos ORDER BY nombre", tamano_bloque=10)
+        self.assertEqual([fila['stock'] for fila in filas], list(range(25)))
+
+        # Cortar la lectura a mitad de camino no deja resultados pendientes en la conexión
+        filas = self.bd_conexion.iterar_consulta("SELECT nombre FROM productos ORDER BY nombre", tamano_bloque=5)
+        self.assertEqual(next(filas)['nombre'], "fruta 000")
+        filas.close()
+        self.assertEqual(obtener_producto_bd(self.bd_conexion, "fruta 024")['stock'], 24)
+
+    def test_55_sincronizar_productos_error_al_consultar_existentes(self):
+        """Test: Si falla la consulta de existentes, el lote se deshace en lugar de contarse como nuevo"""
+        agregar_producto_bd("pera", "fruta", 1.80, 40, self.bd_conexion)
+        with patch.object(self.bd_conexion, 'iterar_consulta', side_effect=Error("conexión perdida")):
+            with redirect_stdout(StringIO()) as salida:
+                resultado = sincronizar_productos_bd([("pera", "fruta", 2.00, 40), ("kiwi", "fruta", 1.00, 5)],
+                                                     self.bd_conexion)
+        self.assertEqual(resultado, (0, 0))
+        self.assertIn("Error sincronizando lote", salida.getvalue())
+        self.assertIsNone(obtener_producto_bd(self.bd_conexion, "kiwi"))
+        self.assertEqual(float(obtener_producto_bd(self.bd_conexion, "pera")['precio']), 1.80)
+
+    def test_56_buffer_descarta_solo_el_precio_invalido(self):
+        """Test: Un precio que no entra en DECIMAL(10,2) se descarta sin frenar al resto del buffer"""
+        agregar_producto_bd("manzana", "fruta", 1.00, 50, self.bd_conexion)
+        agregar_producto_bd("tomate", "verdura", 2.00, 2, self.bd_conexion)
+        conexion_buffer = obtener_conexion_base_datos(modo_prueba=True)
+        try:
+            buffer = BufferEscritura(conexion_buffer, intervalo=60)
+            buffer.actualizar("manzana", "precio", 1e20)
+            buffer.ajustar_stock("manzana", -5)
+            buffer.actualizar("tomate", "precio", 2.50)
+            with redirect_stdout(StringIO()):
+                self.assertEqual(buffer.cerrar(), 1)
+            self.assertEqual((buffer.descartados, len(buffer)), (1, 0))
+            self.assertEqual(float(obtener_producto_bd(self.bd_conexion, "tomate")['precio']), 2.50)
+            self.assertEqual(obtener_producto_bd(self.bd_conexion, "manzana")['stock'], 50)
+        finally:
+            conexion_buffer.desconectar()
+
+    def test_57_aplicar_cambios_se_mide_y_propaga_errores(self):
+        """Test: Los UPDATE del buffer pasan por las estadísticas y sus errores por las métricas"""
+        agregar_producto_bd("manzana", "fruta", 1.00, 50, self.bd_conexion)
+        self.bd_conexion.estadisticas.limpiar()
+        self.assertEqual(aplicar_cambios_bd_lote([("manzana", 2.00, None)], [("manzana", -5)], self.bd_conexion),
+                         (1, 1))
+        sentencias = [consulta for consulta in self.bd_conexion.estadisticas.resumen() if "UPDATE productos" in consulta]
+        self.assertEqual(len(sentencias), 2)
+
+        metricas.limpiar()
+        metricas.activo = True
+        try:
+            with self.assertRaises(Error):
+                aplicar_cambios_bd_lote([("manzana", 1e20, None)], [], self.bd_conexion)
+            self.assertEqual(metricas.obtener('inventario_errores_bd_total', (('tipo', 'consulta'),)), 1)
+        finally:
+            metricas.activo = False
+            metricas.limpiar()
+        self.assertEqual(obtener_producto_bd(self.bd_conexion, "manzana")['stock'], 45)
+
+
+class TestReconexion(unittest.TestCase):
+    """Tests para el ping tras inactividad y la reconexión automática"""
+
+    def setUp(self):
+        """Crea la conexión a probar y otra para cortarla desde el servidor"""
+        self.bd_conexion = obtener_conexion_base_datos(modo_prueba=True)
+        self.otra = obtener_conexion_base_datos(modo_prueba=True)
+        assert self.bd_conexion is not None and self.otra is not None, "No se pudo conectar a la BD de pruebas"
+        self.bd_conexion.limpiar_todos_los_datos()
+
+    def tearDown(self):
+        self.bd_conexion.desconectar()
+        self.otra.desconectar()
+
+    def _cortar_conexion(self):
+        """Simula un wait_timeout: el servidor cierra la conexión bajo prueba"""
+        id_conexion = self.bd_conexion.conexion.connection_id
+        self.otra.ejecutar_consulta(f"KILL {int(id_conexion)}")
+
+    def test_01_lectura_se_reintenta(self):
+        """Test: Un SELECT sobre una conexión cortada reconecta y se repite"""
+        self.bd_conexion.segundos_ping = 3600
+        self._cortar_conexion()
+        with redirect_stdout(StringIO()):
+            filas = self.bd_conexion.ejecutar_consulta("SELECT 1 AS uno", obtener_resultados=True)
+        self.assertEqual(filas, [{'uno': 1}])
+
+    def test_02_escritura_no_se_reintenta(self):
+        """Test: Una escritura cortada falla sin repetirse y la siguiente consulta reconecta"""
+        self.bd_conexion.segundos_ping = 3600
+        self._cortar_conexion()
+        with redirect_stdout(StringIO()):
+            self.assertFalse(agregar_producto_bd("pera", "fruta", 1.0, 1, self.bd_conexion))
+            self.assertTrue(agregar_producto_bd("uva", "fruta", 1.0, 1, self.bd_conexion))
+        self.assertIsNone(obtener_producto_bd(self.bd_conexion, "pera"))
+
+    def test_03_ping_tras_inactividad(self):
+        """Test: Tras el tiempo de inactividad se hace ping y se reconecta antes de escribir"""
+        self.bd_conexion.segundos_ping = 0
+        self._cortar_conexion()
+        with redirect_stdout(StringIO()):
+            self.assertTrue(agregar_producto_bd("pera", "fruta", 1.0, 1, self.bd_conexion))
+
+    def test_04_sentencias_preparadas_tras_reconectar(self):
+        """Test: Tras reconectar, las sentencias preparadas se vuelven a preparar"""
+        agregar_producto_bd("pera", "fruta", 1.0, 1, self.bd_conexion)
+        self.assertTrue(self.bd_conexion._preparadas)
+        self.bd_conexion.segundos_ping = 0
+        self._cortar_conexion()
+        with redirect_stdout(StringIO()):
+            self.assertTrue(actualizar_producto_bd("pera", "stock", 5, self.bd_conexion))
+        self.assertEqual(obtener_producto_bd(self.bd_conexion, "pera")['stock'], 5)
+
+class TestPoolConexiones(unittest.TestCase):
+    """Tests para el pool de conexiones compartido entre hilos"""
+
+    def setUp(self):
+        """Crea un pool pequeño sobre la BD de pruebas y la limpia"""
+        self.pool = obtener_pool_conexiones(tamano=3, modo_prueba=True, tiempo_espera=5)
+        assert self.pool is not None, "No se pudo crear el pool de pruebas"
+        with self.pool.conexion() as bd_conexion:
+            bd_conexion.limpiar_todos_los_datos()
+
+    def tearDown(self):
+        """Cierra todas las conexiones del pool"""
+        self.pool.cerrar()
+
+    def test_01_conexion_se_reutiliza(self):
+        """Test: Una conexión devuelta al pool se vuelve a entregar"""
+        with self.pool.conexion() as bd1:
+            pass
+        with self.pool.conexion() as bd2:
+            pass
+        self.assertIs(bd1, bd2, "El pool debe reutilizar la conexión libre")
+
+    def test_02_no_supera_tamano(self):
+        """Test: El pool nunca abre más conexiones que su tamaño"""
+        conexiones = [self.pool.obtener() for _ in range(3)]
+        self.pool.tiempo_espera = 0.1
+        with redirect_stdout(StringIO()):
+            self.assertIsNone(self.pool.obtener(), "No debe haber una cuarta conexión")
+        for bd in conexiones:
+            self.pool.devolver(bd)
+
+    def test_03_operaciones_concurrentes(self):
+        """Test: Varios hilos agregan productos usando el pool"""
+        nombres = [f"producto {letra}" for letra in "abcdefghij"]
+
+        def agregar(nombre):
+            with self.pool.conexion() as bd_conexion:
+                return agregar_producto_bd(nombre, "fruta", 1.0, 5, bd_conexion)
+
+        # redirect_stdout cambia sys.stdout para todo el proceso: se redirige una
+        # sola vez desde el hilo principal, no desde cada hilo (se pisarían entre sí)
+        with redirect_stdout(StringIO()):
+            with ThreadPoolExecutor(max_workers=3) as ejecutor:
+                resultados = list(ejecutor.map(agregar, nombres))
+        self.assertTrue(all(resultados), "Todos los productos deben agregarse")
+
+        with self.pool.conexion() as bd_conexion:
+            total = bd_conexion.ejecutar_consulta(
+                "SELECT COUNT(*) as total FROM productos", obtener_resultados=True
+            )
+        self.assertEqual(total[0]['total'], len(nombres))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -4,6 +4,12 @@ Unit tests para las operaciones de diccionario en memoria.
 Este módulo prueba las funciones CRUD que utilizan almacenamiento en memoria:
 - Funciones interactivas (con input): intentar_agregar_producto, intentar_actualizar_producto, intentar_eliminar_producto
 - Función de visualización: mostrar_productos
+- Consulta filtrada por tipo: obtener_productos_por_tipo
+- Consultas por precio: obtener_productos_por_precio, obtener_productos_mas_baratos
+- Búsqueda por prefijo y autocompletado: buscar_por_prefijo
+- Nombres sin distinguir tildes: resolver_nombre
+- Sugerencias de nombres parecidos: buscar_similares
+- Ajustes relativos de stock: ajustar_stock, ajustar_stock_lote
 
 Cobertura de testing:
 ✅ Tests unitarios con mock para funciones interactivas (usando @patch)
@@ -31,6 +37,8 @@ import unittest
 from unittest.mock import patch
 import sys
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Agregar el directorio padre al path para importar el módulo
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -40,8 +48,20 @@ from productos.operaciones_diccionario import (
     mostrar_productos, 
     intentar_actualizar_producto, 
     intentar_eliminar_producto,
+    obtener_productos_por_tipo,
+    obtener_productos_por_precio,
+    obtener_productos_mas_baratos,
+    buscar_por_prefijo,
+    resolver_nombre,
+    buscar_similares,
+    ajustar_stock,
+    ajustar_stock_lote,
+    agregar_producto,
+    actualizar_producto,
+    eliminar_producto,
     productos
 )
+from productos.autocompletado import _crear_completador
 
 class TestOperacionesDiccionario(unittest.TestCase):
     """Tests para operaciones de diccionario en memoria"""
@@ -303,5 +323,170 @@ class TestOperacionesDiccionario(unittest.TestCase):
         self.assertEqual(estado, 'no_encontrado')
         self.assertIsNone(producto)
 
+    # Tests para la consulta por tipo
+    def test_28_obtener_productos_por_tipo(self):
+        """Test para filtrar productos por tipo usando el índice"""
+        productos['manzana'] = {'tipo': 'fruta', 'precio': 100.0, 'stock': 50}
+        productos['tomate'] = {'tipo': 'verdura', 'precio': 25.0, 'stock': 100}
+        productos['pera'] = {'tipo': 'fruta', 'precio': 80.0, 'stock': 5}
+        nombres = [nombre for nombre, _ in obtener_productos_por_tipo('fruta')]
+        self.assertEqual(nombres, ['manzana', 'pera'])
+        self.assertEqual(obtener_productos_por_tipo('cereal'), [])
+
+    @patch('builtins.print')
+    def test_29_mostrar_productos_filtrado_por_tipo(self, mock_print):
+        """Test para mostrar solo los productos de un tipo"""
+        productos['manzana'] = {'tipo': 'fruta', 'precio': 100.0, 'stock': 50}
+        productos['tomate'] = {'tipo': 'verdura', 'precio': 25.0, 'stock': 100}
+        mostrar_productos('verdura')
+
+        productos_impresos = ''.join(str(call) for call in mock_print.call_args_list)
+        self.assertIn('tomate', productos_impresos)
+        self.assertNotIn('manzana', productos_impresos)
+
+    @patch('builtins.print')
+    def test_30_mostrar_productos_tipo_sin_productos(self, mock_print):
+        """Test para mostrar un tipo sin productos"""
+        productos['manzana'] = {'tipo': 'fruta', 'precio': 100.0, 'stock': 50}
+        mostrar_productos('verdura')
+        mensaje_impreso = ''.join(str(call) for call in mock_print.call_args_list)
+        self.assertIn('No hay productos de tipo verdura', mensaje_impreso)
+
+    # Tests para las consultas por precio
+    @patch('builtins.input', side_effect=['manzana', '1', '5'])
+    def test_31_consultas_por_precio_tras_actualizar(self, mock_input):
+        """Test para rango de precios y más baratos después de intentar_actualizar_producto"""
+        productos['manzana'] = {'tipo': 'fruta', 'precio': 100.0, 'stock': 50}
+        productos['tomate'] = {'tipo': 'verdura', 'precio': 25.0, 'stock': 100}
+        productos['pera'] = {'tipo': 'fruta', 'precio': 80.0, 'stock': 5}
+        with patch('builtins.print'):
+            intentar_actualizar_producto()
+
+        nombres = [nombre for nombre, _ in obtener_productos_por_precio(1.0, 50.0)]
+        self.assertEqual(nombres, ['manzana', 'tomate'])
+        nombres = [nombre for nombre, _ in obtener_productos_mas_baratos(2)]
+        self.assertEqual(nombres, ['manzana', 'tomate'])
+
+    # Tests para la búsqueda por prefijo
+    def test_32_buscar_por_prefijo(self):
+        """Test para buscar nombres por prefijo (normaliza mayúsculas)"""
+        productos['manzana'] = {'tipo': 'fruta', 'precio': 100.0, 'stock': 50}
+        productos['mandarina'] = {'tipo': 'fruta', 'precio': 80.0, 'stock': 5}
+        productos['tomate'] = {'tipo': 'verdura', 'precio': 25.0, 'stock': 100}
+        self.assertEqual(buscar_por_prefijo('MAN'), ['mandarina', 'manzana'])
+        self.assertEqual(buscar_por_prefijo('pera'), [])
+
+    def test_33_completador_ofrece_candidatos(self):
+        """Test para el completador de readline: un candidato por estado y None al final"""
+        productos['manzana'] = {'tipo': 'fruta', 'precio': 100.0, 'stock': 50}
+        productos['mandarina'] = {'tipo': 'fruta', 'precio': 80.0, 'stock': 5}
+        completar = _crear_completador(buscar_por_prefijo)
+        self.assertEqual(completar('man', 0), 'mandarina')
+        self.assertEqual(completar('man', 1), 'manzana')
+        self.assertIsNone(completar('man', 2))
+
+    # Tests para nombres sin distinguir tildes
+    @patch('builtins.input', side_effect=['limon'])
+    def test_34_intentar_agregar_producto_duplicado_sin_tilde(self, mock_input):
+        """Test para rechazar 'limon' cuando ya existe 'limón'"""
+        productos['limón'] = {'tipo': 'fruta', 'precio': 10.0, 'stock': 5}
+        with patch('builtins.print'):
+            estado, producto = intentar_agregar_producto()
+        self.assertEqual(estado, 'duplicado')
+        self.assertEqual(len(productos), 1)
+
+    @patch('builtins.input', side_effect=['limon', 's'])
+    def test_35_intentar_eliminar_producto_sin_tilde(self, mock_input):
+        """Test para eliminar 'limón' escribiendo 'limon'"""
+        productos['limón'] = {'tipo': 'fruta', 'precio': 10.0, 'stock': 5}
+        with patch('builtins.print'):
+            estado, producto = intentar_eliminar_producto()
+        self.assertEqual(estado, 'ok')
+        self.assertEqual(producto, 'limón')
+        self.assertIsNone(resolver_nombre('limon'))
+
+    # Tests para las sugerencias de nombres parecidos
+    def test_36_buscar_similares(self):
+        """Test para buscar nombres parecidos a uno mal escrito"""
+        productos['zanahoria'] = {'tipo': 'verdura', 'precio': 10.0, 'stock': 5}
+        productos['tomate'] = {'tipo': 'verdura', 'precio': 25.0, 'stock': 100}
+        nombres = [nombre for nombre, _ in buscar_similares('sanahoria')]
+        self.assertEqual(nombres, ['zanahoria'])
+
+    @patch('builtins.print')
+    @patch('builtins.input', side_effect=['zanaoria'])
+    def test_37_intentar_actualizar_producto_sugiere_nombre(self, mock_input, mock_print):
+        """Test para sugerir el nombre correcto cuando no se encuentra el producto"""
+        productos['zanahoria'] = {'tipo': 'verdura', 'precio': 10.0, 'stock': 5}
+        estado, producto = intentar_actualizar_producto()
+        self.assertEqual(estado, 'no_encontrado')
+        mensajes = ''.join(str(call) for call in mock_print.call_args_list)
+        self.assertIn('¿Quiso decir: zanahoria?', mensajes)
+
+    # Tests para los ajustes relativos de stock
+    def test_38_ajustar_stock(self):
+        """Test para sumar y descontar stock sin bajar de cero"""
+        productos['limón'] = {'tipo': 'fruta', 'precio': 10.0, 'stock': 5}
+        self.assertTrue(ajustar_stock('limon', 3))
+        self.assertTrue(ajustar_stock('limón', -8))
+        self.assertEqual(productos['limón']['stock'], 0)
+        self.assertFalse(ajustar_stock('limón', -1))
+        self.assertFalse(ajustar_stock('pera', 1))
+        self.assertEqual(productos['limón']['stock'], 0)
+
+    def test_39_ajustar_stock_concurrente(self):
+        """Test para que los ajustes simultáneos no pierdan actualizaciones"""
+        productos['manzana'] = {'tipo': 'fruta', 'precio': 100.0, 'stock': 1000}
+        with ThreadPoolExecutor(max_workers=8) as ejecutor:
+            resultados = list(ejecutor.map(lambda _: ajustar_stock('manzana', -1), range(1200)))
+        self.assertEqual(resultados.count(True), 1000)
+        self.assertEqual(productos['manzana']['stock'], 0)
+
+    def test_40_ajustar_stock_lote(self):
+        """Test para aplicar varios ajustes juntos, rechazando los que dejarían stock negativo"""
+        productos['manzana'] = {'tipo': 'fruta', 'precio': 100.0, 'stock': 50}
+        productos['tomate'] = {'tipo': 'verdura', 'precio': 25.0, 'stock': 2}
+        ajustados = ajustar_stock_lote([('manzana', -10), ('tomate', -5), ('manzana', 3), ('pera', 1)])
+        self.assertEqual(ajustados, 1)
+        self.assertEqual(productos['manzana']['stock'], 43)
+        self.assertEqual(productos['tomate']['stock'], 2)
+
+    def test_41_eliminar_y_actualizar_concurrentes_con_ajustes(self):
+        """Test para que bajas y stocks absolutos simultáneos no rompan ni pisen los ajustes"""
+        resolver = productos.resolver_nombre
+
+        def resolver_lento(nombre):
+            # Agranda la ventana entre encontrar el nombre y leer su stock
+            resultado = resolver(nombre)
+            time.sleep(0.0005)
+            return resultado
+
+        def ajustar(_):
+            return ajustar_stock('manzana', -1)
+
+        def eliminar_y_agregar(_):
+            eliminar_producto('manzana')
+            agregar_producto('manzana', 'fruta', 100.0, 1000)
+
+        productos['manzana'] = {'tipo': 'fruta', 'precio': 100.0, 'stock': 1000}
+        with patch.object(productos, 'resolver_nombre', side_effect=resolver_lento):
+            with ThreadPoolExecutor(max_workers=8) as ejecutor:
+                ajustes = [ejecutor.submit(ajustar, i) for i in range(200)]
+                bajas = [ejecutor.submit(eliminar_y_agregar, i) for i in range(50)]
+                resultados = [futuro.result() for futuro in ajustes + bajas]  # Sin KeyError
+        self.assertEqual(len(resultados), 250)
+
+        # Un stock absoluto simultáneo con los ajustes: queda el valor escrito más los ajustes posteriores
+        productos['manzana'] = {'tipo': 'fruta', 'precio': 100.0, 'stock': 1000}
+        with patch.object(productos, 'resolver_nombre', side_effect=resolver_lento):
+            with ThreadPoolExecutor(max_workers=8) as ejecutor:
+                ajustes = [ejecutor.submit(ajustar, i) for i in range(100)]
+                escritura = ejecutor.submit(actualizar_producto, 'manzana', 'stock', 500)
+                ajustes += [ejecutor.submit(ajustar, i) for i in range(100)]
+                self.assertTrue(escritura.result())
+                orden = [futuro.result() for futuro in ajustes]
+        self.assertTrue(all(orden))
+        self.assertIn(productos['manzana']['stock'], range(300, 500))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
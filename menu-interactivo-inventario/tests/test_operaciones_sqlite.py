@@ -0,0 +1,301 @@
+"""
+Unit tests para las operaciones del backend SQLite.
+
+Este módulo prueba las funciones CRUD sobre un archivo SQLite temporal:
+- Funciones core (sin input): agregar_producto_sqlite, actualizar_producto_sqlite, eliminar_producto_sqlite
+- Funciones interactivas (con input): intentar_agregar_producto, intentar_actualizar_producto, intentar_eliminar_producto
+
+Cobertura de testing:
+✅ Tests unitarios para funciones core (sin mock)
+✅ Tests con mock para funciones interactivas (usando @patch)
+✅ Tests de configuración (modo WAL, transacciones)
+
+Para ejecutar:
+    python tests/test_operaciones_sqlite.py                    # Con unittest (built-in)
+    python -m unittest tests.test_operaciones_sqlite -v       # Con unittest desde módulo
+"""
+
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import shutil
+import sqlite3
+import tempfile
+from io import StringIO
+from contextlib import redirect_stdout
+
+# Agregar el directorio padre al path para poder importar los módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from productos.operaciones_sqlite import (
+    agregar_producto_sqlite,
+    mostrar_productos,
+    actualizar_producto_sqlite,
+    eliminar_producto_sqlite,
+    iterar_productos,
+    buscar_por_prefijo_sqlite,
+    resolver_nombre_sqlite,
+    intentar_agregar_producto,
+    intentar_actualizar_producto,
+    intentar_eliminar_producto
+)
+from productos.database_sqlite import obtener_conexion_sqlite
+
+
+class TestOperacionesSQLite(unittest.TestCase):
+    """Tests para operaciones del backend SQLite"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Crea un directorio temporal para el archivo de pruebas"""
+        cls.directorio = tempfile.mkdtemp()
+        cls.ruta = os.path.join(cls.directorio, "inventario_test.sqlite3")
+
+    @classmethod
+    def tearDownClass(cls):
+        """Elimina el directorio temporal"""
+        shutil.rmtree(cls.directorio, ignore_errors=True)
+
+    def setUp(self):
+        """Configuración antes de cada test - limpia la BD de pruebas y crea conexión"""
+        self.bd_conexion = obtener_conexion_sqlite(modo_prueba=True, ruta=self.ruta)
+        assert self.bd_conexion is not None, "No se pudo abrir la BD SQLite de pruebas"
+        self.bd_conexion.limpiar_todos_los_datos()
+
+    def tearDown(self):
+        """Cerrar la conexión después de cada test"""
+        if self.bd_conexion:
+            self.bd_conexion.desconectar()
+
+    def _contar_productos(self):
+        """Devuelve la cantidad de productos en la BD de pruebas"""
+        resultado = self.bd_conexion.ejecutar_consulta(
+            "SELECT COUNT(*) as total FROM productos", obtener_resultados=True
+        )
+        return resultado[0]['total']
+
+    def test_01_modo_wal_activo(self):
+        """Test: La conexión usa journaling WAL"""
+        modo = self.bd_conexion.ejecutar_consulta("PRAGMA journal_mode", obtener_resultados=True)
+        self.assertEqual(modo[0][0], "wal")
+
+    def test_02_agregar_producto_exitoso(self):
+        """Test: Agregar un producto nuevo debe ser exitoso"""
+        with redirect_stdout(StringIO()):
+            resultado = agregar_producto_sqlite("manzana", "fruta", 1.50, 100, self.bd_conexion)
+        self.assertTrue(resultado)
+        self.assertEqual(self._contar_productos(), 1)
+
+    def test_03_agregar_producto_duplicado(self):
+        """Test: Agregar producto duplicado debe fallar"""
+        with redirect_stdout(StringIO()):
+            agregar_producto_sqlite("banana", "fruta", 0.80, 50, self.bd_conexion)
+            resultado = agregar_producto_sqlite("banana", "fruta", 1.00, 75, self.bd_conexion)
+        self.assertFalse(resultado)
+        self.assertEqual(self._contar_productos(), 1)
+
+    def test_04_agregar_producto_respeta_checks(self):
+        """Test: El esquema rechaza tipos inválidos y stock negativo como en MySQL"""
+        with redirect_stdout(StringIO()):
+            self.assertFalse(agregar_producto_sqlite("arroz", "cereal", 1.00, 5, self.bd_conexion))
+            self.assertFalse(agregar_producto_sqlite("pera", "fruta", 1.00, -5, self.bd_conexion))
+        self.assertEqual(self._contar_productos(), 0)
+
+    def test_05_actualizar_producto(self):
+        """Test: Actualizar precio de producto existente"""
+        with redirect_stdout(StringIO()):
+            agregar_producto_sqlite("naranja", "fruta", 1.00, 50, self.bd_conexion)
+            resultado = actualizar_producto_sqlite("naranja", "precio", 1.25, self.bd_conexion)
+        self.assertTrue(resultado)
+        fila = self.bd_conexion.ejecutar_consulta(
+            "SELECT precio FROM productos WHERE nombre = ?", ("naranja",), obtener_resultados=True
+        )
+        self.assertEqual(fila[0]['precio'], 1.25)
+
+    def test_06_actualizar_producto_inexistente(self):
+        """Test: Actualizar producto que no existe debe fallar"""
+        with redirect_stdout(StringIO()):
+            resultado = actualizar_producto_sqlite("fantasma", "precio", 5.0, self.bd_conexion)
+        self.assertFalse(resultado)
+
+    def test_07_eliminar_producto(self):
+        """Test: Eliminar producto existente y luego inexistente"""
+        with redirect_stdout(StringIO()):
+            agregar_producto_sqlite("zanahoria", "verdura", 0.80, 60, self.bd_conexion)
+            self.assertTrue(eliminar_producto_sqlite("zanahoria", self.bd_conexion))
+            self.assertFalse(eliminar_producto_sqlite("zanahoria", self.bd_conexion))
+
+    def test_08_mostrar_productos(self):
+        """Test: Mostrar productos con BD vacía y con datos"""
+        with redirect_stdout(StringIO()) as salida:
+            mostrar_productos(self.bd_conexion)
+        self.assertIn("No hay productos", salida.getvalue())
+
+        with redirect_stdout(StringIO()):
+            agregar_producto_sqlite("espinaca", "verdura", 2.50, 15, self.bd_conexion)
+        with redirect_stdout(StringIO()) as salida:
+            mostrar_productos(self.bd_conexion)
+        self.assertIn("espinaca", salida.getvalue())
+
+    def test_09_iterar_productos_paginado(self):
+        """Test: La paginación por clave devuelve todos los productos en orden"""
+        nombres = ["uva", "apio", "kiwi", "pera", "tomate"]
+        with redirect_stdout(StringIO()):
+            for nombre in nombres:
+                agregar_producto_sqlite(nombre, "fruta", 1.00, 10, self.bd_conexion)
+        recorridos = [producto['nombre'] for producto in iterar_productos(self.bd_conexion, limite=2)]
+        self.assertEqual(recorridos, sorted(nombres))
+
+    def test_10_transaccion_anidada(self):
+        """Test: Un error en un bloque anidado solo deshace ese bloque"""
+        with redirect_stdout(StringIO()):
+            with self.bd_conexion.transaccion():
+                agregar_producto_sqlite("uva", "fruta", 3.00, 20, self.bd_conexion)
+                with self.assertRaises(ValueError):
+                    with self.bd_conexion.transaccion():
+                        agregar_producto_sqlite("kiwi", "fruta", 2.00, 10, self.bd_conexion)
+                        raise ValueError("falla el bloque interno")
+        self.assertEqual(self._contar_productos(), 1)
+
+    @patch('builtins.input', side_effect=['Manzana', 'fruta', '1.50', '100'])
+    def test_11_intentar_agregar_producto_exitoso(self, mock_input):
+        """Test: Agregar producto interactivo exitoso con mock"""
+        with redirect_stdout(StringIO()):
+            estado, producto = intentar_agregar_producto(self.bd_conexion)
+        self.assertEqual(estado, 'ok')
+        self.assertEqual(producto, 'manzana')
+
+    @patch('builtins.input', side_effect=['manzana', 'fruta', '1.50', '100'])
+    def test_12_intentar_agregar_producto_duplicado(self, mock_input):
+        """Test: Agregar producto duplicado interactivo"""
+        with redirect_stdout(StringIO()):
+            agregar_producto_sqlite("manzana", "fruta", 1.00, 50, self.bd_conexion)
+            estado, producto = intentar_agregar_producto(self.bd_conexion)
+        self.assertEqual(estado, 'duplicado')
+        self.assertEqual(producto, 'manzana')
+
+    @patch('builtins.input', side_effect=['lechuga', '2', '45'])
+    def test_13_intentar_actualizar_producto_stock(self, mock_input):
+        """Test: Actualizar stock interactivo exitoso"""
+        with redirect_stdout(StringIO()):
+            agregar_producto_sqlite("lechuga", "verdura", 1.20, 25, self.bd_conexion)
+            estado, producto = intentar_actualizar_producto(self.bd_conexion)
+        self.assertEqual(estado, 'ok')
+        self.assertEqual(producto, 'lechuga')
+
+    @patch('builtins.input', side_effect=['apio', 's'])
+    def test_14_intentar_eliminar_producto_exitoso(self, mock_input):
+        """Test: Eliminar producto interactivo exitoso"""
+        with redirect_stdout(StringIO()):
+            agregar_producto_sqlite("apio", "verdura", 1.50, 15, self.bd_conexion)
+            estado, producto = intentar_eliminar_producto(self.bd_conexion)
+        self.assertEqual(estado, 'ok')
+        self.assertEqual(producto, 'apio')
+
+    def test_15_intentar_eliminar_producto_bd_vacia(self):
+        """Test: Eliminar producto cuando la BD está vacía"""
+        with redirect_stdout(StringIO()):
+            estado, producto = intentar_eliminar_producto(self.bd_conexion)
+        self.assertEqual(estado, 'no_encontrado')
+        self.assertIsNone(producto)
+
+    def test_16_buscar_por_prefijo(self):
+        """Test: La búsqueda por prefijo devuelve los nombres en orden y respeta el límite"""
+        with redirect_stdout(StringIO()):
+            for nombre in ["limón", "lima", "lechuga", "kiwi"]:
+                agregar_producto_sqlite(nombre, "fruta", 1.00, 1, self.bd_conexion)
+        self.assertEqual(buscar_por_prefijo_sqlite(self.bd_conexion, "li"), ["lima", "limón"])
+        self.assertEqual(buscar_por_prefijo_sqlite(self.bd_conexion, "l", limite=1), ["lechuga"])
+        self.assertEqual(buscar_por_prefijo_sqlite(self.bd_conexion, "z"), [])
+
+    def test_17_nombres_sin_distinguir_tildes(self):
+        """Test: nombre_clave rechaza 'limon' si existe 'limón' y permite buscarlo/actualizarlo sin tilde"""
+        with redirect_stdout(StringIO()):
+            self.assertTrue(agregar_producto_sqlite("limón", "fruta", 1.00, 1, self.bd_conexion))
+            self.assertFalse(agregar_producto_sqlite("limon", "fruta", 2.00, 2, self.bd_conexion))
+            self.assertTrue(actualizar_producto_sqlite("LIMON", "stock", 9, self.bd_conexion))
+        self.assertEqual(resolver_nombre_sqlite(self.bd_conexion, "limon"), "limón")
+        with redirect_stdout(StringIO()):
+            self.assertTrue(eliminar_producto_sqlite("limon", self.bd_conexion))
+        self.assertIsNone(resolver_nombre_sqlite(self.bd_conexion, "limón"))
+
+    def test_18_archivo_legible_desde_otro_cliente(self):
+        """Test: Un cliente SQLite cualquiera (sin funciones de la aplicación) lee y modifica la tabla"""
+        with redirect_stdout(StringIO()):
+            agregar_producto_sqlite("limón", "fruta", 1.00, 1, self.bd_conexion)
+        otro = sqlite3.connect(self.ruta)
+        try:
+            self.assertEqual(otro.execute("SELECT nombre, nombre_clave FROM productos").fetchall(),
+                             [("limón", "limon")])
+            otro.execute("UPDATE productos SET stock = 5 WHERE nombre_clave = 'limon'")
+            otro.commit()
+        finally:
+            otro.close()
+        self.assertEqual(self._contar_productos(), 1)
+
+    def _archivo_sin_clave(self, archivo, *nombres):
+        """Crea un archivo con la tabla anterior a nombre_clave y esos productos"""
+        ruta = os.path.join(self.directorio, archivo)
+        vieja = sqlite3.connect(ruta)
+        vieja.executescript("""
+            CREATE TABLE productos (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                nombre TEXT NOT NULL UNIQUE,
+                tipo TEXT NOT NULL CHECK (tipo IN ('fruta', 'verdura')),
+                precio REAL NOT NULL CHECK (precio > 0),
+                stock INTEGER NOT NULL DEFAULT 0 CHECK (stock >= 0),
+                fecha_creacion TEXT DEFAULT CURRENT_TIMESTAMP,
+                fecha_actualizacion TEXT DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE INDEX idx_tipo ON productos (tipo);
+        """)
+        vieja.executemany("INSERT INTO productos (nombre, tipo, precio, stock) VALUES (?, 'fruta', 1, 1)",
+                          [(nombre,) for nombre in nombres])
+        vieja.commit()
+        vieja.close()
+        return ruta
+
+    def test_19_migra_archivo_sin_nombre_clave(self):
+        """Test: Un archivo sin nombre_clave queda con el mismo esquema que uno nuevo"""
+        ruta = self._archivo_sin_clave("sin_clave.sqlite3", "Limón", "pera")
+        bd_conexion = obtener_conexion_sqlite(modo_prueba=True, ruta=ruta)
+        try:
+            self.assertEqual(resolver_nombre_sqlite(bd_conexion, "limon"), "Limón")
+            with redirect_stdout(StringIO()):
+                self.assertFalse(agregar_producto_sqlite("LIMON", "fruta", 1.00, 1, bd_conexion))
+                self.assertTrue(agregar_producto_sqlite("kiwi", "fruta", 1.00, 1, bd_conexion))
+        finally:
+            bd_conexion.desconectar()
+
+        def esquema(ruta):
+            otro = sqlite3.connect(ruta)
+            try:
+                # RENAME guarda el nombre entre comillas en el CREATE TABLE: el resto es igual
+                return (otro.execute("PRAGMA table_info(productos)").fetchall(),
+                        otro.execute("SELECT type, name, replace(sql, '\"productos\"', 'productos') "
+                                     "FROM sqlite_master WHERE tbl_name = 'productos' ORDER BY name").fetchall(),
+                        otro.execute("SELECT nombre_clave FROM productos ORDER BY id").fetchall())
+            finally:
+                otro.close()
+
+        migrado = esquema(ruta)
+        self.assertEqual(migrado[:2], esquema(self.ruta)[:2])
+        self.assertEqual(migrado[2], [("limon",), ("pera",), ("kiwi",)])
+
+    def test_20_migracion_con_nombres_repetidos_por_tildes(self):
+        """Test: Si el archivo tiene 'limón' y 'limon', no se abre y el error lo explica"""
+        ruta = self._archivo_sin_clave("repetidos.sqlite3", "limón", "limon", "pera")
+        with redirect_stdout(StringIO()) as salida:
+            self.assertIsNone(obtener_conexion_sqlite(modo_prueba=True, ruta=ruta))
+        self.assertIn("limón / limon", salida.getvalue())
+        self.assertIn("solo difieren en tildes", salida.getvalue())
+        otro = sqlite3.connect(ruta)
+        try:
+            self.assertEqual(otro.execute("SELECT COUNT(*) FROM productos").fetchone(), (3,))
+        finally:
+            otro.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,175 @@
+"""
+Unit tests para la persistencia opcional del backend diccionario.
+
+Este módulo prueba:
+- Registro de operaciones y recuperación (snapshot + log)
+- Compactación del log en un snapshot, en el hilo de fondo
+- Recuperación tras una compactación interrumpida (log anterior)
+- Tolerancia a una última línea incompleta (caída durante una escritura)
+
+Para ejecutar:
+    python -m unittest tests.test_persistencia_diccionario -v
+"""
+
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+
+# Agregar el directorio padre al path para poder importar los módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from productos.operaciones_diccionario import (
+    activar_persistencia,
+    desactivar_persistencia,
+    agregar_producto,
+    actualizar_producto,
+    eliminar_producto,
+    ajustar_stock,
+    productos
+)
+from productos.persistencia_diccionario import ARCHIVO_LOG, ARCHIVO_LOG_ANTERIOR, ARCHIVO_SNAPSHOT, RegistroOperaciones
+
+
+class TestPersistenciaDiccionario(unittest.TestCase):
+    """Tests para el log de operaciones y los snapshots del diccionario"""
+
+    def setUp(self):
+        """Crea un directorio temporal vacío y limpia el inventario"""
+        self.directorio = tempfile.mkdtemp()
+        productos.clear()
+
+    def tearDown(self):
+        """Cierra la persistencia y borra el directorio temporal"""
+        desactivar_persistencia()
+        productos.clear()
+        shutil.rmtree(self.directorio, ignore_errors=True)
+
+    def _reiniciar(self, **opciones):
+        """Simula un reinicio del proceso sin snapshot final (caída)"""
+        from productos import operaciones_diccionario
+        operaciones_diccionario._registro.cerrar(compactar=False)
+        operaciones_diccionario._registro = None
+        productos.clear()
+        return activar_persistencia(self.directorio, **opciones)
+
+    def _esperar_compactacion(self):
+        """Espera a que el hilo de fondo termine la compactación pedida"""
+        from productos import operaciones_diccionario
+        limite = time.monotonic() + 5
+        while operaciones_diccionario._registro._compactacion_pedida and time.monotonic() < limite:
+            time.sleep(0.01)
+
+    def test_01_recupera_operaciones_del_log(self):
+        """Test: Altas, modificaciones y bajas se recuperan al reactivar"""
+        self.assertEqual(activar_persistencia(self.directorio), 0)
+        agregar_producto("manzana", "fruta", 100.0, 50)
+        agregar_producto("tomate", "verdura", 25.0, 10)
+        actualizar_producto("manzana", "precio", 120.0)
+        actualizar_producto("tomate", "stock", 3)
+        eliminar_producto("tomate")
+
+        self.assertEqual(self._reiniciar(), 1)
+        self.assertEqual(productos["manzana"]["precio"], 120.0)
+        self.assertNotIn("tomate", productos)
+
+    def test_02_cerrar_deja_snapshot_y_vacia_log(self):
+        """Test: Al cerrar se escribe un snapshot y el log queda vacío"""
+        activar_persistencia(self.directorio)
+        agregar_producto("limón", "fruta", 10.0, 5)
+        desactivar_persistencia()
+
+        self.assertTrue(os.path.exists(os.path.join(self.directorio, ARCHIVO_SNAPSHOT)))
+        self.assertEqual(os.path.getsize(os.path.join(self.directorio, ARCHIVO_LOG)), 0)
+        productos.clear()
+        self.assertEqual(activar_persistencia(self.directorio), 1)
+        self.assertEqual(productos["limón"]["stock"], 5)
+
+    def test_03_compacta_al_superar_el_limite(self):
+        """Test: El log se compacta automáticamente cada `compactar_cada` operaciones"""
+        activar_persistencia(self.directorio, compactar_cada=3)
+        agregar_producto("pera", "fruta", 1.0, 1)
+        agregar_producto("uva", "fruta", 2.0, 2)
+        agregar_producto("kiwi", "fruta", 3.0, 3)
+        agregar_producto("apio", "verdura", 4.0, 4)
+        self._esperar_compactacion()
+
+        self.assertTrue(os.path.exists(os.path.join(self.directorio, ARCHIVO_SNAPSHOT)))
+        self.assertFalse(os.path.exists(os.path.join(self.directorio, ARCHIVO_LOG_ANTERIOR)))
+        self.assertEqual(self._reiniciar(), 4)
+
+    def test_04_descarta_linea_incompleta(self):
+        """Test: Una línea cortada al final del log se ignora y no rompe las siguientes"""
+        activar_persistencia(self.directorio)
+        agregar_producto("pera", "fruta", 1.0, 1)
+        desactivar_persistencia()
+        with open(os.path.join(self.directorio, ARCHIVO_LOG), "a", encoding="utf-8") as archivo:
+            archivo.write('["a","uva","fru')
+
+        productos.clear()
+        self.assertEqual(activar_persistencia(self.directorio), 1)
+        agregar_producto("kiwi", "fruta", 3.0, 3)
+        self.assertEqual(self._reiniciar(), 2)
+        self.assertIn("kiwi", productos)
+
+    def test_05_operaciones_fallidas_no_se_registran(self):
+        """Test: Duplicados y productos inexistentes no escriben en el log"""
+        activar_persistencia(self.directorio)
+        agregar_producto("pera", "fruta", 1.0, 1)
+        self.assertFalse(agregar_producto("pera", "fruta", 9.0, 9))
+        self.assertFalse(actualizar_producto("fantasma", "precio", 9.0))
+        self.assertFalse(eliminar_producto("fantasma"))
+        self._reiniciar()
+        self.assertEqual(productos["pera"]["precio"], 1.0)
+
+    def test_06_ajustes_de_stock_se_recuperan(self):
+        """Test: Los ajustes relativos se registran como stock absoluto y se recuperan"""
+        activar_persistencia(self.directorio)
+        agregar_producto("pera", "fruta", 1.0, 10)
+        ajustar_stock("pera", -4)
+        ajustar_stock("pera", 2)
+        self.assertFalse(ajustar_stock("pera", -50))
+        self._reiniciar()
+        self.assertEqual(productos["pera"]["stock"], 8)
+
+    def test_07_compacta_en_el_hilo_de_fondo(self):
+        """Test: registrar() no escribe el snapshot: lo hace el hilo de fondo"""
+        escritores = []
+        compactar = RegistroOperaciones.compactar
+
+        def compactar_registrando(registro):
+            escritores.append(threading.current_thread())
+            compactar(registro)
+
+        with patch.object(RegistroOperaciones, 'compactar', compactar_registrando):
+            activar_persistencia(self.directorio, compactar_cada=2)
+            agregar_producto("pera", "fruta", 1.0, 1)
+            agregar_producto("uva", "fruta", 2.0, 2)
+            self._esperar_compactacion()
+        self.assertEqual(len(escritores), 1)
+        self.assertIsNot(escritores[0], threading.current_thread())
+
+    def test_08_compactacion_interrumpida_no_pierde_operaciones(self):
+        """Test: Si el snapshot falla, el log anterior queda y se recupera al arrancar"""
+        from productos import operaciones_diccionario
+        activar_persistencia(self.directorio)
+        agregar_producto("pera", "fruta", 1.0, 1)
+        with patch('productos.persistencia_diccionario.json.dump', side_effect=OSError("disco lleno")):
+            with self.assertRaises(OSError):
+                operaciones_diccionario._registro.compactar()
+        self.assertTrue(os.path.exists(os.path.join(self.directorio, ARCHIVO_LOG_ANTERIOR)))
+        agregar_producto("uva", "fruta", 2.0, 2)
+
+        self.assertEqual(self._reiniciar(), 2)
+        agregar_producto("kiwi", "fruta", 3.0, 3)
+        operaciones_diccionario._registro.compactar()  # Junta el log anterior con el nuevo
+        self.assertFalse(os.path.exists(os.path.join(self.directorio, ARCHIVO_LOG_ANTERIOR)))
+        self.assertEqual(self._reiniciar(), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
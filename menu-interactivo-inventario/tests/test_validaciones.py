@@ -5,7 +5,7 @@ import os
 # Agregar el directorio padre al path para importar el módulo
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from productos.validaciones import (validar_nombre, validar_tipo, validar_precio, validar_stock)
+from productos.validaciones import (validar_nombre, validar_tipo, validar_precio, validar_stock, normalizar_clave)
 
 class TestValidaciones(unittest.TestCase):
     """
@@ -248,5 +248,21 @@ class TestValidaciones(unittest.TestCase):
         resultado = validar_stock("999999")
         self.assertEqual(resultado, 999999)
 
+    # Tests para normalizar_clave
+    def test_01_normalizar_clave_quita_tildes(self):
+        """Test para normalizar un nombre con tildes y mayúsculas"""
+        resultado = normalizar_clave("Limón")
+        self.assertEqual(resultado, "limon")
+
+    def test_02_normalizar_clave_enie(self):
+        """Test para normalizar la ñ como n (igual que utf8mb4_unicode_ci)"""
+        resultado = normalizar_clave("Ñandú")
+        self.assertEqual(resultado, "nandu")
+
+    def test_03_normalizar_clave_sin_tildes(self):
+        """Test para normalizar un nombre que ya no tiene tildes"""
+        resultado = normalizar_clave("  fruta del dragon ")
+        self.assertEqual(resultado, "fruta del dragon")
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file